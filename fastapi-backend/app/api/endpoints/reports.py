@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Path, Response
+from fastapi import APIRouter, HTTPException, Path, Query
 from typing import Optional
-from fastapi.responses import FileResponse
-from app.schemas.zoom import ReportsResponse, ReportContentResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from app.schemas.zoom import ReportsResponse, ReportContentResponse, TranscriptResponse
 from app.services.report_service import ReportService
 
 router = APIRouter()
@@ -68,6 +68,46 @@ async def download_report(filename: str = Path(..., description="Report filename
         media_type="application/octet-stream"
     )
 
+@router.get("/transcript/{meeting_id}", response_model=TranscriptResponse)
+async def get_meeting_transcript(
+    meeting_id: str = Path(..., description="Meeting ID"),
+    start: Optional[float] = Query(None, ge=0, description="Start of the window in seconds"),
+    end: Optional[float] = Query(None, gt=0, description="End of the window in seconds")
+):
+    """
+    Get the timed transcript segments of a recorded meeting
+    """
+    success, segments, error = ReportService.get_meeting_transcript(meeting_id, start, end)
+    
+    if not success:
+        return {
+            "success": False,
+            "error": error
+        }
+    
+    return {
+        "success": True,
+        "segments": segments
+    }
+
+@router.get("/audio/{meeting_id}")
+async def get_meeting_audio(
+    meeting_id: str = Path(..., description="Meeting ID"),
+    start: float = Query(0.0, ge=0, description="Start of the range in seconds"),
+    end: Optional[float] = Query(None, gt=0, description="End of the range in seconds")
+):
+    """
+    Download a time range of a meeting's archived audio as WAV
+    """
+    success, size, chunks, error = await ReportService.get_meeting_audio_async(meeting_id, start, end)
+    
+    if not success:
+        raise HTTPException(status_code=404, detail=error)
+    
+    # A sync iterator is read in the threadpool, one chunk at a time, so neither
+    # the archive reads nor the size of the range hold up the event loop
+    return StreamingResponse(chunks, media_type="audio/wav", headers={"Content-Length": str(size)})
+
 @router.get("/pdf/{meeting_id}")
 async def generate_pdf_report(meeting_id: str = Path(..., description="Meeting ID")):
     """
@@ -0,0 +1,33 @@
+import json
+from fastapi import APIRouter, HTTPException, Request, Header
+from typing import Optional
+from app.services.webhook_service import WebhookService, URL_VALIDATION_EVENT
+
+router = APIRouter()
+
+@router.post("/zoom")
+async def zoom_webhook(
+    request: Request,
+    x_zm_request_timestamp: Optional[str] = Header(None),
+    x_zm_signature: Optional[str] = Header(None)
+):
+    """
+    Receive Zoom meeting lifecycle events
+    """
+    body = await request.body()
+
+    valid, error = WebhookService.verify_signature(body, x_zm_request_timestamp, x_zm_signature)
+    if not valid:
+        raise HTTPException(status_code=401, detail=error)
+
+    try:
+        event = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    if not isinstance(event, dict):
+        raise HTTPException(status_code=400, detail="Webhook payload must be a JSON object")
+
+    if event.get("event") == URL_VALIDATION_EVENT:
+        return WebhookService.url_validation_response(event)
+
+    return WebhookService.handle_event(event)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, WebSocket
 from fastapi.responses import JSONResponse
 from typing import Optional
 import uuid
@@ -10,9 +10,10 @@ from zoombot import ZoomBot
 from app.schemas.zoom import (
     CreateMeetingRequest, MeetingResponse, JoinMeetingRequest,
     ZoomSignatureRequest, ZoomSignatureResponse, SessionRequest,
-    MeetingStatusResponse, MeetingListResponse
+    MeetingStatusResponse, MeetingListResponse, ActiveMeetingsResponse, TranscriptResponse
 )
 from app.services.zoom_service import ZoomService
+from app.services.audio_ingest import audio_ingest
 
 router = APIRouter()
 
@@ -59,7 +60,7 @@ async def create_meeting(request: CreateMeetingRequest):
     """
     Create a new Zoom meeting
     """
-    success, meeting_info, session_id, error = ZoomService.create_meeting(
+    success, meeting_info, session_id, error = await ZoomService.create_meeting_async(
         request.topic,
         request.duration,
         request.schedule_for,
@@ -100,7 +101,7 @@ async def join_meeting(request_data: dict):
         }
     
     # Call your service
-    success, session_id, meeting_id, error = ZoomService.join_meeting(
+    success, session_id, meeting_id, error = await ZoomService.join_meeting_async(
         meeting_id,
         passcode,
         session_id
@@ -138,7 +139,13 @@ async def start_recording(request_data: dict):
         }
     
     # Call your service
-    success, error = ZoomService.start_recording(session_id, meeting_id)
+    success, error = ZoomService.start_recording(
+        session_id,
+        meeting_id,
+        request_data.get("audio_source"),
+        request_data.get("realtime"),
+        request_data.get("request_ms")
+    )
     
     if not success:
         return {
@@ -148,6 +155,49 @@ async def start_recording(request_data: dict):
     
     return {"success": True, "message": "Recording started"}
 
+@router.get("/sessions/{session_id}/transcript", response_model=TranscriptResponse)
+async def session_transcript(
+    session_id: str,
+    since: Optional[int] = Query(None, ge=0, description="Only segments added after this index (the previous response's next)"),
+    start: Optional[float] = Query(None, ge=0, description="Start of the window in seconds"),
+    end: Optional[float] = Query(None, gt=0, description="End of the window in seconds")
+):
+    """
+    Get the live transcript of a session's recording
+    """
+    transcript, error = ZoomService.get_transcript(session_id, since, start, end)
+    if transcript is None:
+        return {
+            "success": False,
+            "error": error
+        }
+    
+    return dict(transcript, success=True)
+
+@router.websocket("/sessions/{session_id}/audio")
+async def session_audio(
+    websocket: WebSocket,
+    session_id: str,
+    format: str = Query("pcm", description="pcm (16-bit little-endian), webm or ogg (Opus)"),
+    rate: int = Query(16000, description="Sample rate of the audio"),
+    channels: int = Query(1, description="Channel count of the audio")
+):
+    """
+    Record a session from audio streamed over the WebSocket as binary messages.
+    Send the text message "stop" (or close the socket) to end the recording.
+    """
+    source, error, close_code = audio_ingest.open(session_id, format, rate, channels)
+    if source is None:
+        await websocket.close(code=close_code, reason=error)
+        return
+
+    await websocket.accept()
+    close_code = await audio_ingest.receive(websocket, session_id, source, format)
+    try:
+        await websocket.close(code=close_code)
+    except RuntimeError:
+        pass  # the client already closed the socket
+
 @router.post("/meetings/stop-recording")
 async def stop_recording(request_data: dict):
     """
@@ -165,7 +215,7 @@ async def stop_recording(request_data: dict):
         }
     
     # Call your service
-    success, error = ZoomService.stop_recording(session_id)
+    success, error = await ZoomService.stop_recording_async(session_id)
     
     if not success:
         return {
@@ -193,7 +243,7 @@ async def end_meeting(request_data: dict):
         }
     
     # Call your service
-    success, error = ZoomService.end_meeting(meeting_id, session_id)
+    success, error = await ZoomService.end_meeting_async(meeting_id, session_id)
     
     if not success:
         return {
@@ -213,7 +263,7 @@ async def list_meetings(
     """
     List Zoom meetings
     """
-    success, meetings, session_id, error = ZoomService.list_meetings(
+    success, meetings, session_id, error = await ZoomService.list_meetings_async(
         user_id,
         meeting_type,
         session_id
@@ -233,6 +283,19 @@ async def list_meetings(
         "session_id": session_id
     }
 
+@router.get("/meetings/active", response_model=ActiveMeetingsResponse)
+async def active_meetings(
+    session_id: Optional[str] = Query(None, description="Only meetings owned by this session")
+):
+    """
+    List meetings that are currently active across all workers
+    """
+    meetings = ZoomService.list_active_meetings(session_id)
+    return {
+        "success": True,
+        "meetings": meetings
+    }
+
 @router.get("/meetings/status/{meeting_id}", response_model=MeetingStatusResponse)
 async def meeting_status(
     meeting_id: str,
@@ -241,5 +304,5 @@ async def meeting_status(
     """
     Get status of a meeting
     """
-    status = ZoomService.get_meeting_status(meeting_id, session_id)
+    status = await ZoomService.get_meeting_status_async(meeting_id, session_id)
     return status
\ No newline at end of file
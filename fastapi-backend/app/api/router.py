@@ -1,6 +1,13 @@
 from fastapi import APIRouter
-from app.api.endpoints import audio, zoom, reports
-from app.services.zoom_service import ZoomService
+from app.api.endpoints import audio, zoom, reports, webhooks
+from app.services.zoom_service import ZoomService, active_bots
+from app.core.providers import providers
+from app.core.zoom_auth import zoom_tokens
+from app.core.zoom_client import zoom_api
+from app.core.rate_limit import zoom_budget
+from app.services.meeting_monitor import meeting_monitor
+from app.services.audio_ingest import audio_ingest
+from app.services.live_summary import live_summary_worker
 
 api_router = APIRouter()
 
@@ -8,6 +15,7 @@ api_router = APIRouter()
 api_router.include_router(zoom.router, prefix="/zoom", tags=["Zoom"])
 api_router.include_router(audio.router, prefix="/audio", tags=["Audio"])
 api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
 
 # Direct sessions endpoint to match original Flask route
 @api_router.post("/sessions", tags=["Sessions"])
@@ -23,4 +31,23 @@ async def create_session():
 @api_router.get("/status", tags=["System"])
 async def status():
     """API status endpoint"""
-    return {"status": "online", "version": "1.0.0"}
\ No newline at end of file
+    return {"status": "online", "version": "1.0.0"}
+
+@api_router.get("/metrics", tags=["System"])
+async def metrics():
+    """Runtime metrics for shared clients and services"""
+    return {
+        "providers": providers.metrics(),
+        "zoom_token": zoom_tokens.stats(),
+        "zoom_api": zoom_api.stats.snapshot(),
+        "zoom_rate_budget": zoom_budget.stats(),
+        "meeting_monitor": meeting_monitor.stats(),
+        "sessions": active_bots.stats(),
+        "audio": {
+            session_id: bot.audio_stats()
+            for session_id, bot in active_bots.items()
+            if getattr(bot, 'recording', False)
+        },
+        "audio_ingest": audio_ingest.stats(),
+        "live_summaries": live_summary_worker.stats()
+    }
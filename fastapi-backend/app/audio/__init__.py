@@ -0,0 +1 @@
+"""Audio capture sources for the recording pipeline."""
\ No newline at end of file
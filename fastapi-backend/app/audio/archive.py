@@ -0,0 +1,323 @@
+import glob
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.audio.sources import PacedSource
+from app.core.config import settings
+
+# Segment header: magic, version, channels, sample width, rate, first sample, wall-clock start
+HEADER_MAGIC = b"SSAUDIO1"
+HEADER_FORMAT = "<8sHHHIQd"
+HEADER_SIZE = 64  # the header is padded so PCM starts at a fixed offset
+INDEX_FILE = "index.json"
+# Canonical 44-byte PCM WAV header: RIFF chunk, fmt chunk, data chunk header
+WAV_HEADER_FORMAT = "<4sI4s4sIHHIIHH4sI"
+WAV_HEADER_SIZE = struct.calcsize(WAV_HEADER_FORMAT)
+
+
+def archive_dir(meeting_start_time: str) -> str:
+    """Directory holding the audio archive of one recording"""
+    return os.path.join(settings.MEETING_OUTPUTS_DIR, f"audio_{meeting_start_time}")
+
+
+class AudioArchiveWriter:
+    """
+    Persists captured PCM as fixed-size segment files written by a background thread.
+
+    The capture thread only queues chunks; the writer batches them into
+    large writes. Every segment holds ``segment_seconds`` of audio after a
+    64-byte header, so a sample offset maps straight to a file and position.
+    index.json lists the segments with their first sample and start time.
+
+    At most ``queue_seconds`` of audio wait for the disk. Beyond that the
+    capture thread drops chunks instead of growing memory; the writer fills
+    the gap with silence so later audio keeps its sample offsets, and the
+    overflow is counted in ``stats()``.
+    """
+
+    def __init__(self, directory: str, rate: int = 16000, channels: int = 1, segment_seconds: float = None,
+                 batch_bytes: int = None, flush_interval: float = 1.0, queue_seconds: float = None):
+        self.directory = directory
+        self.rate = rate
+        self.channels = channels
+        self.frame_bytes = channels * 2
+        segment_seconds = settings.AUDIO_ARCHIVE_SEGMENT_SECONDS if segment_seconds is None else segment_seconds
+        self.segment_samples = max(1, int(segment_seconds * rate))
+        self.batch_bytes = batch_bytes or settings.AUDIO_ARCHIVE_BATCH_BYTES
+        self.flush_interval = flush_interval
+        queue_seconds = settings.AUDIO_ARCHIVE_QUEUE_SECONDS if queue_seconds is None else queue_seconds
+        self.max_queue_bytes = max(self.batch_bytes, int(queue_seconds * rate) * self.frame_bytes)
+
+        # Items are (bytes dropped just before this chunk, chunk)
+        self._queue: "queue.Queue[Optional[Tuple[int, bytes]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._queued = 0  # bytes waiting for the writer
+        self._gap = 0     # bytes dropped since the last queued chunk
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._segment_written = 0  # samples in the open segment
+        self._samples = 0          # samples written overall
+        self._segments: List[Dict[str, Any]] = []
+        self._stats = {"queued_bytes": 0, "written_bytes": 0, "writes": 0, "segments": 0, "errors": 0,
+                       "overflows": 0, "dropped_bytes": 0}
+
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="audio-archive", daemon=True)
+        self._thread.start()
+
+    def append(self, data) -> None:
+        """Queue captured audio; called from the capture thread, so it never touches disk or waits for it"""
+        size = len(data)
+        with self._lock:
+            if self._queued + size > self.max_queue_bytes:
+                self._stats["overflows"] += 1
+                self._stats["dropped_bytes"] += size
+                self._gap += size
+                return
+            self._queued += size
+            gap, self._gap = self._gap, 0
+        self._queue.put((gap, bytes(data)))
+        self._stats["queued_bytes"] += size
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write out everything queued and finish the index"""
+        if self._thread is None:
+            return
+        with self._lock:
+            gap, self._gap = self._gap, 0
+        if gap:
+            self._queue.put((gap, b""))
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            directory=self.directory,
+            archived_seconds=round(self._samples / self.rate, 2),
+            pending_chunks=self._queue.qsize(),
+            pending_bytes=self._queued
+        )
+
+    def _run(self) -> None:
+        batch = bytearray()
+        last_write = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = (0, b"")
+            if item is None:
+                break
+            gap, data = item
+            with self._lock:
+                self._queued -= len(data)
+            if gap:
+                batch += bytes(gap)  # silence in place of dropped audio keeps sample offsets aligned
+            batch += data
+            # One large write per batch, but never sit on audio longer than the flush interval
+            if len(batch) >= self.batch_bytes or (batch and time.monotonic() - last_write >= self.flush_interval):
+                self._write(batch)
+                batch = bytearray()
+                last_write = time.monotonic()
+        if batch:
+            self._write(batch)
+        self._close_segment()
+
+    def _write(self, data: bytearray) -> None:
+        view = memoryview(data)
+        try:
+            while len(view):
+                if self._file is None or self._segment_written >= self.segment_samples:
+                    self._open_segment()
+                room = (self.segment_samples - self._segment_written) * self.frame_bytes
+                piece = view[:room]
+                self._file.write(piece)
+                self._segment_written += len(piece) // self.frame_bytes
+                self._samples += len(piece) // self.frame_bytes
+                view = view[len(piece):]
+            self._file.flush()
+            self._stats["written_bytes"] += len(data)
+            self._stats["writes"] += 1
+        except OSError as e:
+            self._stats["errors"] += 1
+            print(f"Error writing audio archive: {e}")
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        index = len(self._segments)
+        filename = f"segment_{index:05d}.pcm"
+        started = time.time()
+        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, 1, self.channels, 2, self.rate, self._samples, started)
+        self._file = open(os.path.join(self.directory, filename), "wb")
+        self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self._segment_written = 0
+        self._segments.append({"file": filename, "start_sample": self._samples, "start_time": started, "samples": 0})
+        self._stats["segments"] += 1
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self._segments[-1]["samples"] = self._segment_written
+        self._write_index()
+
+    def _write_index(self) -> None:
+        index = {
+            "rate": self.rate,
+            "channels": self.channels,
+            "sample_width": 2,
+            "segment_samples": self.segment_samples,
+            "segments": self._segments
+        }
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(path + ".tmp", path)
+
+
+class AudioArchiveReader:
+    """
+    Random access to an archived recording through memory-mapped segments.
+
+    Segments are found from their headers (so a recording cut short by a
+    crash is still readable) and mapped only when a range touches them.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments: List[Dict[str, Any]] = []
+        self._maps: Dict[str, mmap.mmap] = {}
+        self.rate = 16000
+        self.channels = 1
+
+        for path in sorted(glob.glob(os.path.join(directory, "segment_*.pcm"))):
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                continue
+            magic, _, channels, _, rate, start_sample, start_time = struct.unpack_from(HEADER_FORMAT, header)
+            if magic != HEADER_MAGIC:
+                continue
+            samples = (os.path.getsize(path) - HEADER_SIZE) // (channels * 2)
+            if samples <= 0:
+                continue
+            self.rate, self.channels = rate, channels
+            self.segments.append({"path": path, "start_sample": start_sample, "samples": samples,
+                                  "start_time": start_time})
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * 2
+
+    @property
+    def total_samples(self) -> int:
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last["start_sample"] + last["samples"]
+
+    @property
+    def duration(self) -> float:
+        return self.total_samples / self.rate
+
+    def views(self, start: float = 0.0, end: float = None) -> Iterator[memoryview]:
+        """Memoryview slices of the mapped segments covering [start, end) seconds"""
+        first = max(0, int(start * self.rate))
+        last = self.total_samples if end is None else min(self.total_samples, int(end * self.rate))
+        for segment in self.segments:
+            seg_start = segment["start_sample"]
+            seg_end = seg_start + segment["samples"]
+            if seg_end <= first or seg_start >= last:
+                continue
+            lo = (max(first, seg_start) - seg_start) * self.frame_bytes + HEADER_SIZE
+            hi = (min(last, seg_end) - seg_start) * self.frame_bytes + HEADER_SIZE
+            yield memoryview(self._map(segment["path"]))[lo:hi]
+
+    def read(self, start: float = 0.0, end: float = None) -> bytes:
+        return b"".join(self.views(start, end))
+
+    def to_wav(self, start: float = 0.0, end: float = None) -> bytes:
+        """WAV file of a time range, e.g. to re-transcribe it (use wav_chunks to serve long ranges)"""
+        return b"".join(self.wav_chunks(start, end))
+
+    def wav_size(self, start: float = 0.0, end: float = None) -> int:
+        return WAV_HEADER_SIZE + sum(len(view) for view in self.views(start, end))
+
+    def wav_chunks(self, start: float = 0.0, end: float = None, chunk_bytes: int = 65536) -> Iterator[bytes]:
+        """WAV file of a time range in pieces of at most chunk_bytes, so a long range is never held in memory"""
+        data_bytes = self.wav_size(start, end) - WAV_HEADER_SIZE
+        yield struct.pack(WAV_HEADER_FORMAT, b"RIFF", 36 + data_bytes, b"WAVE", b"fmt ", 16, 1, self.channels,
+                          self.rate, self.rate * self.frame_bytes, self.frame_bytes, 16, b"data", data_bytes)
+        for view in self.views(start, end):
+            with view:  # released right away, so closing the reader mid-stream never finds it exported
+                for offset in range(0, len(view), chunk_bytes):
+                    yield bytes(view[offset:offset + chunk_bytes])
+
+    def close(self) -> None:
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+
+    def _map(self, path: str) -> mmap.mmap:
+        if path not in self._maps:
+            with open(path, "rb") as f:
+                self._maps[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[path]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ArchiveAudioSource(PacedSource):
+    """Replays a time range of an archived recording, e.g. to re-transcribe it"""
+
+    kind = "archive"
+
+    def __init__(self, directory: str, start: float = 0.0, end: float = None, chunk: int = 1024,
+                 realtime: bool = False):
+        super().__init__(16000, 1, chunk, realtime)
+        self.directory = directory
+        self.start = start
+        self.end = end
+        self._reader = None
+        self._views = None
+        self._pending = memoryview(b"")
+
+    def open(self) -> None:
+        self._reader = AudioArchiveReader(self.directory)
+        self.rate, self.channels = self._reader.rate, self._reader.channels
+        self._views = self._reader.views(self.start, self.end)
+
+    def read(self) -> bytes:
+        while len(self._pending) == 0:
+            self._pending = next(self._views, None)
+            if self._pending is None:
+                self._pending = memoryview(b"")
+                return b""
+        data = bytes(self._pending[:self.bytes_per_chunk])
+        self._pending = self._pending[len(data):]
+        return self._pace(data)
+
+    def close(self) -> None:
+        self._pending = memoryview(b"")
+        if self._views is not None:
+            self._views.close()
+            self._views = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(super().describe(), directory=self.directory, start=self.start, end=self.end)
@@ -0,0 +1,171 @@
+import heapq
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from app.audio.encoder import create_stream_encoder
+from app.audio.rollover import StreamRollover, timed_payloads
+from app.audio.vad import VoiceActivityDetector
+from app.core.config import settings
+
+
+def split_channels(payload: bytes, channels: int) -> List[bytes]:
+    """Deinterleave 16-bit PCM into one mono payload per channel"""
+    samples = np.frombuffer(payload, dtype=np.int16)
+    frames = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    return [np.ascontiguousarray(frames[:, channel]).tobytes() for channel in range(channels)]
+
+
+def channel_speakers(channels: int, names: str = None) -> List[str]:
+    """Speaker label per channel: AUDIO_CHANNEL_SPEAKERS names, then "Channel N" """
+    names = settings.AUDIO_CHANNEL_SPEAKERS if names is None else names
+    given = [name.strip() for name in names.split(",") if name.strip()]
+    return [given[channel] if channel < len(given) else f"Channel {channel + 1}" for channel in range(channels)]
+
+
+class ChannelSplitter:
+    """
+    Fans interleaved request payloads out to one bounded queue per channel.
+
+    Runs on its own thread so every channel's recognizer sees its audio at
+    the same pace. A full queue makes the splitter wait, which leaves the
+    capture ring buffer (and its overflow policy) to absorb a slow channel;
+    a channel whose recognizer has given up is detached and its audio dropped.
+    """
+
+    def __init__(self, payloads: Iterator[bytes], channels: int, max_pending: int = 50,
+                 on_tick: Optional[Callable[[], None]] = None, poll: float = 0.5):
+        self.payloads = payloads
+        self.channels = channels
+        self.on_tick = on_tick
+        self.poll = poll
+        self._queues = [queue.Queue(max_pending) for _ in range(channels)]
+        self._detached = [False] * channels
+        self._stopped = False
+        self._stats = {"payloads": 0, "dropped_payloads": 0}
+
+    def run(self) -> None:
+        try:
+            for payload in self.payloads:
+                if self._stopped:
+                    break
+                self._stats["payloads"] += 1
+                for channel, part in enumerate(split_channels(payload, self.channels)):
+                    self._put(channel, part)
+                if self.on_tick is not None:
+                    self.on_tick()
+        finally:
+            for channel in range(self.channels):
+                self._put(channel, None)
+
+    def channel_payloads(self, channel: int) -> Iterator[bytes]:
+        """Mono payloads of one channel until the splitter finishes"""
+        while True:
+            try:
+                item = self._queues[channel].get(timeout=self.poll)
+            except queue.Empty:
+                if self._stopped:
+                    return
+                continue
+            if item is None:
+                return
+            yield item
+
+    def detach(self, channel: int) -> None:
+        """Stop queueing audio for a channel nobody reads any more"""
+        self._detached[channel] = True
+
+    def stop(self) -> None:
+        self._stopped = True
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, pending=[q.qsize() for q in self._queues], detached=list(self._detached))
+
+    def _put(self, channel: int, item: Optional[bytes]) -> None:
+        while not self._detached[channel]:
+            try:
+                self._queues[channel].put(item, timeout=self.poll)
+                return
+            except queue.Full:
+                if self._stopped:
+                    break  # readers stop on their own once the splitter is stopped
+        if item is not None:
+            self._stats["dropped_payloads"] += 1
+
+
+class TranscriptMerger:
+    """
+    Merges final results from concurrent channel streams into one time-ordered transcript.
+
+    Channels finalize at different moments, so each final is held for
+    ``delay`` seconds and released in order of its start time in the
+    recording. Stragglers that miss the window are released late and
+    counted; the saved transcript is sorted by time anyway.
+    """
+
+    def __init__(self, delay: float = None):
+        self.delay = settings.AUDIO_CHANNEL_MERGE_DELAY_SECONDS if delay is None else delay
+        self._pending = []  # heap of (start, sequence, arrived, final)
+        self._sequence = 0
+        self._released_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"finals": 0, "late_finals": 0}
+
+    def add(self, start: float, final: Any) -> None:
+        with self._lock:
+            self._sequence += 1
+            heapq.heappush(self._pending, (start, self._sequence, time.monotonic(), final))
+            self._stats["finals"] += 1
+
+    def ready(self, flush: bool = False) -> List[Any]:
+        """Finals whose hold time is up (or all of them), in start-time order"""
+        released = []
+        now = time.monotonic()
+        with self._lock:
+            while self._pending and (flush or self._pending[0][2] + self.delay <= now):
+                start, _, _, final = heapq.heappop(self._pending)
+                if start < self._released_until:
+                    self._stats["late_finals"] += 1
+                self._released_until = max(self._released_until, start)
+                released.append(final)
+        return released
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending), delay=self.delay)
+
+
+class RecognitionStream:
+    """
+    One continuous recognition: its VAD, upstream encoder and stream rollover.
+
+    A recording has a single mixed stream, or one stream per channel with
+    the channel's speaker label instead of diarization.
+    """
+
+    def __init__(self, payloads: Iterator[bytes], rate: int = 16000, channels: int = 1, speaker: str = None,
+                 on_speech: Optional[Callable[[], None]] = None):
+        self.rate = rate
+        self.channels = channels
+        self.speaker = speaker
+        self.encoder = create_stream_encoder(rate=rate, channels=channels)
+        self.vad = VoiceActivityDetector(rate, channels) if settings.AUDIO_VAD_ENABLED else None
+        if self.vad is not None:
+            # Only speech counts as activity, so the silence check can fire; held-back
+            # audio leaves gaps in the payload offsets, which keep results in recording time
+            timed = self.vad.filter(payloads, on_speech=on_speech)
+        else:
+            timed = timed_payloads(payloads)
+        # Google ends a stream after ~5 minutes; roll over to a new one before that
+        self.rollover = StreamRollover(timed, rate * channels * 2)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "speaker": self.speaker,
+            "streams": self.rollover.stats(),
+            "vad": self.vad.stats() if self.vad else None,
+            "encoder": self.encoder.stats()
+        }
@@ -0,0 +1,42 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.audio.rollover import duration_seconds
+
+
+def speaker_label(speaker_tag: Optional[int]) -> str:
+    """Transcript label of a diarization speaker tag"""
+    return f"Speaker {speaker_tag}" if speaker_tag else "Unknown"
+
+
+def speaker_turns(words: Sequence, recording_time: Callable[..., float] = None
+                  ) -> List[Tuple[Optional[int], str, float, float]]:
+    """
+    Split a final result's words into speaker turns, in one pass.
+
+    Returns (speaker_tag, text, start, end) per run of consecutive words
+    from one speaker. Word offsets are mapped to recording seconds by
+    ``recording_time(seconds, end=...)`` (StreamRollover.recording_time)
+    when given. Untagged words (tag 0) stay with the turn they fall in;
+    leading ones join the first tagged speaker. The tag is None when no
+    word carries one.
+    """
+    turns = []
+    tag = None
+    parts: List[str] = []
+    start = end = 0.0
+    for word in words:
+        word_tag = getattr(word, "speaker_tag", 0) or None
+        if parts and word_tag is not None and tag is not None and word_tag != tag:
+            turns.append((tag, " ".join(parts), start, end))
+            parts = []
+        if not parts:
+            start = duration_seconds(word.start_time)
+        if word_tag is not None:
+            tag = word_tag
+        parts.append(word.word)
+        end = duration_seconds(word.end_time)
+    if parts:
+        turns.append((tag, " ".join(parts), start, end))
+    if recording_time is not None:
+        turns = [(tag, text, recording_time(start), recording_time(end, end=True)) for tag, text, start, end in turns]
+    return turns
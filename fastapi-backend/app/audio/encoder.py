@@ -0,0 +1,127 @@
+import shutil
+import subprocess
+import threading
+from typing import Any, Dict, Iterator, List
+
+from app.core.config import settings
+
+# Speech API encodings the pipeline can stream
+ENCODING_LINEAR16 = "LINEAR16"
+ENCODING_FLAC = "FLAC"
+ENCODING_OGG_OPUS = "OGG_OPUS"
+
+# Largest chunk handed to one StreamingRecognizeRequest (the API caps audio at 25 KB)
+MAX_ENCODED_CHUNK = 25600
+
+
+class StreamEncoder:
+    """
+    Turns a stream of 16-bit PCM payloads into the bytes sent to Speech-to-Text.
+
+    The base class passes LINEAR16 through untouched; subclasses compress.
+    ``encode()`` is called once per streaming_recognize call, because every
+    compressed stream has to start with its own container header.
+    """
+
+    encoding = ENCODING_LINEAR16
+
+    def __init__(self, rate: int = 16000, channels: int = 1):
+        self.rate = rate
+        self.channels = channels
+        self._lock = threading.Lock()
+        self._stats = {"streams": 0, "pcm_bytes": 0, "encoded_bytes": 0}
+
+    def encode(self, payloads: Iterator[bytes]) -> Iterator[bytes]:
+        self._count("streams", 1)
+        for payload in payloads:
+            self._count("pcm_bytes", len(payload))
+            self._count("encoded_bytes", len(payload))
+            yield payload
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        ratio = stats["encoded_bytes"] / stats["pcm_bytes"] if stats["pcm_bytes"] else 1.0
+        return dict(stats, encoding=self.encoding, compression_ratio=round(ratio, 3))
+
+    def _count(self, key: str, value: int) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+
+class FfmpegStreamEncoder(StreamEncoder):
+    """FLAC or Ogg/Opus encoding through an ffmpeg subprocess fed as audio arrives"""
+
+    def __init__(self, encoding: str, rate: int = 16000, channels: int = 1, opus_bitrate: str = None):
+        super().__init__(rate, channels)
+        if encoding not in (ENCODING_FLAC, ENCODING_OGG_OPUS):
+            raise ValueError(f"Unsupported stream encoding: {encoding}")
+        self.encoding = encoding
+        self.opus_bitrate = opus_bitrate or settings.AUDIO_OPUS_BITRATE
+
+    def command(self) -> List[str]:
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            # Raw PCM needs no probing; without this ffmpeg holds seconds of audio before encoding
+            "-probesize", "32", "-analyzeduration", "0",
+            "-f", "s16le", "-ar", str(self.rate), "-ac", str(self.channels), "-i", "pipe:0"
+        ]
+        if self.encoding == ENCODING_FLAC:
+            # Small blocks keep latency close to the request size
+            command += ["-c:a", "flac", "-frame_size", str(self.rate // 10), "-f", "flac"]
+        else:
+            command += [
+                "-c:a", "libopus", "-b:a", self.opus_bitrate, "-application", "voip", "-frame_duration", "20",
+                "-page_duration", "100000", "-f", "ogg"
+            ]
+        return command + ["-flush_packets", "1", "pipe:1"]
+
+    def encode(self, payloads: Iterator[bytes]) -> Iterator[bytes]:
+        self._count("streams", 1)
+        process = subprocess.Popen(
+            self.command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        feeder = threading.Thread(target=self._feed, args=(process, payloads), name="audio-encoder", daemon=True)
+        feeder.start()
+        try:
+            while True:
+                data = process.stdout.read1(MAX_ENCODED_CHUNK)
+                if not data:
+                    break
+                self._count("encoded_bytes", len(data))
+                yield data
+        finally:
+            if process.poll() is None:
+                process.kill()
+            # The feeder must be done with the payload iterator before the next stream uses it
+            feeder.join()
+            process.stdout.close()
+            process.wait()
+
+    def _feed(self, process: subprocess.Popen, payloads: Iterator[bytes]) -> None:
+        try:
+            for payload in payloads:
+                process.stdin.write(payload)
+                process.stdin.flush()
+                self._count("pcm_bytes", len(payload))
+        except (BrokenPipeError, ValueError, OSError):
+            pass  # ffmpeg was stopped because the stream ended
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+
+def create_stream_encoder(encoding: str = None, rate: int = 16000, channels: int = 1) -> StreamEncoder:
+    """Encoder for AUDIO_STREAM_ENCODING; falls back to LINEAR16 when ffmpeg is missing"""
+    encoding = (encoding or settings.AUDIO_STREAM_ENCODING).upper()
+    if encoding == ENCODING_LINEAR16:
+        return StreamEncoder(rate, channels)
+    if encoding == ENCODING_OGG_OPUS and rate not in (8000, 12000, 16000, 24000, 48000):
+        print(f"OGG_OPUS needs 8/12/16/24/48 kHz audio, got {rate} Hz; streaming LINEAR16")
+        return StreamEncoder(rate, channels)
+    if shutil.which("ffmpeg") is None:
+        print(f"ffmpeg not found; streaming LINEAR16 instead of {encoding}")
+        return StreamEncoder(rate, channels)
+    return FfmpegStreamEncoder(encoding, rate, channels)
@@ -0,0 +1,198 @@
+from math import ceil, gcd
+from typing import Any, Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.audio.sources import SAMPLE_WIDTH, AudioSource
+from app.core.config import settings
+
+
+def polyphase_filter(up: int, down: int, half_width: int = 16, rolloff: float = 0.9,
+                     beta: float = 8.0) -> np.ndarray:
+    """
+    Kaiser-windowed sinc low-pass for resampling by up/down, as a polyphase
+    bank: row p holds the taps applied for output phase p
+    """
+    factor = max(up, down)
+    taps_per_phase = ceil(2 * half_width * factor / up)
+    length = taps_per_phase * up
+    cutoff = rolloff / (2 * factor)  # cycles per sample at the upsampled rate
+    n = np.arange(length) - (length - 1) / 2
+    prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta) * up
+    return prototype.reshape(taps_per_phase, up).T.astype(np.float32)
+
+
+class StreamResampler:
+    """
+    Streaming rate conversion and downmix of 16-bit interleaved PCM.
+
+    Every output sample is a dot product of one polyphase row with the
+    window of input ending at it. Outputs sharing a phase read windows at a
+    fixed stride, so for few phases (48 kHz, 8 kHz) each phase is one
+    matrix-vector product over a strided view of the input; otherwise the
+    windows are gathered row by row. The last taps' worth of input is
+    carried over so block boundaries are seamless.
+    Output is aligned to the input (the filter delay is skipped) and
+    ``flush()`` returns the tail once the input has ended.
+    """
+
+    def __init__(self, in_rate: int, in_channels: int = 1, out_rate: int = 16000, out_channels: int = 1,
+                 half_width: int = 16):
+        if out_channels not in (1, in_channels):
+            raise ValueError("Audio can only be downmixed to mono or keep its channels")
+        self.in_rate = in_rate
+        self.in_channels = in_channels
+        self.out_rate = out_rate
+        self.out_channels = out_channels
+        divisor = gcd(in_rate, out_rate)
+        self.up = out_rate // divisor
+        self.down = in_rate // divisor
+        self.passthrough = self.up == self.down
+
+        self.bank = None if self.passthrough else polyphase_filter(self.up, self.down, half_width)
+        taps = 1 if self.bank is None else self.bank.shape[1]
+        self._taps = taps
+        # Reversed so a window read oldest-first lines up with the taps
+        self._reversed = None if self.bank is None else np.ascontiguousarray(self.bank[:, ::-1])
+        # Input history starts with zeros so the first outputs have a full window
+        self._history = np.zeros((taps - 1, out_channels), dtype=np.float32)
+        self._history_start = -(taps - 1)  # absolute input index of _history[0]
+        # Skip the outputs that only cover the filter's delay, so output sample 0 lines up with input sample 0
+        self._delay = 0 if self.bank is None else ((taps * self.up - 1) // 2 + self.down // 2) // self.down
+        self._next = self._delay  # absolute index of the next output sample
+        self._stats = {"input_frames": 0, "output_frames": 0}
+
+    def process(self, data: bytes) -> bytes:
+        """Convert one block of PCM; returns whatever output it completes"""
+        frames = self._frames(data)
+        self._stats["input_frames"] += len(frames)
+        if self.passthrough:
+            return self._emit(frames)
+        return self._emit(self._convert(frames))
+
+    def flush(self) -> bytes:
+        """Output still held back by the filter once the input has ended"""
+        if self.passthrough:
+            return b""
+        expected = self._delay + ceil(self._stats["input_frames"] * self.up / self.down)
+        tail = self._convert(np.zeros((self._taps, self.out_channels), dtype=np.float32))
+        return self._emit(tail[:max(0, expected - (self._next - len(tail)))])
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, in_rate=self.in_rate, in_channels=self.in_channels, out_rate=self.out_rate,
+                    out_channels=self.out_channels)
+
+    def _frames(self, data: bytes) -> np.ndarray:
+        """PCM bytes as float frames, downmixed if needed"""
+        samples = np.frombuffer(data, dtype=np.int16)
+        frames = samples[:len(samples) - len(samples) % self.in_channels].reshape(-1, self.in_channels)
+        if self.out_channels == 1 and self.in_channels > 1:
+            # A matrix product averages the channels far faster than mean() over a short axis
+            return (frames.astype(np.float32) @ np.full(self.in_channels, 1 / self.in_channels, np.float32))[:, None]
+        return frames.astype(np.float32)
+
+    def _convert(self, frames: np.ndarray) -> np.ndarray:
+        signal = np.concatenate((self._history, frames))
+        last = self._history_start + len(signal) - 1  # absolute index of the newest input sample
+        # Output n uses input samples up to (n * down) // up
+        stop = ((last + 1) * self.up - 1) // self.down + 1
+        count = max(0, stop - self._next)
+        # Row r of the view is the window signal[r:r + taps], i.e. the one ending at input r + taps - 1
+        windows = sliding_window_view(signal, self._taps, axis=0)  # (rows, channels, taps)
+        output = np.empty((count, self.out_channels), dtype=np.float32)
+
+        if count >= 16 * self.up:
+            # Outputs n, n + up, n + 2 * up... share a phase and their windows are `down` rows apart
+            for offset in range(min(self.up, count)):
+                n = self._next + offset
+                row = (n * self.down) // self.up - self._history_start - (self._taps - 1)
+                rows = windows[row::self.down][:len(range(offset, count, self.up))]
+                output[offset::self.up] = rows @ self._reversed[(n * self.down) % self.up]
+        elif count:
+            n = np.arange(self._next, stop, dtype=np.int64)
+            rows = (n * self.down) // self.up - self._history_start - (self._taps - 1)
+            output[:] = np.einsum("oct,ot->oc", windows[rows], self._reversed[(n * self.down) % self.up])
+
+        self._next += count
+        keep = self._taps - 1
+        self._history_start += len(signal) - keep
+        self._history = signal[len(signal) - keep:]
+        return output
+
+    def _emit(self, frames: np.ndarray) -> bytes:
+        self._stats["output_frames"] += len(frames)
+        return np.clip(np.rint(frames), -32768, 32767).astype("<i2").tobytes()
+
+
+def resample_pcm(data: bytes, in_rate: int, in_channels: int = 1, out_rate: int = 16000, out_channels: int = 1,
+                 block_seconds: float = 10.0) -> bytes:
+    """Convert a whole PCM buffer, block by block to bound the working memory"""
+    resampler = StreamResampler(in_rate, in_channels, out_rate, out_channels)
+    if resampler.passthrough and out_channels == in_channels:
+        return data
+    block = max(1, int(block_seconds * in_rate)) * in_channels * SAMPLE_WIDTH
+    parts = [resampler.process(data[offset:offset + block]) for offset in range(0, len(data), block)]
+    parts.append(resampler.flush())
+    return b"".join(parts)
+
+
+class ResampledSource(AudioSource):
+    """
+    Wraps a source and delivers its audio at the recognizer's format.
+
+    The wrapped source's format is only known once it is open (a WAV file
+    brings its own), so the resampler is set up in ``open()``; audio that
+    already matches passes through untouched. Channels are downmixed to mono
+    unless each one gets its own recognition stream.
+    """
+
+    def __init__(self, source: AudioSource, rate: int = None, downmix: bool = None):
+        super().__init__(source.rate, source.channels, source.chunk)
+        self.source = source
+        self.target_rate = rate or settings.AUDIO_TARGET_RATE
+        self.downmix = not settings.AUDIO_CHANNEL_STREAMS if downmix is None else downmix
+        self.resampler = None
+        self._flushed = False
+
+    @property
+    def kind(self) -> str:
+        return self.source.kind
+
+    @property
+    def realtime(self) -> bool:
+        """Whether the wrapped source delivers audio no faster than it plays"""
+        return getattr(self.source, "realtime", True)
+
+    def open(self) -> None:
+        self.source.open()
+        channels = 1 if self.downmix else self.source.channels
+        self.resampler = StreamResampler(self.source.rate, self.source.channels, self.target_rate, channels)
+        self.rate, self.channels = self.target_rate, channels
+
+    def read(self) -> bytes:
+        if self._unchanged:
+            return self.source.read()
+        while True:
+            data = self.source.read()
+            if not data:
+                if self._flushed:
+                    return b""
+                self._flushed = True
+                return self.resampler.flush()
+            converted = self.resampler.process(data)
+            if converted:
+                return converted
+
+    def close(self) -> None:
+        self.source.close()
+
+    @property
+    def _unchanged(self) -> bool:
+        return self.resampler.passthrough and self.resampler.in_channels == self.resampler.out_channels
+
+    def describe(self) -> Dict[str, Any]:
+        description = dict(self.source.describe(), rate=self.rate, channels=self.channels)
+        if self.resampler is not None and not self._unchanged:
+            description["resampled_from"] = {"rate": self.source.rate, "channels": self.source.channels}
+        return description
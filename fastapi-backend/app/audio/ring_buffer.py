@@ -0,0 +1,288 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+# What a full buffer does with new audio
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # overwrite the oldest unread audio
+OVERFLOW_BLOCK = "block"              # make the capture thread wait (then drop the new audio)
+OVERFLOW_SPILL = "spill"              # queue the excess in a temp file, nothing is lost
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK, OVERFLOW_SPILL)
+
+# Speech streaming requests must stay under 25 KB of audio each
+MAX_REQUEST_BYTES = 25600
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size byte ring between an audio capture thread and the recognizer.
+
+    The storage is one preallocated bytearray; writes copy into it through
+    memoryview slices, so capture never allocates per chunk. Positions are
+    kept as absolute byte counts, which makes fill level and consumer lag
+    simple differences. When the ring is full the overflow policy decides
+    whether old audio is dropped, the writer blocks, or audio spills to disk.
+    """
+
+    def __init__(self, capacity: int, policy: str = OVERFLOW_DROP_OLDEST, frame_bytes: int = 2,
+                 bytes_per_second: int = 32000, block_timeout: Optional[float] = 1.0,
+                 spill_dir: Optional[str] = None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        # Whole frames only, so dropping or reading never splits a sample
+        self.capacity = max(frame_bytes, capacity - capacity % frame_bytes)
+        self.policy = policy
+        self.frame_bytes = frame_bytes
+        self.bytes_per_second = bytes_per_second
+        self.block_timeout = block_timeout
+        self.spill_dir = spill_dir or settings.TEMP_DIR
+
+        self._buffer = bytearray(self.capacity)
+        self._view = memoryview(self._buffer)
+        self._head = 0  # absolute offset of the next byte to read
+        self._tail = 0  # absolute offset of the next byte to write
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._spill = None
+        self._spill_read = 0
+        self._spill_written = 0
+
+        self._stats = {
+            "written_bytes": 0, "read_bytes": 0, "dropped_bytes": 0, "overflows": 0,
+            "blocked_seconds": 0.0, "spilled_bytes": 0, "max_fill_bytes": 0
+        }
+
+    @classmethod
+    def for_source(cls, source, seconds: float = None, policy: str = None) -> "AudioRingBuffer":
+        """
+        Buffer sized to hold `seconds` of the source's audio. Sources read
+        faster than real time (files or archives with realtime off) block
+        until there is room instead, so a fast replay is slowed down, not cut.
+        """
+        seconds = settings.AUDIO_BUFFER_SECONDS if seconds is None else seconds
+        frame_bytes = source.channels * 2
+        bytes_per_second = source.rate * frame_bytes
+        block_timeout = settings.AUDIO_BLOCK_TIMEOUT
+        if policy is None and not getattr(source, "realtime", True):
+            policy, block_timeout = OVERFLOW_BLOCK, None
+        return cls(
+            int(seconds * bytes_per_second),
+            policy or settings.AUDIO_OVERFLOW_POLICY,
+            frame_bytes,
+            bytes_per_second,
+            block_timeout
+        )
+
+    @property
+    def fill(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def finished(self) -> bool:
+        """Closed by the writer and fully drained"""
+        with self._cond:
+            return self._closed and self.fill == 0 and self._spill_pending() == 0
+
+    def write(self, data) -> None:
+        """Append captured audio, applying the overflow policy if the ring is full"""
+        view = memoryview(data).cast("B")
+        # Larger-than-ring writes are handled one ring's worth at a time
+        for start in range(0, len(view), self.capacity):
+            self._write_piece(view[start:start + self.capacity])
+
+    def _write_piece(self, view: memoryview) -> None:
+        size = len(view)
+        with self._cond:
+            if self._closed:
+                return
+            if self._spill_pending():
+                # Older audio is still on disk; keep order by queueing behind it
+                self._spill_out(view)
+                return
+
+            free = self.capacity - self.fill
+            if size > free:
+                self._stats["overflows"] += 1
+                if self.policy == OVERFLOW_DROP_OLDEST:
+                    drop = size - free
+                    self._head += drop
+                    self._stats["dropped_bytes"] += drop
+                elif self.policy == OVERFLOW_SPILL:
+                    self._spill_out(view)
+                    return
+                else:
+                    started = time.monotonic()
+                    has_room = self._cond.wait_for(
+                        lambda: self._closed or self.capacity - self.fill >= size, self.block_timeout
+                    )
+                    self._stats["blocked_seconds"] += time.monotonic() - started
+                    if self._closed:
+                        return
+                    if not has_room:
+                        self._stats["dropped_bytes"] += size
+                        return
+
+            self._copy_in(view)
+            self._stats["written_bytes"] += size
+            self._stats["max_fill_bytes"] = max(self._stats["max_fill_bytes"], self.fill)
+            self._cond.notify_all()
+
+    def read(self, size: int, timeout: float = None) -> bytes:
+        """
+        Take up to `size` bytes, waiting until that much is buffered, the
+        writer closes the ring, or the timeout passes (then whatever is there)
+        """
+        size -= size % self.frame_bytes
+        with self._cond:
+            self._cond.wait_for(lambda: self._available(size), timeout)
+            self._refill_from_spill()
+            take = min(size, self.fill)
+            take -= take % self.frame_bytes
+            if take <= 0:
+                return b""
+            data = self._copy_out(take)
+            self._head += take
+            self._stats["read_bytes"] += take
+            self._refill_from_spill()
+            self._cond.notify_all()
+            return data
+
+    def close(self) -> None:
+        """Stop accepting audio; readers drain what is left"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        """Close the ring and drop the spill file"""
+        self.close()
+        with self._cond:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            self._spill_read = self._spill_written = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            fill = self.fill
+            pending = self._spill_pending()
+        stats["blocked_seconds"] = round(stats["blocked_seconds"], 3)
+        stats["dropped_frames"] = stats["dropped_bytes"] // self.frame_bytes
+        return dict(
+            stats,
+            policy=self.policy,
+            capacity_bytes=self.capacity,
+            fill_bytes=fill,
+            fill_ratio=round(fill / self.capacity, 3),
+            spill_pending_bytes=pending,
+            # How far the recognizer is behind capture
+            consumer_lag_seconds=round((fill + pending) / self.bytes_per_second, 3)
+        )
+
+    def _available(self, size: int) -> bool:
+        return self._closed or self.fill >= size or (self._spill_pending() > 0 and self.fill < self.capacity)
+
+    def _copy_in(self, view: memoryview) -> None:
+        size = len(view)
+        start = self._tail % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = view[:first]
+        if first < size:
+            self._view[:size - first] = view[first:]
+        self._tail += size
+
+    def _copy_out(self, size: int) -> bytes:
+        start = self._head % self.capacity
+        first = min(size, self.capacity - start)
+        if first == size:
+            return bytes(self._view[start:start + size])
+        return b"".join((self._view[start:], self._view[:size - first]))
+
+    def _spill_pending(self) -> int:
+        return self._spill_written - self._spill_read
+
+    def _spill_out(self, view: memoryview) -> None:
+        if self._spill is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill = tempfile.TemporaryFile(dir=self.spill_dir, prefix="audio_spill_")
+        self._spill.seek(self._spill_written)
+        self._spill.write(view)
+        self._spill_written += len(view)
+        self._stats["spilled_bytes"] += len(view)
+
+    def _refill_from_spill(self) -> None:
+        """Move spilled audio back into the ring as room frees up, oldest first"""
+        pending = self._spill_pending()
+        free = self.capacity - self.fill
+        if not pending or not free:
+            return
+        size = min(pending, free)
+        self._spill.seek(self._spill_read)
+        self._copy_in(memoryview(self._spill.read(size)))
+        self._spill_read += size
+        self._stats["written_bytes"] += size
+        if self._spill_read == self._spill_written:
+            # Drained: reuse the file from the start
+            self._spill.truncate(0)
+            self._spill_read = self._spill_written = 0
+
+
+def request_bytes_for(request_ms: int, rate: int, channels: int) -> int:
+    """Bytes of 16-bit PCM in one recognition request of `request_ms`, capped at MAX_REQUEST_BYTES"""
+    frames = max(1, int(rate * request_ms / 1000))
+    frame_bytes = channels * 2
+    return min(frames * frame_bytes, MAX_REQUEST_BYTES - MAX_REQUEST_BYTES % frame_bytes)
+
+
+def request_payloads(buffer: AudioRingBuffer, request_bytes: int, keep_running: Callable[[], bool] = lambda: True,
+                     poll: float = 0.5) -> Iterator[bytes]:
+    """
+    Yield request-sized payloads from the ring until it is drained or
+    keep_running() turns false. Each payload is one slice copied out of the
+    ring, so aggregating frames costs no extra joins or copies; a partial
+    payload is sent if a full one doesn't arrive within `poll` seconds.
+    """
+    while keep_running():
+        data = buffer.read(request_bytes, timeout=poll)
+        if data:
+            yield data
+        elif buffer.finished:
+            break
+
+
+class AudioCapture:
+    """Reads an opened AudioSource on its own thread and writes it into a ring buffer (and archive)"""
+
+    def __init__(self, source, buffer: AudioRingBuffer, archive=None):
+        self.source = source
+        self.buffer = buffer
+        self.archive = archive
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop capturing; the buffer is closed once the thread exits"""
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            for data in self.source.chunks(lambda: self._running):
+                if self.archive is not None:
+                    self.archive.append(data)
+                self.buffer.write(data)
+        except Exception as e:
+            print(f"Error capturing audio: {e}")
+        finally:
+            self.buffer.close()
@@ -0,0 +1,163 @@
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+def duration_seconds(value) -> float:
+    """Seconds in a Speech API offset (timedelta or protobuf Duration)"""
+    if value is None:
+        return 0.0
+    if hasattr(value, "total_seconds"):
+        return value.total_seconds()
+    return getattr(value, "seconds", 0) + getattr(value, "nanos", 0) / 1e9
+
+
+def timed_payloads(payloads: Iterator[bytes]) -> Iterator[Tuple[int, bytes]]:
+    """(byte offset, payload) for payloads that reach the recognizer without gaps"""
+    offset = 0
+    for payload in payloads:
+        yield offset, payload
+        offset += len(payload)
+
+
+class StreamRollover:
+    """
+    Splits one continuous audio stream across successive streaming_recognize calls.
+
+    Google ends a stream after about five minutes, so each call gets at most
+    `limit` seconds; the next call starts by replaying the audio after the
+    last final result (at least `overlap` seconds, at most `max_replay`).
+    Result offsets are rebased onto the whole recording, and final words that
+    end before the last final already emitted are dropped, so the overlap
+    never produces duplicated finals.
+
+    Payloads come with their byte offset in the recording. Audio held back
+    by the VAD leaves gaps between them, which are recorded so offsets in
+    the sent audio map back to recording time (``recording_time``).
+    """
+
+    def __init__(self, payloads: Iterator[Tuple[int, bytes]], bytes_per_second: int, limit: float = None,
+                 overlap: float = None, max_replay: float = None):
+        self.payloads = payloads
+        self.bytes_per_second = bytes_per_second
+        self.limit = settings.SPEECH_STREAM_LIMIT_SECONDS if limit is None else limit
+        self.overlap = settings.SPEECH_STREAM_OVERLAP_SECONDS if overlap is None else overlap
+        self.max_replay = settings.SPEECH_STREAM_REPLAY_MAX_SECONDS if max_replay is None else max_replay
+        self.finished = False
+
+        self._history = deque()  # (absolute byte offset, payload) kept for replay
+        self._sent = 0           # absolute bytes taken from the payload iterator
+        self._stream_start = 0   # absolute byte offset of the current stream's first payload
+        self._replay: List[Tuple[int, bytes]] = []
+        self.last_final_end = 0.0  # seconds of sent audio covered by emitted finals
+        # Where the sent audio skips ahead of the recording: sent byte offset and recording - sent bytes from there
+        self._gap_offsets: List[int] = [0]
+        self._gap_shifts: List[int] = [0]
+
+        self._stats = {"streams": 0, "replayed_seconds": 0.0, "duplicate_words": 0, "duplicate_results": 0}
+
+    def stream_audio(self) -> Iterator[bytes]:
+        """Audio for one streaming_recognize call: the replayed overlap, then new audio up to the limit"""
+        self._stats["streams"] += 1
+        started = time.monotonic()
+        self._stream_start = self._replay[0][0] if self._replay else self._sent
+        self._forget_gaps()
+        streamed = 0
+
+        for _, payload in self._replay:
+            streamed += len(payload)
+            self._stats["replayed_seconds"] += len(payload) / self.bytes_per_second
+            yield payload
+        self._replay = []
+
+        # Wall time matters as much as audio: a lagging recognizer gets audio faster than real time
+        while streamed / self.bytes_per_second < self.limit and time.monotonic() - started < self.limit:
+            item = next(self.payloads, None)
+            if item is None:
+                self.finished = True
+                return
+            recording_offset, payload = item
+            self._remember(recording_offset, payload)
+            streamed += len(payload)
+            yield payload
+
+    def rotate(self) -> None:
+        """Prepare the next stream to replay the audio after the last emitted final"""
+        replay_from = min(
+            int(self.last_final_end * self.bytes_per_second),
+            self._sent - int(self.overlap * self.bytes_per_second)
+        )
+        replay_from = max(replay_from, self._sent - int(self.max_replay * self.bytes_per_second))
+        self._replay = [(offset, payload) for offset, payload in self._history if offset + len(payload) > replay_from]
+
+    @property
+    def stream_offset(self) -> float:
+        """Seconds of sent audio before the current stream's audio starts"""
+        return self._stream_start / self.bytes_per_second
+
+    def recording_time(self, stream_seconds: float, end: bool = False) -> float:
+        """
+        Recording time of an offset in the current stream (e.g. a word time),
+        with the audio the VAD held back added back in. An end time on the
+        edge of a gap belongs to the audio before it.
+        """
+        sent = self._stream_start + stream_seconds * self.bytes_per_second
+        find = bisect_left if end else bisect_right
+        shift = self._gap_shifts[max(0, find(self._gap_offsets, sent) - 1)]
+        return (sent + shift) / self.bytes_per_second
+
+    def final_words(self, result, alternative) -> Optional[Tuple[str, list]]:
+        """
+        Rebase a final result onto the recording and strip words already
+        emitted; returns (transcript, words) or None if nothing new remains
+        """
+        stream_offset = self.stream_offset
+        result_end = stream_offset + duration_seconds(getattr(result, "result_end_time", None))
+        words = list(getattr(alternative, "words", None) or [])
+
+        if not words:
+            if result_end <= self.last_final_end:
+                self._stats["duplicate_results"] += 1
+                return None
+            self.last_final_end = result_end
+            return alternative.transcript, words
+
+        kept = [word for word in words if stream_offset + duration_seconds(word.end_time) > self.last_final_end]
+        self._stats["duplicate_words"] += len(words) - len(kept)
+        if not kept:
+            self._stats["duplicate_results"] += 1
+            return None
+
+        self.last_final_end = max(result_end, stream_offset + duration_seconds(kept[-1].end_time))
+        if len(kept) == len(words):
+            return alternative.transcript, kept
+        return " ".join(word.word for word in kept), kept
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            replayed_seconds=round(self._stats["replayed_seconds"], 2),
+            audio_seconds=round(self._sent / self.bytes_per_second, 2),
+            last_final_end=round(self.last_final_end, 2)
+        )
+
+    def _remember(self, recording_offset: int, payload: bytes) -> None:
+        shift = recording_offset - self._sent
+        if shift != self._gap_shifts[-1]:
+            self._gap_offsets.append(self._sent)
+            self._gap_shifts.append(shift)
+        self._history.append((self._sent, payload))
+        self._sent += len(payload)
+        horizon = self._sent - int(self.max_replay * self.bytes_per_second)
+        while self._history and self._history[0][0] + len(self._history[0][1]) <= horizon:
+            self._history.popleft()
+
+    def _forget_gaps(self) -> None:
+        """Drop gaps before the current stream, keeping the one its start falls in"""
+        keep = max(0, bisect_right(self._gap_offsets, self._stream_start) - 1)
+        if keep:
+            del self._gap_offsets[:keep]
+            del self._gap_shifts[:keep]
@@ -0,0 +1,385 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+import wave
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+
+from app.core.config import settings
+
+# Every source delivers 16-bit little-endian PCM (LINEAR16)
+SAMPLE_WIDTH = 2
+
+
+class AudioSource:
+    """
+    Base class for the audio fed into a bot's recording pipeline.
+
+    A source is opened once, read chunk by chunk and closed. ``read()``
+    returns up to ``chunk`` frames of PCM and b"" once the source is
+    exhausted, so files, pipes and generators can end a recording on
+    their own while a microphone runs until the bot stops it.
+    """
+
+    kind = "base"
+
+    def __init__(self, rate: int = 16000, channels: int = 1, chunk: int = 1024):
+        self.rate = rate
+        self.channels = channels
+        self.chunk = chunk
+        self.exhausted = False
+
+    @property
+    def bytes_per_chunk(self) -> int:
+        return self.chunk * self.channels * SAMPLE_WIDTH
+
+    def open(self) -> None:
+        pass
+
+    def read(self) -> bytes:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def chunks(self, keep_running: Callable[[], bool] = lambda: True) -> Iterator[bytes]:
+        """Yield chunks until the source is exhausted or keep_running() turns false"""
+        while keep_running() and not self.exhausted:
+            try:
+                data = self.read()
+            except Exception as e:
+                print(f"Error reading audio: {e}")
+                time.sleep(0.1)  # Prevent tight loop on error
+                continue
+            if not data:
+                self.exhausted = True
+                break
+            yield data
+
+    def describe(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "rate": self.rate, "channels": self.channels, "chunk": self.chunk}
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PyAudioSource(AudioSource):
+    """Local input device (microphone or loopback) read through PyAudio"""
+
+    kind = "pyaudio"
+
+    def __init__(self, rate: int = 16000, channels: int = 1, chunk: int = 1024, device_index: Optional[int] = None):
+        super().__init__(rate, channels, chunk)
+        self.device_index = device_index
+        self._audio = None
+        self._stream = None
+
+    def open(self) -> None:
+        import pyaudio
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk
+        )
+
+    def read(self) -> bytes:
+        return self._stream.read(self.chunk, exception_on_overflow=False)
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+
+
+class PacedSource(AudioSource):
+    """Source that can be throttled to real time, as if it were captured live"""
+
+    def __init__(self, rate: int = 16000, channels: int = 1, chunk: int = 1024, realtime: bool = True):
+        super().__init__(rate, channels, chunk)
+        self.realtime = realtime
+        self._started = None
+        self._frames = 0
+
+    def _pace(self, data: bytes) -> bytes:
+        """Sleep until this chunk's end time so audio arrives no faster than it plays"""
+        if self._started is None:
+            self._started = time.monotonic()
+        self._frames += len(data) // (self.channels * SAMPLE_WIDTH)
+        if self.realtime:
+            delay = self._started + self._frames / self.rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+
+class FileAudioSource(PacedSource):
+    """WAV or headerless PCM file, replayed in real time or as fast as possible"""
+
+    kind = "file"
+
+    def __init__(self, path: str, rate: int = 16000, channels: int = 1, chunk: int = 1024, realtime: bool = True):
+        super().__init__(rate, channels, chunk, realtime)
+        self.path = path
+        self._wav = None
+        self._file = None
+
+    def open(self) -> None:
+        if self.path.lower().endswith(".wav"):
+            self._wav = wave.open(self.path, "rb")
+            if self._wav.getsampwidth() != SAMPLE_WIDTH:
+                self._wav.close()
+                raise ValueError(f"{self.path}: only 16-bit PCM WAV files are supported")
+            # The file's own format wins over the defaults
+            self.rate = self._wav.getframerate()
+            self.channels = self._wav.getnchannels()
+        else:
+            self._file = open(self.path, "rb")
+
+    def read(self) -> bytes:
+        if self._wav is not None:
+            data = self._wav.readframes(self.chunk)
+        else:
+            data = self._file.read(self.bytes_per_chunk)
+        return self._pace(data) if data else b""
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(super().describe(), path=self.path, realtime=self.realtime)
+
+
+class StreamAudioSource(AudioSource):
+    """Raw PCM read from a named pipe or a TCP socket until the writer closes it"""
+
+    kind = "stream"
+
+    def __init__(self, target: str, rate: int = 16000, channels: int = 1, chunk: int = 1024):
+        super().__init__(rate, channels, chunk)
+        self.target = target
+        self._socket = None
+        self._file = None
+
+    def open(self) -> None:
+        if self.target.startswith("tcp://"):
+            host, _, port = self.target[len("tcp://"):].rpartition(":")
+            self._socket = socket.create_connection((host, int(port)))
+            self._file = self._socket.makefile("rb")
+            self.kind = "tcp"
+        else:
+            # Opening a FIFO blocks until a writer connects
+            self._file = open(self.target, "rb")
+            self.kind = "pipe"
+
+    def read(self) -> bytes:
+        # Buffered reads wait for a whole chunk unless the writer closes the stream
+        return self._file.read(self.bytes_per_chunk)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(super().describe(), target=self.target)
+
+
+class GeneratorAudioSource(PacedSource):
+    """In-memory PCM chunks from an iterable, mainly for tests and benchmarks"""
+
+    kind = "generator"
+
+    def __init__(self, chunks: Union[Iterable[bytes], Callable[[], Iterable[bytes]]], rate: int = 16000,
+                 channels: int = 1, chunk: int = 1024, realtime: bool = False):
+        super().__init__(rate, channels, chunk, realtime)
+        self._chunks = chunks
+        self._iterator = None
+
+    def open(self) -> None:
+        chunks = self._chunks() if callable(self._chunks) else self._chunks
+        self._iterator = iter(chunks)
+
+    def read(self) -> bytes:
+        data = next(self._iterator, b"")
+        return self._pace(data) if data else b""
+
+
+class PushAudioSource(AudioSource):
+    """
+    PCM pushed in by another thread or the event loop (e.g. a WebSocket client).
+
+    At most ``max_buffered`` seconds are held; ``push()`` waits without
+    blocking the event loop until the capture thread has made room, which
+    is what gives each connection its backpressure. ``end()`` marks the
+    end of the audio once the buffered part has been read.
+    """
+
+    kind = "push"
+
+    def __init__(self, rate: int = 16000, channels: int = 1, chunk: int = 1024, max_buffered: float = 2.0):
+        super().__init__(rate, channels, chunk)
+        self.capacity = max(self.bytes_per_chunk, int(max_buffered * rate * channels * SAMPLE_WIDTH))
+        self._chunks = deque()
+        self._buffered = 0
+        self._ended = False
+        self._cond = threading.Condition()
+        self._waiter = None  # (loop, future) of a push() waiting for room
+        self.waited_seconds = 0.0
+
+    @property
+    def ended(self) -> bool:
+        return self._ended
+
+    def offer(self, data: bytes) -> bool:
+        """Queue audio if there is room; False if the buffer is full or the source has ended"""
+        with self._cond:
+            return self._offer(data)
+
+    async def push(self, data: bytes, timeout: float = None) -> bool:
+        """Queue audio, waiting for room; False if the source ended or the wait timed out"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._offer(data):
+                    return True
+                if self._ended:
+                    return False
+                loop = asyncio.get_running_loop()
+                waiter = loop.create_future()
+                self._waiter = (loop, waiter)
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(waiter, None if deadline is None else deadline - started)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self.waited_seconds += time.monotonic() - started
+
+    def end(self) -> None:
+        """No more audio will be pushed"""
+        with self._cond:
+            self._ended = True
+            self._cond.notify_all()
+            self._wake_pusher()
+
+    def read(self) -> bytes:
+        with self._cond:
+            self._cond.wait_for(lambda: self._buffered >= self.bytes_per_chunk or self._ended)
+            if not self._chunks:
+                return b""
+            size = min(self._buffered, self.bytes_per_chunk)
+            parts = []
+            taken = 0
+            while taken < size:
+                head = self._chunks[0]
+                take = min(len(head), size - taken)
+                parts.append(head[:take])
+                if take == len(head):
+                    self._chunks.popleft()
+                else:
+                    self._chunks[0] = head[take:]
+                taken += take
+            self._buffered -= size
+            self._wake_pusher()
+            return b"".join(parts)
+
+    def close(self) -> None:
+        self.end()
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(super().describe(), buffered_bytes=self._buffered, waited_seconds=round(self.waited_seconds, 3))
+
+    def _offer(self, data: bytes) -> bool:
+        if self._ended:
+            return False
+        # An oversized message is still accepted into an empty buffer so it can't wedge the stream
+        if self._buffered and self._buffered + len(data) > self.capacity:
+            return False
+        self._chunks.append(bytes(data))
+        self._buffered += len(data)
+        self._cond.notify_all()
+        return True
+
+    def _wake_pusher(self) -> None:
+        if self._waiter is not None:
+            loop, waiter = self._waiter
+            self._waiter = None
+            try:
+                loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+            except RuntimeError:
+                pass  # the pushing event loop is already closed
+
+
+def _input_path(name: str) -> str:
+    """Resolve a file or pipe name inside AUDIO_INPUT_DIR, refusing anything outside it"""
+    base = os.path.realpath(settings.AUDIO_INPUT_DIR)
+    path = os.path.realpath(os.path.join(base, name))
+    if os.path.commonpath([base, path]) != base:
+        raise ValueError(f"Audio input must be inside {settings.AUDIO_INPUT_DIR}")
+    if not os.path.exists(path):
+        raise ValueError(f"Audio input not found: {name}")
+    return path
+
+
+def _tcp_address(spec: str) -> str:
+    """Check a tcp:// source against the configured ones, so requests can't make the server connect anywhere"""
+    address = spec[len("tcp://"):].strip().lower()
+    allowed = {item.strip().lower() for item in settings.AUDIO_TCP_ALLOWED.split(",") if item.strip()}
+    if settings.AUDIO_SOURCE.startswith("tcp://"):
+        allowed.add(settings.AUDIO_SOURCE[len("tcp://"):].strip().lower())
+    if address not in allowed:
+        raise ValueError(f"TCP audio source not allowed: {address} (see AUDIO_TCP_ALLOWED)")
+    return spec
+
+
+def create_audio_source(spec: Optional[str] = None, realtime: Optional[bool] = None, rate: int = 16000,
+                        channels: int = 1, chunk: int = 1024) -> AudioSource:
+    """
+    Build an audio source from a spec string (AUDIO_SOURCE by default):
+    "pyaudio", "file:<name>", "pipe:<name>", "tcp://host:port" or
+    "archive:<meeting start time>[@<start>-<end>]" to re-run an archived
+    recording (seconds, optional). File and pipe names are resolved inside
+    AUDIO_INPUT_DIR; TCP addresses must be AUDIO_SOURCE or in AUDIO_TCP_ALLOWED.
+    """
+    spec = spec or settings.AUDIO_SOURCE
+    realtime = settings.AUDIO_FILE_REALTIME if realtime is None else realtime
+
+    if spec in ("pyaudio", "mic"):
+        return PyAudioSource(rate, channels, chunk)
+    if spec.startswith("file:"):
+        return FileAudioSource(_input_path(spec[len("file:"):]), rate, channels, chunk, realtime)
+    if spec.startswith("pipe:"):
+        return StreamAudioSource(_input_path(spec[len("pipe:"):]), rate, channels, chunk)
+    if spec.startswith("tcp://"):
+        return StreamAudioSource(_tcp_address(spec), rate, channels, chunk)
+    if spec.startswith("archive:"):
+        from app.audio.archive import ArchiveAudioSource, archive_dir
+        name, _, span = spec[len("archive:"):].partition("@")
+        directory = archive_dir(os.path.basename(name))
+        if not os.path.isdir(directory):
+            raise ValueError(f"Audio archive not found: {name}")
+        start, _, end = span.partition("-")
+        return ArchiveAudioSource(directory, float(start or 0), float(end) if end else None, chunk, realtime)
+    raise ValueError(f"Unknown audio source: {spec}")
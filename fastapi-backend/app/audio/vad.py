@@ -0,0 +1,124 @@
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class VoiceActivityDetector:
+    """
+    Energy / zero-crossing voice activity detection between capture and recognition.
+
+    Each payload is split into short frames; a frame is speech when its RMS
+    energy clears both an absolute threshold and a multiple of the adaptive
+    noise floor, and its zero-crossing rate is low enough not to be hiss.
+    Payloads without speech are held back once the hangover after the last
+    speech has passed, except for a few payloads of pre-roll released ahead of
+    the next speech and an occasional keep-alive so the Speech stream doesn't
+    time out.
+    """
+
+    def __init__(self, rate: int = 16000, channels: int = 1, frame_ms: int = 20, energy_threshold: float = None,
+                 noise_ratio: float = 3.0, zcr_max: float = 0.35, hangover: float = None, preroll: float = None,
+                 keepalive: float = None):
+        self.rate = rate
+        self.channels = channels
+        self.frame_samples = max(1, int(rate * frame_ms / 1000))
+        self.bytes_per_second = rate * channels * 2
+        self.energy_threshold = settings.AUDIO_VAD_ENERGY_THRESHOLD if energy_threshold is None else energy_threshold
+        self.noise_ratio = noise_ratio
+        self.zcr_max = zcr_max
+        self.hangover = settings.AUDIO_VAD_HANGOVER_SECONDS if hangover is None else hangover
+        self.preroll = settings.AUDIO_VAD_PREROLL_SECONDS if preroll is None else preroll
+        self.keepalive = settings.AUDIO_VAD_KEEPALIVE_SECONDS if keepalive is None else keepalive
+
+        self.noise_floor = self.energy_threshold / noise_ratio
+        self._stats = {"speech_seconds": 0.0, "padding_seconds": 0.0, "keepalive_seconds": 0.0,
+                       "suppressed_seconds": 0.0}
+
+    @classmethod
+    def for_source(cls, source) -> "VoiceActivityDetector":
+        return cls(source.rate, source.channels)
+
+    def is_speech(self, payload: bytes) -> bool:
+        """True if any frame of the payload looks like speech"""
+        samples = np.frombuffer(payload, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples[:len(samples) - len(samples) % self.channels].reshape(-1, self.channels).mean(axis=1)
+        usable = len(samples) - len(samples) % self.frame_samples
+        if usable == 0:
+            return False
+        frames = samples[:usable].astype(np.float32).reshape(-1, self.frame_samples)
+
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        zcr = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / self.frame_samples
+        threshold = max(self.energy_threshold, self.noise_floor * self.noise_ratio)
+        speech = (rms >= threshold) & (zcr <= self.zcr_max)
+
+        quiet = rms[~speech]
+        if len(quiet):
+            # Track the background level slowly so a noisy room raises the bar
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * float(np.median(quiet))
+        return bool(speech.any())
+
+    def filter(self, payloads: Iterator[bytes],
+               on_speech: Optional[Callable[[], None]] = None) -> Iterator[Tuple[int, bytes]]:
+        """
+        Pass speech (plus padding and keep-alives) through; hold back long silences.
+        Yields (offset, payload) with the payload's byte offset in the input, so
+        results can be placed in recording time despite the audio held back.
+        """
+        preroll = deque()
+        preroll_bytes = int(self.preroll * self.bytes_per_second)
+        held_bytes = 0
+        offset = 0                # input bytes before the current payload
+        audio_time = 0.0          # seconds of audio seen, so files replayed fast behave like live audio
+        last_speech = None        # audio_time at the end of the last speech payload
+        last_sent = time.monotonic()  # keep-alives follow the wall clock, like the Speech stream timeout
+
+        for payload in payloads:
+            seconds = len(payload) / self.bytes_per_second
+            audio_time += seconds
+            start = offset
+            offset += len(payload)
+
+            if self.is_speech(payload):
+                if on_speech is not None:
+                    on_speech()
+                # Release the pre-roll so the first syllable isn't clipped
+                while preroll:
+                    padding_offset, padding = preroll.popleft()
+                    self._move("suppressed_seconds", "padding_seconds", len(padding) / self.bytes_per_second)
+                    yield padding_offset, padding
+                held_bytes = 0
+                last_speech = audio_time
+                last_sent = time.monotonic()
+                self._stats["speech_seconds"] += seconds
+                yield start, payload
+            elif last_speech is not None and audio_time - last_speech < self.hangover:
+                last_sent = time.monotonic()
+                self._stats["padding_seconds"] += seconds
+                yield start, payload
+            elif time.monotonic() - last_sent >= self.keepalive:
+                # The held-back pre-roll is older than the keep-alive; releasing it later would go backwards
+                preroll.clear()
+                held_bytes = 0
+                last_sent = time.monotonic()
+                self._stats["keepalive_seconds"] += seconds
+                yield start, payload
+            else:
+                self._stats["suppressed_seconds"] += seconds
+                preroll.append((start, payload))
+                held_bytes += len(payload)
+                while preroll and held_bytes - len(preroll[0][1]) >= preroll_bytes:
+                    held_bytes -= len(preroll.popleft()[1])
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {key: round(value, 2) for key, value in self._stats.items()}
+        return dict(stats, seconds_saved=stats["suppressed_seconds"], noise_floor=round(self.noise_floor, 1))
+
+    def _move(self, source: str, target: str, seconds: float) -> None:
+        self._stats[source] -= seconds
+        self._stats[target] += seconds
@@ -23,6 +23,31 @@ class Settings(BaseSettings):
     ZOOM_CLIENT_SECRET: str = ""
     ZOOM_ACCOUNT_ID: str = ""
     
+    # Zoom HTTP transport
+    ZOOM_API_BASE_URL: str = "https://api.zoom.us/v2"
+    ZOOM_HTTP_POOL_SIZE: int = 20
+    ZOOM_HTTP_CONNECT_TIMEOUT: float = 3.05
+    ZOOM_HTTP_READ_TIMEOUT: float = 10.0
+    ZOOM_HTTP_MAX_RETRIES: int = 3
+    ZOOM_HTTP_BACKOFF_BASE: float = 0.5  # seconds
+    ZOOM_HTTP_BACKOFF_MAX: float = 8.0   # seconds
+    
+    # Zoom API rate budget (shared by every call in the process)
+    ZOOM_RATE_LIMIT_PER_SECOND: float = 10.0
+    ZOOM_RATE_LIMIT_BURST: int = 20
+    ZOOM_RATE_LIMIT_BACKGROUND_RESERVE: float = 0.5  # share of the bucket only user calls may spend
+    ZOOM_USER_CALL_MAX_WAIT: float = 10.0  # seconds a user call waits for budget
+    
+    # Meeting monitor intervals (stretched with load and observed 429s)
+    ZOOM_MONITOR_BASE_INTERVAL: float = 5.0
+    ZOOM_MONITOR_MAX_INTERVAL: float = 60.0
+    ZOOM_MONITOR_PROBE_SHARE: float = 0.5  # share of the rate budget monitoring may use
+    
+    # Zoom webhooks (meeting lifecycle events)
+    ZOOM_WEBHOOK_SECRET_TOKEN: str = ""
+    ZOOM_WEBHOOK_MAX_AGE: int = 300  # seconds a signed event stays valid
+    ZOOM_MONITOR_POLLING: bool = False  # poll the Zoom API for meeting status as a fallback to webhooks
+    
     # External API Keys
     COHERE_API_KEY: str = ""
     
@@ -31,8 +56,68 @@ class Settings(BaseSettings):
     GOOGLE_CLOUD_PROJECT: str = ""
     GOOGLE_CLOUD_LOCATION: str = "us-central1"
     
+    # Shared session/meeting state: memory (single worker), sqlite or redis
+    STATE_BACKEND: str = "memory"
+    STATE_SQLITE_PATH: str = "syncscribe_state.db"
+    STATE_REDIS_URL: str = "redis://localhost:6379/0"
+    STATE_KEY_PREFIX: str = "syncscribe"
+    API_WORKERS: int = 1
+    
+    # Session store
+    SESSION_IDLE_TTL: int = 3600  # seconds an idle (not recording) session is kept
+    SESSION_MAX_COUNT: int = 500
+    SESSION_SWEEP_INTERVAL: int = 60
+    
+    # Audio capture: pyaudio, file:<name>, pipe:<name> or tcp://host:port
+    AUDIO_SOURCE: str = "pyaudio"
+    AUDIO_TARGET_RATE: int = 16000  # every source is resampled to this rate before recognition
+    AUDIO_CHANNELS: int = 1  # channels captured from devices and raw streams (WAV files bring their own)
+    AUDIO_MAX_CHANNELS: int = 8  # most channels a recording may have, i.e. concurrent streams per bot
+    AUDIO_CHANNEL_STREAMS: bool = True  # one recognition stream per channel for multi-channel audio
+    AUDIO_CHANNEL_SPEAKERS: str = ""  # comma-separated speaker name per channel (default "Channel N")
+    AUDIO_CHANNEL_MERGE_DELAY_SECONDS: float = 2.0  # channel finals are held this long to emit them in order
+    AUDIO_INPUT_DIR: str = "audio_inputs"  # file and pipe sources are resolved here
+    AUDIO_TCP_ALLOWED: str = ""  # comma-separated host:port a recording may read tcp:// audio from (besides AUDIO_SOURCE)
+    AUDIO_FILE_REALTIME: bool = True  # replay files at real-time speed
+    AUDIO_BUFFER_SECONDS: float = 10.0  # capture ring buffer size
+    AUDIO_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest, block or spill (to TEMP_DIR)
+    AUDIO_BLOCK_TIMEOUT: float = 1.0  # seconds capture waits under the block policy
+    AUDIO_REQUEST_MS: int = 100  # audio per recognition request (frames are aggregated up to this)
+    AUDIO_ARCHIVE_ENABLED: bool = True  # keep captured PCM under MEETING_OUTPUTS_DIR/audio_<start time>
+    AUDIO_ARCHIVE_SEGMENT_SECONDS: float = 60.0  # audio per segment file
+    AUDIO_ARCHIVE_BATCH_BYTES: int = 65536  # archive writes are batched up to this size
+    AUDIO_ARCHIVE_QUEUE_SECONDS: float = 30.0  # audio held for a slow disk before the archive drops (and zero-fills) it
+    AUDIO_STREAM_ENCODING: str = "LINEAR16"  # LINEAR16, FLAC or OGG_OPUS (compressed via ffmpeg)
+    AUDIO_OPUS_BITRATE: str = "32k"
+    AUDIO_VAD_ENABLED: bool = True  # hold back silence before it reaches Speech-to-Text
+    AUDIO_VAD_ENERGY_THRESHOLD: float = 300.0  # minimum RMS (16-bit samples) of a speech frame
+    AUDIO_VAD_HANGOVER_SECONDS: float = 0.6  # audio still sent after speech stops
+    AUDIO_VAD_PREROLL_SECONDS: float = 0.3  # held audio released ahead of new speech
+    AUDIO_VAD_KEEPALIVE_SECONDS: float = 5.0  # send one payload at least this often during silence
+    AUDIO_WS_MAX_CONNECTIONS: int = 500  # audio WebSockets accepted per worker
+    AUDIO_WS_MAX_BUFFERED_SECONDS: float = 2.0  # audio held per connection before the client is slowed down
+    AUDIO_WS_PUSH_TIMEOUT: float = 10.0  # seconds a stalled recording may block a connection before it is closed
+    
+    # Speech streaming (Google ends a stream after ~5 minutes)
+    SPEECH_STREAM_LIMIT_SECONDS: float = 290.0  # roll over to a new stream after this long
+    SPEECH_STREAM_OVERLAP_SECONDS: float = 2.0  # audio replayed into the next stream at least
+    SPEECH_STREAM_REPLAY_MAX_SECONDS: float = 15.0  # unfinalized audio replayed at most
+    SPEECH_STREAM_MAX_FAILURES: int = 5  # consecutive stream errors before transcription stops
+    SPEECH_DIARIZATION_SPEAKERS: int = 2  # expected speakers when a mixed stream is diarized
+    
+    # Live summaries
+    LIVE_SUMMARY_MODE: str = "rolling"  # rolling (only new segments, folded into a running summary) or full
+    LIVE_SUMMARY_EVERY: int = 5  # final results between live summaries
+    LIVE_SUMMARY_WINDOW_MAX_CHARS: int = 6000  # transcript sent per window summary at most
+    LIVE_SUMMARY_WINDOW_TOKENS: int = 100  # length of each window summary
+    LIVE_SUMMARY_RUNNING_TOKENS: int = 250  # length of the running summary, which bounds every fold prompt
+    LIVE_SUMMARY_WORKERS: int = 4  # summaries produced concurrently across sessions (one per session at most)
+    
     # File Storage
     MEETING_OUTPUTS_DIR: str = "meeting_outputs"
+    OUTPUT_WRITER_BATCH_BYTES: int = 16384  # interim transcript / live summary text written at once
+    OUTPUT_WRITER_FLUSH_INTERVAL: float = 1.0  # seconds text may wait before it is written
+    OUTPUT_WRITER_FSYNC: str = "close"  # never, close (when the recording stops) or flush (every write)
     TEMP_DIR: str = "temp"
     
     class Config:
@@ -0,0 +1,134 @@
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+def _build_speech_client():
+    """
+    Build the Google Cloud Speech client (one gRPC channel for the process),
+    from GOOGLE_APPLICATION_CREDENTIALS if set, else application default credentials
+    """
+    from google.cloud import speech_v1p1beta1 as speech
+    if settings.GOOGLE_APPLICATION_CREDENTIALS:
+        return speech.SpeechClient.from_service_account_json(settings.GOOGLE_APPLICATION_CREDENTIALS)
+    return speech.SpeechClient()
+
+
+def _build_cohere_client():
+    """Build the Cohere client"""
+    import cohere
+    return cohere.Client(settings.COHERE_API_KEY)
+
+
+def _build_vertex():
+    """Initialize Vertex AI once and return the project and location it was initialized with"""
+    from google.cloud import aiplatform
+
+    credentials = None  # application default credentials
+    if settings.GOOGLE_APPLICATION_CREDENTIALS:
+        from google.oauth2 import service_account
+        credentials = service_account.Credentials.from_service_account_file(settings.GOOGLE_APPLICATION_CREDENTIALS)
+    aiplatform.init(
+        project=settings.GOOGLE_CLOUD_PROJECT or None,
+        location=settings.GOOGLE_CLOUD_LOCATION,
+        credentials=credentials
+    )
+    return {"project": settings.GOOGLE_CLOUD_PROJECT or None, "location": settings.GOOGLE_CLOUD_LOCATION}
+
+
+class ProviderRegistry:
+    """
+    Process-wide registry of external provider clients.
+
+    Each provider is built lazily by its factory on first use and the same
+    handle is returned to every caller afterwards. Construction is guarded by
+    a per-provider lock so concurrent first calls build the client only once.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register (or replace) the factory for a provider and drop any built instance"""
+        with self._registry_lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+            self._locks.setdefault(name, threading.Lock())
+
+    def override(self, name: str, instance: Any) -> None:
+        """Install a ready-made instance for a provider (e.g. a fake in tests)"""
+        with self._registry_lock:
+            self._locks.setdefault(name, threading.Lock())
+            self._instances[name] = instance
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget built instances so the next get() rebuilds them"""
+        with self._registry_lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the shared instance for a provider, building it on first use"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._registry_lock:
+            if name not in self._factories and name not in self._instances:
+                raise KeyError(f"Unknown provider: {name}")
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        with lock:
+            # Another thread may have finished building while we waited
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+
+            started = time.perf_counter()
+            instance = self._factories[name]()
+            elapsed = time.perf_counter() - started
+
+            metric = self._metrics.setdefault(name, {"builds": 0, "last_build_seconds": 0.0, "total_build_seconds": 0.0})
+            metric["builds"] += 1
+            metric["last_build_seconds"] = elapsed
+            metric["total_build_seconds"] += elapsed
+            print(f"Provider '{name}' initialized in {elapsed:.3f}s")
+
+            self._instances[name] = instance
+            return instance
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return construction metrics for each provider"""
+        with self._registry_lock:
+            return {
+                name: dict(self._metrics.get(name, {"builds": 0, "last_build_seconds": 0.0, "total_build_seconds": 0.0}),
+                           initialized=name in self._instances)
+                for name in set(self._factories) | set(self._instances)
+            }
+
+    @property
+    def speech(self):
+        return self.get("speech")
+
+    @property
+    def cohere(self):
+        return self.get("cohere")
+
+    @property
+    def vertex(self):
+        return self.get("vertex")
+
+
+# Global registry instance
+providers = ProviderRegistry()
+providers.register("speech", _build_speech_client)
+providers.register("cohere", _build_cohere_client)
+providers.register("vertex", _build_vertex)
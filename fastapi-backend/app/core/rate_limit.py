@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from app.core.config import settings
+
+# Priority classes for Zoom API calls
+PRIORITY_USER = "user"              # create / join / end / list triggered by a request
+PRIORITY_BACKGROUND = "background"  # meeting monitoring probes
+
+
+class RateBudgetExceeded(Exception):
+    """Raised when a Zoom call can't get budget within its allowed wait"""
+
+
+class ZoomRateBudget:
+    """
+    Process-wide token bucket for Zoom API requests.
+
+    User-initiated calls may drain the whole bucket; background calls only
+    spend tokens while the bucket is above a reserve, so monitoring backs off
+    first when the process approaches Zoom's rate limits. Observed 429s are
+    tracked over a sliding window and feed the monitor's adaptive intervals.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None, background_reserve: float = None,
+                 window: float = 60.0):
+        self.rate = rate or settings.ZOOM_RATE_LIMIT_PER_SECOND
+        self.capacity = float(burst or settings.ZOOM_RATE_LIMIT_BURST)
+        reserve = settings.ZOOM_RATE_LIMIT_BACKGROUND_RESERVE if background_reserve is None else background_reserve
+        self.background_floor = self.capacity * reserve
+        self.window = window
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._responses = deque()  # (timestamp, was_429) within the window
+        self._throttled_in_window = 0
+        self._stats = {"granted_user": 0, "granted_background": 0, "waited_seconds": 0.0, "denied": 0, "throttled": 0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, priority: str = PRIORITY_USER) -> float:
+        """Take a token if allowed; returns 0 on success or the seconds to wait before retrying"""
+        floor = self.background_floor if priority == PRIORITY_BACKGROUND else 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens - 1 >= floor:
+                self._tokens -= 1
+                self._stats["granted_" + priority] += 1
+                return 0.0
+            return (floor + 1 - self._tokens) / self.rate
+
+    def acquire(self, priority: str = PRIORITY_USER, timeout: float = None) -> bool:
+        """Block until a token is available for this priority class (or the timeout passes)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(priority)
+            if wait == 0.0:
+                self._record_wait(waited)
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                with self._lock:
+                    self._stats["denied"] += 1
+                return False
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, priority: str = PRIORITY_USER, timeout: float = None) -> bool:
+        """Async variant of acquire() that waits without blocking the event loop"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(priority)
+            if wait == 0.0:
+                self._record_wait(waited)
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                with self._lock:
+                    self._stats["denied"] += 1
+                return False
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def _record_wait(self, waited: float) -> None:
+        if waited:
+            with self._lock:
+                self._stats["waited_seconds"] += waited
+
+    def record_response(self, status_code: int) -> None:
+        """Track responses so the 429 rate can drive adaptive polling"""
+        now = time.monotonic()
+        with self._lock:
+            self._responses.append((now, status_code == 429))
+            if status_code == 429:
+                self._throttled_in_window += 1
+                self._stats["throttled"] += 1
+                # Zoom is already pushing back; stop spending the burst
+                self._tokens = min(self._tokens, self.background_floor)
+            self._trim(now)
+
+    def throttle_rate(self) -> float:
+        """Fraction of recent Zoom responses that were 429s"""
+        with self._lock:
+            self._trim(time.monotonic())
+            if not self._responses:
+                return 0.0
+            return self._throttled_in_window / len(self._responses)
+
+    def _trim(self, now: float) -> None:
+        while self._responses and now - self._responses[0][0] > self.window:
+            _, throttled = self._responses.popleft()
+            if throttled:
+                self._throttled_in_window -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            tokens = self._tokens
+            stats = dict(self._stats)
+        return dict(stats, tokens=round(tokens, 2), capacity=self.capacity, throttle_rate=round(self.throttle_rate(), 3))
+
+
+# Global budget shared by every Zoom API call in the process
+zoom_budget = ZoomRateBudget()
@@ -0,0 +1,150 @@
+import time
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+
+from app.core.config import settings
+
+ZOOM_OAUTH_URL = "https://zoom.us/oauth/token"
+
+
+class ZoomTokenManager:
+    """
+    Shared cache for the Zoom Server-to-Server OAuth access token.
+
+    The token is cached together with its expiry, refreshed in the background
+    shortly before it expires, and concurrent refreshes are collapsed into a
+    single request: callers that arrive while a refresh is in flight wait for
+    its result instead of issuing their own.
+    """
+
+    def __init__(self, refresh_margin: int = 300, request_timeout: float = 10.0):
+        self.refresh_margin = refresh_margin  # seconds before expiry to refresh
+        self.request_timeout = request_timeout
+        # Anything with a requests-compatible post() (the pooled session in
+        # app.core.zoom_client, or a fake in tests)
+        self.http = requests
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refreshing = False
+        self._condition = threading.Condition()
+        self._refresh_timer: Optional[threading.Timer] = None
+        self._stats = {"requests": 0, "failures": 0, "cache_hits": 0, "invalidations": 0}
+
+    def get_token(self, force_refresh: bool = False) -> Optional[str]:
+        """Return a valid access token, fetching one only if the cache is stale"""
+        with self._condition:
+            if not force_refresh and self._is_fresh():
+                self._stats["cache_hits"] += 1
+                return self._token
+
+            if self._refreshing:
+                # Single flight: wait for the refresh already in progress
+                while self._refreshing:
+                    self._condition.wait(self.request_timeout + 1)
+                if self._is_fresh():
+                    self._stats["cache_hits"] += 1
+                    return self._token
+                return None
+
+            self._refreshing = True
+
+        token = None
+        try:
+            token = self._fetch_token()
+        finally:
+            with self._condition:
+                self._refreshing = False
+                self._condition.notify_all()
+        return token
+
+    async def get_token_async(self) -> Optional[str]:
+        """Async variant of get_token(); only leaves the event loop when a fetch is needed"""
+        token = self._token
+        if token is not None and self._is_fresh():
+            with self._condition:
+                self._stats["cache_hits"] += 1
+            return token
+        return await asyncio.to_thread(self.get_token)
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """
+        Drop the cached token (e.g. after a 401).
+
+        If a token is given, the cache is only cleared when it still holds that
+        token, so a burst of 401s for the same stale token triggers one refresh.
+        """
+        with self._condition:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0.0
+                self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return token cache counters"""
+        with self._condition:
+            return dict(
+                self._stats,
+                cached=self._token is not None,
+                expires_in=max(0, int(self._expires_at - time.time())) if self._token else 0
+            )
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - 5
+
+    def _fetch_token(self) -> Optional[str]:
+        data = {
+            "grant_type": "account_credentials",
+            "account_id": settings.ZOOM_ACCOUNT_ID,
+            "client_id": settings.ZOOM_CLIENT_ID,
+            "client_secret": settings.ZOOM_CLIENT_SECRET
+        }
+
+        with self._condition:
+            self._stats["requests"] += 1
+
+        try:
+            response = self.http.post(ZOOM_OAUTH_URL, data=data, timeout=self.request_timeout)
+        except Exception as e:
+            print(f"Error requesting Zoom token: {e}")
+            with self._condition:
+                self._stats["failures"] += 1
+            return None
+
+        if response.status_code != 200:
+            print(f"Failed to get Zoom token: {response.text}")
+            with self._condition:
+                self._stats["failures"] += 1
+            return None
+
+        payload = response.json()
+        token = payload["access_token"]
+        expires_in = int(payload.get("expires_in", 3600))
+
+        with self._condition:
+            self._token = token
+            self._expires_at = time.time() + expires_in
+        self._schedule_refresh(expires_in)
+        return token
+
+    def _schedule_refresh(self, expires_in: int) -> None:
+        """Refresh proactively in the background shortly before expiry"""
+        delay = max(expires_in - self.refresh_margin, expires_in / 2)
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.get_token(force_refresh=True)
+        except Exception as e:
+            print(f"Error refreshing Zoom token in background: {e}")
+
+
+# Global token manager shared by every ZoomBot
+zoom_tokens = ZoomTokenManager()
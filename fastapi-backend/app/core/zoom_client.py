@@ -0,0 +1,308 @@
+import re
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.rate_limit import zoom_budget, RateBudgetExceeded, PRIORITY_USER, PRIORITY_BACKGROUND
+from app.core.zoom_auth import zoom_tokens
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_ID_SEGMENT = re.compile(r"^[a-z_]+$")
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Collapse ids in a Zoom URL so latency counters group by endpoint (e.g. 'GET /meetings/{id}')"""
+    path = url.split("://", 1)[-1]
+    path = path.split("/", 1)[1] if "/" in path else ""
+    path = path.split("?", 1)[0]
+    if path.startswith("v2/"):
+        path = path[3:]
+    segments = [seg if _ID_SEGMENT.match(seg) else "{id}" for seg in path.split("/") if seg]
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def budget_wait(priority: str) -> float:
+    """How long a call of this priority may wait for rate budget"""
+    return 0.0 if priority == PRIORITY_BACKGROUND else settings.ZOOM_USER_CALL_MAX_WAIT
+
+
+def backoff_delay(attempt: int, headers=None) -> float:
+    """Jittered exponential backoff, honoring Retry-After when the server sends one"""
+    retry_after = retry_after_seconds(headers)
+    if retry_after is not None:
+        return min(retry_after, settings.ZOOM_HTTP_BACKOFF_MAX * 4)
+    ceiling = min(settings.ZOOM_HTTP_BACKOFF_MAX, settings.ZOOM_HTTP_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class ZoomAPIStats:
+    """Per-endpoint request counters and latency totals"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, endpoint: str, elapsed: float, status: Optional[int], retries: int) -> None:
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = {
+                    "requests": 0, "errors": 0, "retries": 0,
+                    "total_seconds": 0.0, "max_seconds": 0.0, "last_status": None
+                }
+            entry["requests"] += 1
+            entry["retries"] += retries
+            entry["total_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            entry["last_status"] = status
+            if status is None or status >= 400:
+                entry["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                endpoint: dict(entry, avg_seconds=entry["total_seconds"] / entry["requests"] if entry["requests"] else 0.0)
+                for endpoint, entry in self._endpoints.items()
+            }
+
+
+class ZoomAPIClient:
+    """
+    Zoom REST client on a shared keep-alive connection pool.
+
+    Every call gets a timeout, is retried with jittered exponential backoff on
+    429/5xx and connection errors, retries once with a fresh token on 401, and
+    is recorded in the per-endpoint latency counters.
+    """
+
+    def __init__(self, base_url: str = None, pool_size: int = None, max_retries: int = None):
+        self.base_url = (base_url or settings.ZOOM_API_BASE_URL).rstrip("/")
+        self.max_retries = settings.ZOOM_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = (settings.ZOOM_HTTP_CONNECT_TIMEOUT, settings.ZOOM_HTTP_READ_TIMEOUT)
+        self.stats = ZoomAPIStats()
+
+        pool_size = pool_size or settings.ZOOM_HTTP_POOL_SIZE
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url_for(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, timeout=None, priority: str = PRIORITY_USER,
+                **kwargs) -> Optional[requests.Response]:
+        """
+        Send an authenticated request to the Zoom API
+
+        Every attempt spends one token of the shared rate budget for the given
+        priority; RateBudgetExceeded is raised if none is available in time.
+        Returns the final response, or None if no token could be obtained or
+        the request kept failing at the connection level.
+        """
+        url = self.url_for(path)
+        endpoint = endpoint_label(method, url)
+        headers = kwargs.pop("headers", {})
+        headers.setdefault("Content-Type", "application/json")
+
+        started = time.perf_counter()
+        response = None
+        retries = 0
+        refreshed_token = False
+        attempt = 0
+
+        while True:
+            token = zoom_tokens.get_token()
+            if not token:
+                break
+            headers["Authorization"] = f"Bearer {token}"
+
+            if not zoom_budget.acquire(priority, timeout=budget_wait(priority)):
+                raise RateBudgetExceeded(f"No Zoom API budget for {endpoint} ({priority})")
+
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response = None
+                if attempt >= self.max_retries:
+                    print(f"Zoom API {endpoint} failed after {attempt + 1} attempts: {e}")
+                    break
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                retries += 1
+                continue
+
+            zoom_budget.record_response(response.status_code)
+
+            if response.status_code == 401 and not refreshed_token:
+                # Token was revoked or expired early; refresh once and retry
+                zoom_tokens.invalidate(token)
+                refreshed_token = True
+                retries += 1
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                time.sleep(backoff_delay(attempt, response.headers))
+                attempt += 1
+                retries += 1
+                continue
+
+            break
+
+        self.stats.record(
+            endpoint,
+            time.perf_counter() - started,
+            response.status_code if response is not None else None,
+            retries
+        )
+        return response
+
+    def get(self, path: str, **kwargs) -> Optional[requests.Response]:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> Optional[requests.Response]:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> Optional[requests.Response]:
+        return self.request("PUT", path, **kwargs)
+
+
+class AsyncZoomAPIClient:
+    """
+    asyncio-native counterpart of ZoomAPIClient for the FastAPI layer.
+
+    Uses one httpx.AsyncClient connection pool with the same timeouts, retry
+    policy and latency counters, so Zoom round-trips never block the event loop.
+    """
+
+    def __init__(self, base_url: str = None, pool_size: int = None, max_retries: int = None,
+                 stats: ZoomAPIStats = None, transport: httpx.AsyncBaseTransport = None):
+        self.base_url = (base_url or settings.ZOOM_API_BASE_URL).rstrip("/")
+        self.max_retries = settings.ZOOM_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.pool_size = pool_size or settings.ZOOM_HTTP_POOL_SIZE
+        self.timeout = httpx.Timeout(settings.ZOOM_HTTP_READ_TIMEOUT, connect=settings.ZOOM_HTTP_CONNECT_TIMEOUT)
+        self.stats = stats or ZoomAPIStats()
+        self.transport = transport  # e.g. httpx.MockTransport in benchmarks
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def url_for(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, method: str, path: str, timeout=None, priority: str = PRIORITY_USER,
+                      **kwargs) -> Optional[httpx.Response]:
+        """Async variant of ZoomAPIClient.request()"""
+        url = self.url_for(path)
+        endpoint = endpoint_label(method, url)
+        headers = kwargs.pop("headers", {})
+        headers.setdefault("Content-Type", "application/json")
+        client = self._get_client()
+
+        started = time.perf_counter()
+        response = None
+        retries = 0
+        refreshed_token = False
+        attempt = 0
+
+        while True:
+            token = await zoom_tokens.get_token_async()
+            if not token:
+                break
+            headers["Authorization"] = f"Bearer {token}"
+
+            if not await zoom_budget.acquire_async(priority, timeout=budget_wait(priority)):
+                raise RateBudgetExceeded(f"No Zoom API budget for {endpoint} ({priority})")
+
+            try:
+                response = await client.request(method, url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+            except httpx.TransportError as e:
+                response = None
+                if attempt >= self.max_retries:
+                    print(f"Zoom API {endpoint} failed after {attempt + 1} attempts: {e}")
+                    break
+                await asyncio.sleep(backoff_delay(attempt))
+                attempt += 1
+                retries += 1
+                continue
+
+            zoom_budget.record_response(response.status_code)
+
+            if response.status_code == 401 and not refreshed_token:
+                zoom_tokens.invalidate(token)
+                refreshed_token = True
+                retries += 1
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                await asyncio.sleep(backoff_delay(attempt, response.headers))
+                attempt += 1
+                retries += 1
+                continue
+
+            break
+
+        self.stats.record(
+            endpoint,
+            time.perf_counter() - started,
+            response.status_code if response is not None else None,
+            retries
+        )
+        return response
+
+    async def get(self, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request("PUT", path, **kwargs)
+
+
+# Global Zoom API clients; the token manager shares the sync connection pool
+# and both clients report into the same latency counters
+zoom_api = ZoomAPIClient()
+async_zoom_api = AsyncZoomAPIClient(stats=zoom_api.stats)
+zoom_tokens.http = zoom_api.session
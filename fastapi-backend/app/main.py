@@ -25,15 +25,28 @@ from app.api.router import api_router
 # Include API router
 app.include_router(api_router, prefix="/api")
 
+@app.on_event("shutdown")
+async def close_zoom_client():
+    """Close the pooled async Zoom API connections"""
+    from app.core.zoom_client import async_zoom_api
+    await async_zoom_api.aclose()
+
 # Root endpoint
 @app.get("/")
 async def root():
     return {"status": "online", "version": "1.0.0"}
 
 if __name__ == "__main__":
+    from app.core.config import settings
+    
+    if settings.API_WORKERS > 1 and settings.STATE_BACKEND == "memory":
+        print("Warning: STATE_BACKEND=memory can't share sessions between workers; use sqlite or redis")
+    
     uvicorn.run(
         "app.main:app", 
-        host="0.0.0.0", 
-        port=5000,  # Change to port 5000 to match frontend expectations
-        reload=True
+        host=settings.HOST, 
+        port=settings.PORT,  # 5000 to match frontend expectations
+        workers=settings.API_WORKERS,
+        # Reloading only makes sense for a single development worker
+        reload=settings.DEBUG and settings.API_WORKERS == 1
     )
\ No newline at end of file
@@ -0,0 +1,211 @@
+import json
+import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+class TranscriptSegment:
+    """One final result, materialized on demand from a TranscriptStore"""
+
+    __slots__ = ("index", "start", "end", "speaker", "confidence", "text")
+
+    def __init__(self, index: int, start: float, end: float, speaker: str, confidence: Optional[float], text: str):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.speaker = speaker
+        self.confidence = confidence
+        self.text = text
+
+    @property
+    def line(self) -> str:
+        """The segment as it appears in transcripts: "<speaker>: <text>" """
+        return f"{self.speaker}: {self.text}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "speaker": self.speaker,
+            "confidence": None if self.confidence is None else round(self.confidence, 3),
+            "text": self.text
+        }
+
+
+class TranscriptView:
+    """
+    A window of a TranscriptStore, by index range or explicit indices.
+
+    Views hold no text of their own; segments and joined text are built
+    from the store only when asked for. Since the store is append-only,
+    a view keeps showing the segments that existed when it was taken.
+    """
+
+    def __init__(self, store: "TranscriptStore", indices: Sequence[int]):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        return (self.store[index] for index in self.indices)
+
+    @property
+    def start(self) -> Optional[float]:
+        return self.store.start_of(self.indices[0]) if self.indices else None
+
+    @property
+    def end(self) -> Optional[float]:
+        return max(self.store.end_of(index) for index in self.indices) if self.indices else None
+
+    def lines(self) -> List[str]:
+        return [self.store.line(index) for index in self.indices]
+
+    def text(self, separator: str = " ") -> str:
+        return separator.join(self.lines())
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [segment.to_dict() for segment in self]
+
+
+class TranscriptStore:
+    """
+    Append-only store of final transcript segments for one recording.
+
+    Timing, speaker and confidence live in parallel typed arrays (speakers
+    interned to small ids) and text is kept as one reference per segment,
+    so an append is O(1) and copies nothing. Windows by index or time are
+    views over the arrays; the full joined text is only built when read,
+    and reused until a segment is added.
+    """
+
+    def __init__(self):
+        self._starts = array("d")
+        self._ends = array("d")
+        self._reach = array("d")  # latest end of any segment up to each index, so never decreasing
+        self._confidence = array("f")
+        self._speaker_ids = array("H")
+        self._speakers: List[str] = []
+        self._speaker_index: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._in_order = True  # starts never decreased, so time windows can bisect
+        self._max_end = 0.0
+        self._joined = ""
+        self._joined_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, index: int) -> TranscriptSegment:
+        index = range(len(self._texts))[index]
+        confidence = self._confidence[index]
+        return TranscriptSegment(index, self._starts[index], self._ends[index],
+                                 self._speakers[self._speaker_ids[index]],
+                                 None if math.isnan(confidence) else confidence, self._texts[index])
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        return iter(self.slice())
+
+    def append(self, text: str, start: float = None, end: float = None, speaker: str = "Unknown",
+               confidence: float = None) -> int:
+        """Add a final result; missing times continue from the previous segment"""
+        with self._lock:
+            previous_end = self._ends[-1] if self._ends else 0.0
+            start = previous_end if start is None else float(start)
+            end = max(start, previous_end if end is None else float(end))
+            if self._starts and start < self._starts[-1]:
+                self._in_order = False
+            speaker_id = self._speaker_index.get(speaker)
+            if speaker_id is None:
+                speaker_id = self._speaker_index[speaker] = len(self._speakers)
+                self._speakers.append(speaker)
+
+            self._starts.append(start)
+            self._ends.append(end)
+            self._max_end = max(self._max_end, end)
+            self._reach.append(self._max_end)
+            self._confidence.append(math.nan if confidence is None else confidence)
+            self._speaker_ids.append(speaker_id)
+            # The text goes in last: a segment exists for readers once its text does
+            self._texts.append(text)
+            return len(self._texts) - 1
+
+    def start_of(self, index: int) -> float:
+        return self._starts[index]
+
+    def end_of(self, index: int) -> float:
+        return self._ends[index]
+
+    def line(self, index: int) -> str:
+        return f"{self._speakers[self._speaker_ids[index]]}: {self._texts[index]}"
+
+    def slice(self, start: int = 0, stop: int = None) -> TranscriptView:
+        """Segments by index, e.g. the ones added since a client's last read"""
+        return TranscriptView(self, range(len(self._texts))[start:stop])
+
+    def last(self, count: int) -> TranscriptView:
+        return self.slice(max(0, len(self._texts) - count))
+
+    def window(self, start: float = None, end: float = None) -> TranscriptView:
+        """Segments overlapping [start, end) seconds of the recording"""
+        count = len(self._texts)
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+        if self._in_order:
+            # Starts are sorted, but segments may overlap (per-channel streams), so the
+            # lower bound bisects on the furthest end reached so far rather than on starts
+            first = bisect_right(self._reach, start, 0, count)
+            last = max(first, bisect_left(self._starts, end, first, count))
+            return TranscriptView(self, [index for index in range(first, last) if self._ends[index] > start])
+        return TranscriptView(self, [index for index in range(count)
+                                     if self._ends[index] > start and self._starts[index] < end])
+
+    def in_time_order(self) -> TranscriptView:
+        """Every segment sorted by start time (stable), for the saved transcript"""
+        count = len(self._texts)
+        if self._in_order:
+            return TranscriptView(self, range(count))
+        return TranscriptView(self, sorted(range(count), key=self._starts.__getitem__))
+
+    def text(self) -> str:
+        """Every segment as "<speaker>: <text>", space-separated, in arrival order"""
+        with self._lock:
+            count = len(self._texts)
+            if count != self._joined_count:
+                self._joined = " ".join(self.line(index) for index in range(count))
+                self._joined_count = count
+            return self._joined
+
+    @property
+    def duration(self) -> float:
+        return self._max_end
+
+    def speakers(self) -> List[str]:
+        return list(self._speakers)
+
+    def save(self, path: str) -> None:
+        """Write the segments, in time order, as JSON"""
+        with open(path, "w") as f:
+            json.dump({"segments": self.in_time_order().to_list()}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "TranscriptStore":
+        store = cls()
+        with open(path) as f:
+            for segment in json.load(f)["segments"]:
+                store.append(segment["text"], segment["start"], segment["end"], segment["speaker"],
+                             segment.get("confidence"))
+        return store
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segments": len(self._texts),
+            "speakers": len(self._speakers),
+            "duration": round(self.duration, 2),
+            "in_order": self._in_order
+        }
@@ -63,6 +63,31 @@ class MeetingListResponse(BaseModel):
     session_id: str
 
 
+class ActiveMeetingsResponse(BaseModel):
+    """Response schema for the active meetings list"""
+    success: bool
+    meetings: List[Dict[str, Any]]
+
+
+class TranscriptSegmentInfo(BaseModel):
+    """Schema for one final transcript segment (times in seconds from the recording start)"""
+    index: int
+    start: float
+    end: float
+    speaker: str
+    confidence: Optional[float] = None
+    text: str
+
+
+class TranscriptResponse(BaseModel):
+    """Response schema for transcript segments"""
+    success: bool
+    segments: List[TranscriptSegmentInfo] = []
+    next: Optional[int] = None
+    recording: Optional[bool] = None
+    error: Optional[str] = None
+
+
 class ReportInfo(BaseModel):
     """Schema for report file info"""
     filename: str
@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.audio.sources import PushAudioSource
+from app.core.config import settings
+from app.services.zoom_service import ZoomService
+
+# Formats accepted on the audio WebSocket; anything but raw PCM is decoded by ffmpeg
+AUDIO_FORMATS = ("pcm", "webm", "ogg")
+
+# WebSocket close codes
+CLOSE_NORMAL = 1000
+CLOSE_POLICY = 1008
+CLOSE_TRY_AGAIN = 1013
+
+
+class AudioIngest:
+    """
+    Feeds audio received over WebSockets into sessions' recording pipelines.
+
+    Each connection owns a PushAudioSource that the session records from.
+    Messages are pushed without blocking the event loop; when the session's
+    capture falls behind, the push waits, the connection stops reading and
+    TCP flow control slows the client down.
+    """
+
+    def __init__(self, max_connections: int = None):
+        self.max_connections = max_connections or settings.AUDIO_WS_MAX_CONNECTIONS
+        self._connections: Dict[str, PushAudioSource] = {}
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "rejected": 0, "messages": 0, "bytes": 0, "backpressure_timeouts": 0,
+                       "decoder_errors": 0}
+
+    def open(self, session_id: str, audio_format: str = "pcm", rate: int = 16000,
+             channels: int = 1) -> Tuple[Optional[PushAudioSource], Optional[str], int]:
+        """Start recording a session from a new connection; returns (source, error, close code)"""
+        if audio_format not in AUDIO_FORMATS:
+            return self._reject(f"Unsupported audio format: {audio_format}", CLOSE_POLICY)
+        if not 8000 <= rate <= 48000 or not 1 <= channels <= settings.AUDIO_MAX_CHANNELS:
+            return self._reject(f"rate must be 8000-48000 and channels 1-{settings.AUDIO_MAX_CHANNELS}",
+                                CLOSE_POLICY)
+
+        bot, error = ZoomService.get_local_bot(session_id)
+        if bot is None:
+            return self._reject(error, CLOSE_POLICY)
+        if bot.recording:
+            return self._reject("Session is already recording", CLOSE_POLICY)
+
+        source = PushAudioSource(rate, channels, bot.chunk, settings.AUDIO_WS_MAX_BUFFERED_SECONDS)
+        with self._lock:
+            if len(self._connections) >= self.max_connections:
+                self._stats["rejected"] += 1
+                return None, "Too many audio connections on this worker", CLOSE_TRY_AGAIN
+            if session_id in self._connections:
+                self._stats["rejected"] += 1
+                return None, "Session already has an audio connection", CLOSE_POLICY
+            self._connections[session_id] = source
+
+        success, error = ZoomService.start_recording(session_id, audio_source=source)
+        if not success:
+            self._release(session_id)
+            return self._reject(error, CLOSE_POLICY)
+
+        self._count("opened", 1)
+        return source, None, CLOSE_NORMAL
+
+    async def receive(self, websocket, session_id: str, source: PushAudioSource, audio_format: str = "pcm") -> int:
+        """Pump messages into the session until the client or the recording stops; returns the close code"""
+        decoder = await self._start_decoder(audio_format, source) if audio_format != "pcm" else None
+        close_code = CLOSE_NORMAL
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                data = message.get("bytes")
+                if data is None:
+                    if message.get("text") == "stop":
+                        break
+                    continue
+
+                self._count("messages", 1)
+                self._count("bytes", len(data))
+                if decoder is not None:
+                    process, pump = decoder
+                    if pump.done() or source.ended:
+                        # Nobody reads ffmpeg's output any more, so writing to it would block for good
+                        close_code = self._decoder_close_code(source, pump)
+                        break
+                    process.stdin.write(data)
+                    # ffmpeg takes more once the pump drains its output; stop waiting if the pump stops
+                    drain = asyncio.ensure_future(process.stdin.drain())
+                    await asyncio.wait((drain, pump), timeout=settings.AUDIO_WS_PUSH_TIMEOUT,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    if not drain.done():
+                        drain.cancel()
+                        if pump.done():
+                            close_code = self._decoder_close_code(source, pump)
+                        else:
+                            self._count("backpressure_timeouts", 1)
+                            close_code = CLOSE_TRY_AGAIN
+                        break
+                    drain.result()
+                elif not await source.push(data, settings.AUDIO_WS_PUSH_TIMEOUT):
+                    if not source.ended:
+                        self._count("backpressure_timeouts", 1)
+                        close_code = CLOSE_TRY_AGAIN
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            self._count("decoder_errors", 1)
+        finally:
+            if decoder is not None:
+                await self._stop_decoder(decoder)
+            # Ending the source lets the recording drain and finish its report
+            source.end()
+            self._release(session_id)
+        return close_code
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            connections = {
+                session_id: source.describe() for session_id, source in self._connections.items()
+            }
+            stats = dict(self._stats)
+        return dict(stats, active=len(connections), max_connections=self.max_connections, connections=connections)
+
+    async def _start_decoder(self, audio_format: str, source: PushAudioSource):
+        """ffmpeg decoding the container stream to PCM, and a task pushing its output"""
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-probesize", "32", "-analyzeduration", "0",
+            "-f", audio_format, "-i", "pipe:0",
+            "-f", "s16le", "-ar", str(source.rate), "-ac", str(source.channels), "pipe:1",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+
+        async def pump() -> bool:
+            """Returns False if the recording stopped taking audio, True when ffmpeg's output ended"""
+            while True:
+                data = await process.stdout.read(source.bytes_per_chunk)
+                if not data:
+                    return True
+                if not await source.push(data, settings.AUDIO_WS_PUSH_TIMEOUT):
+                    return False
+
+        return process, asyncio.create_task(pump())
+
+    def _decoder_close_code(self, source: PushAudioSource, pump: asyncio.Task) -> int:
+        """Close code once the decoder's pump has stopped, matching the PCM path"""
+        if source.ended:
+            return CLOSE_NORMAL  # The recording stopped
+        if pump.cancelled() or pump.exception() is not None or pump.result():
+            self._count("decoder_errors", 1)  # ffmpeg exited mid-stream
+        else:
+            self._count("backpressure_timeouts", 1)
+        return CLOSE_TRY_AGAIN
+
+    async def _stop_decoder(self, decoder) -> None:
+        process, pump = decoder
+        try:
+            process.stdin.close()
+            # Let ffmpeg flush the tail of the audio before giving up on it
+            await asyncio.wait_for(pump, 5.0)
+        except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+            self._count("decoder_errors", 1)
+        finally:
+            if process.returncode is None:
+                process.kill()
+            # Output nobody read keeps the pipe open, and wait() waits for the pipes too
+            await process.stdout.read()
+            await process.wait()
+
+    def _reject(self, error: str, code: int) -> Tuple[None, str, int]:
+        self._count("rejected", 1)
+        return None, error, code
+
+    def _release(self, session_id: str) -> None:
+        with self._lock:
+            self._connections.pop(session_id, None)
+
+    def _count(self, key: str, value: int) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+
+# Global ingest shared by every audio WebSocket in the process
+audio_ingest = AudioIngest()
@@ -1,30 +1,29 @@
 import os
 import tempfile
+import wave
 from typing import List, Tuple, Optional
 import speech_recognition as sr
 from pydub import AudioSegment
-import cohere
-from google.cloud import aiplatform
 from vertexai.generative_models import GenerativeModel
+from app.audio.resample import resample_pcm
+from app.audio.sources import SAMPLE_WIDTH
 from app.core.config import settings
-
-# Initialize external services
-co = cohere.Client(settings.COHERE_API_KEY)
-
-credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", settings.GOOGLE_APPLICATION_CREDENTIALS)
-project_id = os.getenv("GOOGLE_CLOUD_PROJECT", settings.GOOGLE_CLOUD_PROJECT)
-location = os.getenv("GOOGLE_CLOUD_LOCATION", settings.GOOGLE_CLOUD_LOCATION)
-
-if settings.GOOGLE_APPLICATION_CREDENTIALS:
-    aiplatform.init(
-        project=settings.GOOGLE_CLOUD_PROJECT,
-        location=settings.GOOGLE_CLOUD_LOCATION,
-    )
+from app.core.providers import providers
 
 
 class AudioService:
     """Service for processing audio files"""
     
+    @staticmethod
+    def _write_normalized_wav(sound: AudioSegment, path: str) -> None:
+        """Write decoded audio as the mono, AUDIO_TARGET_RATE WAV the recognizer expects"""
+        pcm = resample_pcm(sound.raw_data, sound.frame_rate, sound.channels, settings.AUDIO_TARGET_RATE, 1)
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(SAMPLE_WIDTH)
+            wav.setframerate(settings.AUDIO_TARGET_RATE)
+            wav.writeframes(pcm)
+    
     @staticmethod
     async def process_audio(file) -> Tuple[bool, str, Optional[str], Optional[List[str]], Optional[str]]:
         """Process audio file and return transcript, summary, and insights"""
@@ -38,22 +37,18 @@ class AudioService:
             with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_audio:
                 temp_path = temp_audio.name
             
-            # Convert non-WAV formats to WAV if needed
+            # Decode any supported format and normalize it to the recognizer's format
             try:
-                if filename.lower().endswith('.wav'):
-                    # Save directly if already WAV
-                    with open(temp_path, "wb") as f:
-                        f.write(file.file.read())
-                else:
-                    # For non-WAV formats, convert using pydub
-                    temp_original = temp_path + "_original"
-                    with open(temp_original, "wb") as f:
-                        f.write(file.file.read())
-                    
-                    sound = AudioSegment.from_file(temp_original)
-                    sound.export(temp_path, format="wav")
-                    # Clean up the original file
-                    os.unlink(temp_original)
+                # Keep the extension so pydub reads WAV directly and hands other formats to ffmpeg
+                temp_original = temp_path + "_original" + os.path.splitext(filename)[1].lower()
+                with open(temp_original, "wb") as f:
+                    f.write(file.file.read())
+                
+                # Decode with pydub, then normalize to 16-bit mono at AUDIO_TARGET_RATE
+                sound = AudioSegment.from_file(temp_original).set_sample_width(SAMPLE_WIDTH)
+                AudioService._write_normalized_wav(sound, temp_path)
+                # Clean up the original file
+                os.unlink(temp_original)
             except Exception as e:
                 return False, None, None, None, f"Error processing audio file: {str(e)}"
             
@@ -69,7 +64,7 @@ class AudioService:
             # Generate summary with Cohere
             summary = ""
             try:
-                summary_response = co.generate(
+                summary_response = providers.cohere.generate(
                     prompt=f"Summarize this transcript concisely: {transcript}",
                     max_tokens=150,
                     temperature=0.7
@@ -84,6 +79,7 @@ class AudioService:
             # Generate insights with Vertex AI Gemini
             insights_list = []
             try:
+                providers.vertex  # Make sure Vertex AI has been initialized
                 model = GenerativeModel("gemini-pro")
                 insight_response = model.generate_content(
                     f"Analyze this meeting transcript and summary. Provide key insights, action items, and important decisions made:\n\nTranscript: {transcript}\n\nSummary: {summary}"
@@ -0,0 +1,285 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.providers import providers
+from app.models.transcript import TranscriptStore, TranscriptView
+
+# Live summary modes
+MODE_ROLLING = "rolling"  # summarize new segments only and fold them into a running summary
+MODE_FULL = "full"        # resend the whole transcript every time (the original behaviour)
+SUMMARY_MODES = (MODE_ROLLING, MODE_FULL)
+
+
+def cohere_summary(prompt: str, max_tokens: int) -> str:
+    """One Cohere completion, as the live summaries have always used"""
+    response = providers.cohere.generate(prompt=prompt, max_tokens=max_tokens, temperature=0.7)
+    return response.generations[0].text.strip()
+
+
+def clock(seconds: float) -> str:
+    """Recording offset as H:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class RollingSummarizer:
+    """
+    Live summaries whose cost grows linearly with the meeting.
+
+    Each update summarizes only the segments added since the previous one
+    (split into windows of at most ``window_chars``) and folds every window
+    summary into a running summary of bounded length, so no prompt ever
+    holds more than one window of transcript or one running summary. The
+    per-window summaries are kept as a timeline of the meeting. A failed
+    call is retried with the next update: segments count as summarized only
+    once their window summary exists, and unfolded windows wait for the next
+    fold.
+    """
+
+    def __init__(self, mode: str = None, generate: Callable[[str, int], str] = cohere_summary,
+                 window_chars: int = None, window_tokens: int = None, running_tokens: int = None):
+        self.mode = (mode or settings.LIVE_SUMMARY_MODE).lower()
+        if self.mode not in SUMMARY_MODES:
+            raise ValueError(f"Unknown live summary mode: {self.mode}")
+        self.generate = generate
+        self.window_chars = window_chars or settings.LIVE_SUMMARY_WINDOW_MAX_CHARS
+        self.window_tokens = window_tokens or settings.LIVE_SUMMARY_WINDOW_TOKENS
+        self.running_tokens = running_tokens or settings.LIVE_SUMMARY_RUNNING_TOKENS
+
+        self.running_summary = ""
+        self.windows: List[Dict[str, Any]] = []
+        self.summarized = 0  # segments already covered by a window summary
+        self._folded = 0  # window summaries already folded into the running summary
+        self._lock = threading.Lock()  # one update at a time per meeting
+        self._stats = {"updates": 0, "calls": 0, "failures": 0, "prompt_chars": 0, "transcript_chars": 0}
+
+    def update(self, transcript: TranscriptStore) -> Optional[str]:
+        """Summarize what the transcript gained since the last update; returns the new summary or None"""
+        with self._lock:
+            self._stats["updates"] += 1
+            if self.mode == MODE_FULL:
+                text = transcript.text()
+                summary = self._call(f"Summarize this part of the meeting transcript: {text}", 100, len(text))
+                if summary is not None:
+                    self.running_summary = summary
+                return summary
+
+            updated = False
+            count = len(transcript)
+            while True:
+                if self._folded < len(self.windows):
+                    if not self._fold():
+                        break
+                    updated = True
+                if self.summarized >= count:
+                    break
+                window = self._next_window(transcript, count)
+                if not self._summarize_window(window):
+                    break
+                self.summarized += len(window)
+            return self.running_summary if updated else None
+
+    def latest_window(self) -> Optional[Dict[str, Any]]:
+        return self.windows[-1] if self.windows else None
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            mode=self.mode,
+            windows=len(self.windows),
+            summarized_segments=self.summarized,
+            running_summary_chars=len(self.running_summary)
+        )
+
+    def _next_window(self, transcript: TranscriptStore, count: int) -> TranscriptView:
+        """The unsummarized segments that fit in one window (always at least one)"""
+        size = 0
+        stop = self.summarized
+        while stop < count:
+            size += len(transcript.line(stop)) + 1
+            if size > self.window_chars and stop > self.summarized:
+                break
+            stop += 1
+        return transcript.slice(self.summarized, stop)
+
+    def _summarize_window(self, window: TranscriptView) -> bool:
+        text = window.text("\n")[:self.window_chars]
+        summary = self._call(
+            f"Summarize this part of the meeting transcript: {text}", self.window_tokens, len(text)
+        )
+        if summary is None:
+            return False
+        self.windows.append({
+            "start": window.start,
+            "end": window.end,
+            "segments": len(window),
+            "summary": summary
+        })
+        return True
+
+    def _fold(self) -> bool:
+        """Fold the window summaries not yet in the running summary into it"""
+        pending = [window["summary"] for window in self.windows[self._folded:]]
+        if not self.running_summary and len(pending) == 1:
+            running = pending[0]
+        else:
+            running = self._call(
+                "Here is a summary of a meeting so far, followed by a summary of what was said next. "
+                "Rewrite them as one concise summary of the whole meeting so far.\n\n"
+                f"Summary so far: {self.running_summary or '(nothing yet)'}\n\n"
+                f"What was said next: {' '.join(pending)}",
+                self.running_tokens
+            )
+            if running is None:
+                return False  # the pending windows are folded in with the next update
+        self.running_summary = running
+        self._folded = len(self.windows)
+        return True
+
+    def _call(self, prompt: str, max_tokens: int, transcript_chars: int = 0) -> Optional[str]:
+        self._stats["calls"] += 1
+        self._stats["prompt_chars"] += len(prompt)
+        self._stats["transcript_chars"] += transcript_chars
+        try:
+            return self.generate(prompt, max_tokens)
+        except Exception as e:
+            self._stats["failures"] += 1
+            print(f"Error generating live summary: {e}")
+            return None
+
+
+class LiveSummaryWorker:
+    """
+    Produces live summaries off the transcription threads.
+
+    Recognition loops only post a request and carry on consuming responses;
+    summaries run on a small fixed pool shared by every session. Each session
+    has at most one summary in flight and at most one request waiting: a
+    request arriving while another waits replaces it (the summarizer reads
+    the transcript when it runs, so only the latest state matters) and is
+    counted as coalesced. Latency is measured from the oldest request a
+    summary answers to its completion.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or settings.LIVE_SUMMARY_WORKERS
+        self._sessions: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"requests": 0, "coalesced": 0, "discarded": 0, "summaries": 0, "failures": 0}
+        self._latency = {"total": 0.0, "max": 0.0, "wait_total": 0.0}
+
+    def request(self, owner, job: Callable[[], None]) -> None:
+        """Ask for a summary of an owner's (a bot's) meeting; never blocks on the summary itself"""
+        with self._lock:
+            entry = self._sessions.get(id(owner))
+            if entry is None:
+                entry = self._sessions[id(owner)] = {
+                    "job": None, "requested": 0.0, "running": False, "discarded": False, "epoch": 0,
+                    "requests": 0, "coalesced": 0, "summaries": 0, "last_latency": None
+                }
+            entry["discarded"] = False
+            self._stats["requests"] += 1
+            entry["requests"] += 1
+            if entry["job"] is not None:
+                self._stats["coalesced"] += 1
+                entry["coalesced"] += 1
+            else:
+                entry["requested"] = time.monotonic()
+            entry["job"] = job
+            if not entry["running"]:
+                self._start(id(owner), entry)
+
+    def discard(self, owner) -> None:
+        """
+        Drop an owner's waiting request and reset its counters. A summary
+        already running still finishes (the owner ignores its stale result)
+        and keeps the owner's slot until then, so a request for the owner's
+        next recording waits for it rather than running alongside.
+        """
+        with self._lock:
+            entry = self._sessions.get(id(owner))
+            if entry is None:
+                return
+            if entry["job"] is not None:
+                self._stats["discarded"] += 1
+                entry["job"] = None
+            if not entry["running"]:
+                del self._sessions[id(owner)]
+                return
+            entry["discarded"] = True
+            entry["epoch"] += 1
+            entry.update(requests=0, coalesced=0, summaries=0, last_latency=None)
+
+    def session_stats(self, owner) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._sessions.get(id(owner))
+            if entry is None:
+                return None
+            return {
+                "requests": entry["requests"],
+                "coalesced": entry["coalesced"],
+                "summaries": entry["summaries"],
+                "in_flight": entry["running"],
+                "pending": entry["job"] is not None,
+                "last_latency_ms": entry["last_latency"]
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._stats["summaries"] + self._stats["failures"]
+            return dict(
+                self._stats,
+                sessions=len(self._sessions),
+                in_flight=sum(1 for entry in self._sessions.values() if entry["running"]),
+                pending=sum(1 for entry in self._sessions.values() if entry["job"] is not None),
+                avg_latency_ms=round(self._latency["total"] * 1000 / completed, 1) if completed else None,
+                max_latency_ms=round(self._latency["max"] * 1000, 1),
+                avg_wait_ms=round(self._latency["wait_total"] * 1000 / completed, 1) if completed else None
+            )
+
+    def _start(self, key: int, entry: Dict[str, Any]) -> None:
+        """Hand the entry's waiting job to the pool (called with the lock held)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="live-summary")
+        job, requested = entry["job"], entry["requested"]
+        entry["job"] = None
+        entry["running"] = True
+        try:
+            self._executor.submit(self._run, key, entry, job, requested, entry["epoch"])
+        except RuntimeError:
+            entry["running"] = False  # Executor shut down with the interpreter
+
+    def _run(self, key: int, entry: Dict[str, Any], job: Callable[[], None], requested: float, epoch: int) -> None:
+        started = time.monotonic()
+        failed = False
+        try:
+            job()
+        except Exception as e:
+            failed = True
+            print(f"Error in live summary worker: {e}")
+        finished = time.monotonic()
+
+        with self._lock:
+            latency = finished - requested
+            self._latency["total"] += latency
+            self._latency["max"] = max(self._latency["max"], latency)
+            self._latency["wait_total"] += started - requested
+            self._stats["failures" if failed else "summaries"] += 1
+            if entry["epoch"] == epoch:  # not a job of a discarded recording
+                entry["summaries"] += 0 if failed else 1
+                entry["last_latency"] = round(latency * 1000, 1)
+            entry["running"] = False
+            if self._sessions.get(key) is not entry:
+                return
+            if entry["job"] is not None:
+                self._start(key, entry)
+            elif entry["discarded"]:
+                del self._sessions[key]
+
+
+# Global worker instance
+live_summary_worker = LiveSummaryWorker()
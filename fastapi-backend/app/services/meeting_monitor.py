@@ -0,0 +1,207 @@
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.rate_limit import zoom_budget, RateBudgetExceeded, PRIORITY_BACKGROUND
+
+
+class MeetingMonitor:
+    """
+    One scheduler for every active meeting in the process.
+
+    Replaces the per-bot polling threads: a single timer thread keeps a heap of
+    due checks, and each meeting gets at most one Zoom status probe per
+    interval (never more than one in flight), executed on a small fixed pool.
+    Silence detection is evaluated locally on the same tick without any API
+    call. Thread count stays constant regardless of how many meetings run.
+
+    Meeting end is normally delivered by the Zoom webhook receiver; API probes
+    only run when polling is enabled (ZOOM_MONITOR_POLLING) as a fallback.
+    Probes spend the shared Zoom rate budget at background priority, and the
+    interval stretches as the number of meetings or the observed 429 rate grows.
+    """
+
+    def __init__(self, probe_interval: float = None, max_workers: int = 4, max_probe_failures: int = 4,
+                 polling: bool = None):
+        self.probe_interval = probe_interval or settings.ZOOM_MONITOR_BASE_INTERVAL
+        self.max_interval = max(self.probe_interval, settings.ZOOM_MONITOR_MAX_INTERVAL)
+        self.polling = settings.ZOOM_MONITOR_POLLING if polling is None else polling
+        self.max_probe_failures = max_probe_failures  # consecutive failed probes before giving up on a meeting
+        self.max_workers = max_workers
+        # Optional lookup of a bot's meeting status in shared state, so a
+        # meeting.ended webhook received by another worker still stops it
+        self.status_lookup: Optional[Callable[[Any], Optional[str]]] = None
+
+        self._meetings: Dict[int, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, int, int, int]] = []
+        self._seq = 0  # tie-breaker for equal due times, also used as registration generation
+        self._condition = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._interval = self.probe_interval
+        self._interval_updated = 0.0
+        self._stats = {"probes": 0, "probes_deduplicated": 0, "probes_deferred": 0, "probe_failures": 0,
+                       "ended_by_api": 0, "ended_by_silence": 0, "ended_by_connection": 0,
+                       "ended_by_webhook": 0}
+
+    def register(self, bot) -> None:
+        """Start monitoring the meeting a bot has joined"""
+        key = id(bot)
+        with self._condition:
+            self._ensure_started()
+            self._seq += 1
+            self._meetings[key] = {"bot": bot, "generation": self._seq, "probing": False, "failures": 0,
+                                   "stopping": False}
+            # Stagger the first check so meetings joined together don't probe in lockstep
+            self._schedule(key, self._seq, time.monotonic() + random.uniform(0, self.probe_interval))
+            self._condition.notify()
+
+    def unregister(self, bot) -> None:
+        """Stop monitoring a bot's meeting"""
+        with self._condition:
+            self._meetings.pop(id(bot), None)
+
+    def is_monitoring(self, bot) -> bool:
+        with self._condition:
+            return id(bot) in self._meetings
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return dict(self._stats, meetings=len(self._meetings), scheduled=len(self._heap),
+                        interval=round(self._interval, 2))
+
+    def current_interval(self) -> float:
+        """
+        Seconds between checks of one meeting.
+
+        Stretched so background probes for all meetings fit within their share
+        of the Zoom rate budget, and further while Zoom is answering with 429s.
+        Recomputed at most once per second.
+        """
+        now = time.monotonic()
+        if now - self._interval_updated >= 1.0:
+            probe_rate = zoom_budget.rate * settings.ZOOM_MONITOR_PROBE_SHARE
+            load_interval = len(self._meetings) / probe_rate if probe_rate > 0 else self.max_interval
+            interval = max(self.probe_interval, load_interval) * (1 + 10 * zoom_budget.throttle_rate())
+            self._interval = min(self.max_interval, interval)
+            self._interval_updated = now
+        return self._interval
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="meeting-probe")
+            self._thread = threading.Thread(target=self._run, name="meeting-monitor", daemon=True)
+            self._thread.start()
+
+    def _schedule(self, key: int, generation: int, due: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, key, generation))
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                due, _, key, generation = self._heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                entry = self._meetings.get(key)
+                if entry is None or entry["generation"] != generation:
+                    continue  # Unregistered (or re-registered) while waiting
+                self._schedule(key, generation, max(due, time.monotonic() - 1) + self.current_interval())
+
+            try:
+                self._tick(key, entry)
+            except RuntimeError:
+                return  # Executor shut down with the interpreter
+            except Exception as e:
+                print(f"Error in meeting monitor: {e}")
+
+    def _tick(self, key: int, entry: Dict[str, Any]) -> None:
+        bot = entry["bot"]
+        if not bot.recording or entry["stopping"]:
+            return  # Nothing to stop; keep the meeting scheduled cheaply until recording restarts
+
+        # Silence detection (backup method) needs no API call
+        if bot.last_audio_time and (time.time() - bot.last_audio_time) > bot.silence_threshold:
+            print(f"\nSilence: No audio detected for {bot.silence_threshold} seconds. Meeting appears to be over.")
+            self._finish(key, "ended_by_silence")
+            return
+
+        if self.status_lookup is not None and self.status_lookup(bot) == "ended":
+            print("\nWebhook: Meeting ended (reported by another worker). Stopping recording...")
+            self._finish(key, "ended_by_webhook")
+            return
+
+        if not self.polling:
+            return
+
+        with self._condition:
+            if entry["probing"]:
+                # Previous probe still in flight; don't stack another one
+                self._stats["probes_deduplicated"] += 1
+                return
+            entry["probing"] = True
+            self._stats["probes"] += 1
+        self._executor.submit(self._probe, key, entry)
+
+    def _probe(self, key: int, entry: Dict[str, Any]) -> None:
+        bot = entry["bot"]
+        try:
+            status = bot.probe_meeting_status(priority=PRIORITY_BACKGROUND)
+        except RateBudgetExceeded:
+            # Budget is reserved for user calls right now; try again next interval
+            status = "deferred"
+        except Exception as e:
+            print(f"Error checking meeting status: {e}")
+            status = "unknown"
+        finally:
+            with self._condition:
+                entry["probing"] = False
+
+        if status == "deferred":
+            with self._condition:
+                self._stats["probes_deferred"] += 1
+        elif status == "ended":
+            print("\nAPI: Detected that the meeting has ended. Stopping recording...")
+            self._finish(key, "ended_by_api")
+        elif status == "unknown":
+            with self._condition:
+                entry["failures"] += 1
+                self._stats["probe_failures"] += 1
+                lost = entry["failures"] >= self.max_probe_failures
+            if lost:
+                print("\nConnection: Lost connection to Zoom meeting. Stopping recording...")
+                self._finish(key, "ended_by_connection")
+        else:
+            entry["failures"] = 0
+
+    def _finish(self, key: int, reason: str) -> None:
+        """Stop the bot's recording; the meeting stays registered so a later recording is monitored too"""
+        with self._condition:
+            entry = self._meetings.get(key)
+            if entry is None or entry["stopping"]:
+                return
+            entry["stopping"] = True
+            entry["failures"] = 0
+            self._stats[reason] += 1
+        # Report generation is slow; keep it off the scheduler and probe threads
+        threading.Thread(target=self._stop_recording, args=(entry,), daemon=True).start()
+
+    def _stop_recording(self, entry: Dict[str, Any]) -> None:
+        try:
+            entry["bot"].stop_recording()
+        finally:
+            with self._condition:
+                entry["stopping"] = False
+
+
+# Global monitor shared by every ZoomBot
+meeting_monitor = MeetingMonitor()
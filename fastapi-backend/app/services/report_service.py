@@ -1,11 +1,14 @@
+import asyncio
 import os
 import sys
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterator, List, Tuple, Optional, Any
 from app.core.config import settings
 
 # Add the project root to Python path to import ZoomBot
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from app.services.zoom_service import active_bots, meeting_statuses
+from app.audio.archive import AudioArchiveReader, archive_dir
+from app.models.transcript import TranscriptStore
+from app.services.state_store import report_manifests
 
 class ReportService:
     """Service for handling meeting reports and recordings"""
@@ -14,29 +17,15 @@ class ReportService:
     def get_meeting_reports(meeting_id: str) -> Tuple[bool, List[Dict[str, str]], Optional[str]]:
         """Get available reports for a meeting"""
         print(f"Looking for reports for meeting ID: {meeting_id}")
-        print(f"Meeting statuses: {meeting_statuses}")
         
-        # Find the session for this meeting
-        session_id = None
-        for mid, status in meeting_statuses.items():
-            if mid == meeting_id:
-                session_id = status.get('session_id')
-                break
-        
-        if not session_id or session_id not in active_bots:
-            print(f"No session found for meeting ID: {meeting_id}")
-            print(f"Active bots: {list(active_bots.keys())}")
-            return False, [], "No session found for this meeting"
-        
-        bot = active_bots[session_id]
-        
-        # Check if we have a meeting start time
-        if not hasattr(bot, 'meeting_start_time'):
-            print(f"No meeting_start_time attribute on bot for session {session_id}")
+        # The manifest is written by whichever worker recorded the meeting
+        manifest = report_manifests.get(meeting_id)
+        if not manifest or not manifest.get('meeting_start_time'):
+            print(f"No report manifest found for meeting ID: {meeting_id}")
             return False, [], "No recordings available for this meeting"
         
         # Get all files in meeting_outputs directory
-        meeting_time = bot.meeting_start_time
+        meeting_time = manifest['meeting_start_time']
         report_files = []
         
         try:
@@ -54,8 +43,8 @@ class ReportService:
             
             # Find files matching meeting time
             for filename in files:
-                if meeting_time in filename:
-                    file_path = os.path.join(output_dir, filename)
+                file_path = os.path.join(output_dir, filename)
+                if meeting_time in filename and os.path.isfile(file_path):
                     print(f"Found matching file: {filename}")
                     report_files.append({
                         "filename": filename,
@@ -86,6 +75,65 @@ class ReportService:
         except Exception as e:
             return False, None, filename, str(e)
     
+    @staticmethod
+    def get_meeting_transcript(meeting_id: str, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[bool, List[Dict[str, Any]], Optional[str]]:
+        """Get the timed transcript segments of a recorded meeting, optionally within a time window"""
+        manifest = report_manifests.get(meeting_id)
+        if not manifest or not manifest.get('meeting_start_time'):
+            return False, [], "No recordings available for this meeting"
+        
+        path = os.path.join(settings.MEETING_OUTPUTS_DIR, f"transcript_segments_{manifest['meeting_start_time']}.json")
+        if not os.path.exists(path):
+            return False, [], "No transcript saved for this meeting"
+        
+        try:
+            return True, TranscriptStore.load(path).window(start, end).to_list(), None
+        except Exception as e:
+            return False, [], str(e)
+    
+    @staticmethod
+    def get_meeting_audio(
+        meeting_id: str,
+        start: float = 0.0,
+        end: Optional[float] = None
+    ) -> Tuple[bool, int, Optional[Iterator[bytes]], Optional[str]]:
+        """
+        Get a time range of a meeting's archived audio as WAV: its size and
+        an iterator over its chunks, read from the archive as it is consumed
+        """
+        manifest = report_manifests.get(meeting_id)
+        if not manifest or not manifest.get('meeting_start_time'):
+            return False, 0, None, "No recordings available for this meeting"
+        
+        directory = archive_dir(manifest['meeting_start_time'])
+        if not os.path.isdir(directory):
+            return False, 0, None, "No audio archive for this meeting"
+        
+        try:
+            reader = AudioArchiveReader(directory)
+            if start >= reader.duration:
+                reader.close()
+                return False, 0, None, f"Start is past the end of the recording ({reader.duration:.1f}s)"
+            return True, reader.wav_size(start, end), ReportService._audio_chunks(reader, start, end), None
+        except Exception as e:
+            return False, 0, None, str(e)
+    
+    @staticmethod
+    async def get_meeting_audio_async(
+        meeting_id: str,
+        start: float = 0.0,
+        end: Optional[float] = None
+    ) -> Tuple[bool, int, Optional[Iterator[bytes]], Optional[str]]:
+        """Find the archived audio in a worker thread; opening it reads every segment header"""
+        return await asyncio.to_thread(ReportService.get_meeting_audio, meeting_id, start, end)
+    
+    @staticmethod
+    def _audio_chunks(reader: AudioArchiveReader, start: float, end: Optional[float]) -> Iterator[bytes]:
+        try:
+            yield from reader.wav_chunks(start, end)
+        finally:
+            reader.close()
+    
     @staticmethod
     def generate_pdf_report(meeting_id: str, transcript: str, summary: str, insights: List[str]) -> Tuple[bool, Optional[str], Optional[str]]:
         """Generate a PDF report for a meeting"""
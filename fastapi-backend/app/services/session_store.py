@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class SessionStore:
+    """
+    Bounded store for active bot sessions.
+
+    Behaves like the dict it replaces (``in``, ``[]``, ``get``, ``keys``) but
+    keeps entries in least-recently-used order and evicts sessions that have
+    been idle longer than the TTL or that fall off the end of the LRU once
+    the store is full. Sessions that are still recording are never evicted.
+    Every eviction is passed to the registered hooks so the bot's resources
+    can be released. Sweeps (and so the hooks, which join threads and flush
+    writers) run on a janitor thread, never on the request that inserted.
+    """
+
+    def __init__(self, idle_ttl: float = None, max_size: int = None, sweep_interval: float = None):
+        self.idle_ttl = settings.SESSION_IDLE_TTL if idle_ttl is None else idle_ttl
+        self.max_size = settings.SESSION_MAX_COUNT if max_size is None else max_size
+        self.sweep_interval = settings.SESSION_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()  # session_id -> (bot, last_access)
+        self._lock = threading.RLock()
+        self._hooks: List[Callable[[str, Any, str], None]] = []
+        self._last_sweep = time.monotonic()
+        self._janitor: Optional[threading.Thread] = None
+        self._wake = threading.Event()  # asks the janitor for a sweep before its next interval
+        self._stats = {"created": 0, "evicted_idle": 0, "evicted_lru": 0, "removed": 0, "eviction_errors": 0}
+
+    def add_eviction_hook(self, hook: Callable[[str, Any, str], None]) -> None:
+        """Register hook(session_id, bot, reason) called after a session is evicted"""
+        self._hooks.append(hook)
+
+    def __contains__(self, session_id) -> bool:
+        with self._lock:
+            return session_id in self._entries
+
+    def __getitem__(self, session_id: str) -> Any:
+        with self._lock:
+            bot, _ = self._entries[session_id]
+            self._touch(session_id, bot)
+            return bot
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        with self._lock:
+            if session_id not in self._entries:
+                return default
+            return self[session_id]
+
+    def __setitem__(self, session_id: str, bot: Any) -> None:
+        with self._lock:
+            if session_id not in self._entries:
+                self._stats["created"] += 1
+            self._touch(session_id, bot)
+            self._ensure_janitor()
+            due = (len(self._entries) > self.max_size
+                   or time.monotonic() - self._last_sweep >= self.sweep_interval)
+        if due:
+            self._wake.set()
+
+    def pop(self, session_id: str, default: Any = None) -> Any:
+        """Remove a session without running eviction hooks"""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return default
+            self._stats["removed"] += 1
+            return entry[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            return [(session_id, bot) for session_id, (bot, _) in self._entries.items()]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, live=len(self._entries), max_size=self.max_size, idle_ttl=self.idle_ttl)
+
+    def sweep(self, force: bool = False) -> int:
+        """Evict idle sessions and trim to max_size; returns the number of evicted sessions"""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            over_capacity = len(self._entries) > self.max_size
+            if not force and not over_capacity and now - self._last_sweep < self.sweep_interval:
+                return 0
+            self._last_sweep = now
+
+            # Oldest first: idle sessions, then whatever is needed to get back under the cap
+            for session_id, (bot, last_access) in list(self._entries.items()):
+                if self._is_busy(bot):
+                    continue
+                if now - last_access > self.idle_ttl:
+                    reason = "idle"
+                elif len(self._entries) > self.max_size:
+                    reason = "lru"
+                else:
+                    continue
+                del self._entries[session_id]
+                self._stats["evicted_" + reason] += 1
+                evicted.append((session_id, bot, reason))
+
+        for session_id, bot, reason in evicted:
+            self._run_hooks(session_id, bot, reason)
+        return len(evicted)
+
+    def _touch(self, session_id: str, bot: Any) -> None:
+        self._entries[session_id] = (bot, time.monotonic())
+        self._entries.move_to_end(session_id)
+
+    @staticmethod
+    def _is_busy(bot: Any) -> bool:
+        return bool(getattr(bot, "recording", False))
+
+    def _run_hooks(self, session_id: str, bot: Any, reason: str) -> None:
+        print(f"Evicting session {session_id} ({reason})")
+        for hook in self._hooks:
+            try:
+                hook(session_id, bot, reason)
+            except Exception as e:
+                with self._lock:
+                    self._stats["eviction_errors"] += 1
+                print(f"Error in session eviction hook: {e}")
+
+    def _ensure_janitor(self) -> None:
+        """Sweep periodically, and whenever an insert asks for it"""
+        if self._janitor is None or not self._janitor.is_alive():
+            self._janitor = threading.Thread(target=self._janitor_loop, name="session-janitor", daemon=True)
+            self._janitor.start()
+
+    def _janitor_loop(self) -> None:
+        while True:
+            self._wake.wait(self.sweep_interval)
+            self._wake.clear()
+            try:
+                self.sweep(force=True)
+            except Exception as e:
+                print(f"Error sweeping sessions: {e}")
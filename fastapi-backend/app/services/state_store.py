@@ -0,0 +1,426 @@
+import copy
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from app.core.config import settings
+
+# Identifies the process that owns a session's recording pipeline
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def index_changes(previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]],
+                  indexes: Sequence[Tuple[str, str]]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """(index, old value, new value) for each indexed field whose value changed"""
+    changes = []
+    for index, field in indexes:
+        old, new = (previous or {}).get(field), (current or {}).get(field)
+        if old != new:
+            changes.append((index, None if old is None else str(old), None if new is None else str(new)))
+    return changes
+
+
+class StateBackend(ABC):
+    """
+    Storage interface for session and meeting state shared between workers.
+
+    Values are JSON-serializable dicts grouped by namespace (e.g. "meetings",
+    "sessions", "reports") and addressed by key.
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """The record stored under namespace/key, or None"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Dict[str, Any]) -> None:
+        """Store a record under namespace/key, replacing any previous one"""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove the record under namespace/key, if any"""
+
+    @abstractmethod
+    def items(self, namespace: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Every (key, record) pair in a namespace"""
+
+    @abstractmethod
+    def add_member(self, namespace: str, key: str, member: str) -> None:
+        """Add a member to the set stored under namespace/key"""
+
+    @abstractmethod
+    def remove_member(self, namespace: str, key: str, member: str) -> None:
+        """Remove a member from the set stored under namespace/key"""
+
+    @abstractmethod
+    def members(self, namespace: str, key: str) -> Set[str]:
+        """The set stored under namespace/key (empty if there is none)"""
+
+    @abstractmethod
+    def update(self, namespace: str, key: str, change: Callable[[Optional[Dict[str, Any]]], Optional[Dict[str, Any]]],
+               indexes: Sequence[Tuple[str, str]] = ()) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Replace a record with ``change(record)`` (None deletes it) and move the
+        key between the index sets named by ``indexes`` ((index namespace,
+        field) pairs) in one atomic step; returns the previous and new record.
+        ``change`` gets its own copy of the record and may be called again if
+        the update is retried, so it must not have side effects.
+        """
+
+    def swap(self, namespace: str, key: str, value: Optional[Dict[str, Any]],
+             indexes: Sequence[Tuple[str, str]] = ()) -> Optional[Dict[str, Any]]:
+        """Replace a record (delete it when value is None) and its index entries atomically; returns the previous record"""
+        return self.update(namespace, key, lambda previous: value, indexes)[0]
+
+
+class MemoryStateBackend(StateBackend):
+    """In-process backend; only suitable for a single worker"""
+
+    def __init__(self):
+        self._data: Dict[str, Dict[str, str]] = {}
+        self._sets: Dict[Tuple[str, str], Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        with self._lock:
+            raw = self._data.get(namespace, {}).get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, namespace, key, value):
+        # Stored serialized so callers never share mutable state, like the other backends
+        raw = json.dumps(value)
+        with self._lock:
+            self._data.setdefault(namespace, {})[key] = raw
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._data.get(namespace, {}).pop(key, None)
+
+    def items(self, namespace):
+        with self._lock:
+            entries = list(self._data.get(namespace, {}).items())
+        return [(key, json.loads(raw)) for key, raw in entries]
+
+    def add_member(self, namespace, key, member):
+        with self._lock:
+            self._sets.setdefault((namespace, key), set()).add(member)
+
+    def remove_member(self, namespace, key, member):
+        with self._lock:
+            members = self._sets.get((namespace, key))
+            if members is not None:
+                members.discard(member)
+                if not members:
+                    del self._sets[(namespace, key)]
+
+    def members(self, namespace, key):
+        with self._lock:
+            return set(self._sets.get((namespace, key), ()))
+
+    def update(self, namespace, key, change, indexes=()):
+        with self._lock:
+            records = self._data.setdefault(namespace, {})
+            raw = records.get(key)
+            previous = json.loads(raw) if raw is not None else None
+            value = change(json.loads(raw) if raw is not None else None)
+            if value is None:
+                records.pop(key, None)
+            else:
+                records[key] = json.dumps(value)
+            for index, old, new in index_changes(previous, value, indexes):
+                if old is not None:
+                    members = self._sets.get((index, old))
+                    if members is not None:
+                        members.discard(key)
+                        if not members:
+                            del self._sets[(index, old)]
+                if new is not None:
+                    self._sets.setdefault((index, new), set()).add(key)
+            return previous, value
+
+
+class SQLiteStateBackend(StateBackend):
+    """SQLite backend in WAL mode so several local workers can read while one writes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS members ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " member TEXT NOT NULL,"
+            " PRIMARY KEY (namespace, key, member))"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, key):
+        row = self._connection().execute(
+            "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace, key, value):
+        self._connection().execute(
+            "INSERT INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (namespace, key, json.dumps(value), time.time())
+        )
+
+    def delete(self, namespace, key):
+        self._connection().execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace):
+        rows = self._connection().execute(
+            "SELECT key, value FROM state WHERE namespace = ?", (namespace,)
+        ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def add_member(self, namespace, key, member):
+        self._connection().execute(
+            "INSERT OR IGNORE INTO members (namespace, key, member) VALUES (?, ?, ?)", (namespace, key, member)
+        )
+
+    def remove_member(self, namespace, key, member):
+        self._connection().execute(
+            "DELETE FROM members WHERE namespace = ? AND key = ? AND member = ?", (namespace, key, member)
+        )
+
+    def members(self, namespace, key):
+        rows = self._connection().execute(
+            "SELECT member FROM members WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def update(self, namespace, key, change, indexes=()):
+        conn = self._connection()
+        # Takes the write lock up front, so no other worker writes between the read and the update
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            previous = self.get(namespace, key)
+            value = change(copy.deepcopy(previous))
+            if value is None:
+                self.delete(namespace, key)
+            else:
+                self.set(namespace, key, value)
+            for index, old, new in index_changes(previous, value, indexes):
+                if old is not None:
+                    self.remove_member(index, old, key)
+                if new is not None:
+                    self.add_member(index, new, key)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return previous, value
+
+
+class RedisStateBackend(StateBackend):
+    """Redis (or any Redis-compatible server) backend; one hash per namespace"""
+
+    def __init__(self, url: str, prefix: str = "syncscribe"):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("The redis package is required for STATE_BACKEND=redis (pip install redis)")
+        self._watch_error = redis.WatchError
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def _hash(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def get(self, namespace, key):
+        raw = self.client.hget(self._hash(namespace), key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, namespace, key, value):
+        self.client.hset(self._hash(namespace), key, json.dumps(value))
+
+    def delete(self, namespace, key):
+        self.client.hdel(self._hash(namespace), key)
+
+    def items(self, namespace):
+        return [(key, json.loads(raw)) for key, raw in self.client.hgetall(self._hash(namespace)).items()]
+
+    def _set(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def add_member(self, namespace, key, member):
+        self.client.sadd(self._set(namespace, key), member)
+
+    def remove_member(self, namespace, key, member):
+        self.client.srem(self._set(namespace, key), member)
+
+    def members(self, namespace, key):
+        return set(self.client.smembers(self._set(namespace, key)))
+
+    def update(self, namespace, key, change, indexes=()):
+        records = self._hash(namespace)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    # The update only applies if nobody changed the namespace since the read
+                    pipe.watch(records)
+                    raw = pipe.hget(records, key)
+                    previous = json.loads(raw) if raw is not None else None
+                    value = change(json.loads(raw) if raw is not None else None)
+                    pipe.multi()
+                    if value is None:
+                        pipe.hdel(records, key)
+                    else:
+                        pipe.hset(records, key, json.dumps(value))
+                    for index, old, new in index_changes(previous, value, indexes):
+                        if old is not None:
+                            pipe.srem(self._set(index, old), key)
+                        if new is not None:
+                            pipe.sadd(self._set(index, new), key)
+                    pipe.execute()
+                    return previous, value
+                except self._watch_error:
+                    continue
+
+
+class StateMap:
+    """
+    Dict-style view of one namespace of a StateBackend.
+
+    Reads return fresh copies, so a changed value must be assigned back
+    (``statuses[meeting_id] = status``) to be persisted.
+    """
+
+    def __init__(self, backend: StateBackend, namespace: str):
+        self.backend = backend
+        self.namespace = namespace
+
+    def __contains__(self, key) -> bool:
+        return key is not None and self.backend.get(self.namespace, str(key)) is not None
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        value = self.backend.get(self.namespace, str(key))
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.backend.get(self.namespace, str(key)) if key is not None else None
+        return default if value is None else value
+
+    def __setitem__(self, key: str, value: Dict[str, Any]) -> None:
+        self.backend.set(self.namespace, str(key), value)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        value = self.get(key)
+        if value is None:
+            return default
+        self.backend.delete(self.namespace, str(key))
+        return value
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return self.backend.items(self.namespace)
+
+    def keys(self) -> List[str]:
+        return [key for key, _ in self.items()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class MeetingStatusMap(StateMap):
+    """
+    Meeting statuses with secondary indexes kept up to date on every write.
+
+    Besides the meeting_id -> status record (which holds the session_id), the
+    backend keeps session_id -> meeting_ids and status -> meeting_ids sets, so
+    finding a meeting's session, a session's meetings or every meeting in a
+    given state never scans all meetings.
+    """
+
+    SESSION_INDEX = "meetings_by_session"
+    STATUS_INDEX = "meetings_by_status"
+    INDEXES = ((SESSION_INDEX, "session_id"), (STATUS_INDEX, "status"))
+
+    def __setitem__(self, meeting_id: str, value: Dict[str, Any]) -> None:
+        # Record and indexes change together, so concurrent writers never leave a meeting in two status sets
+        self.backend.swap(self.namespace, str(meeting_id), value, self.INDEXES)
+
+    def pop(self, meeting_id: str, default: Any = None) -> Any:
+        if meeting_id is None:
+            return default
+        value = self.backend.swap(self.namespace, str(meeting_id), None, self.INDEXES)
+        return default if value is None else value
+
+    def update(self, meeting_id: str, change: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Change a meeting's status record in place atomically, e.g. counting a
+        participant while other workers handle concurrent events; returns the
+        new record, or None (changing nothing) if the meeting is unknown
+        """
+        def apply(status):
+            return change(status) if status is not None else None
+        return self.backend.update(self.namespace, str(meeting_id), apply, self.INDEXES)[1]
+
+    def session_for(self, meeting_id: str) -> Optional[str]:
+        """Session that owns a meeting"""
+        return self.get(meeting_id, {}).get("session_id")
+
+    def meetings_for_session(self, session_id: str) -> Set[str]:
+        """All meetings a session has created or joined"""
+        return self.backend.members(self.SESSION_INDEX, str(session_id))
+
+    def meetings_with_status(self, *statuses: str) -> Set[str]:
+        """Meetings indexed under any of the given statuses (confirm against the record before relying on it)"""
+        meeting_ids = set()
+        for status in statuses:
+            meeting_ids |= self.backend.members(self.STATUS_INDEX, status)
+        return meeting_ids
+
+
+def create_state_backend() -> StateBackend:
+    """Build the backend selected by STATE_BACKEND (memory, sqlite or redis)"""
+    backend = settings.STATE_BACKEND.lower()
+    if backend == "sqlite":
+        return SQLiteStateBackend(settings.STATE_SQLITE_PATH)
+    if backend == "redis":
+        return RedisStateBackend(settings.STATE_REDIS_URL, settings.STATE_KEY_PREFIX)
+    if backend != "memory":
+        raise ValueError(f"Unknown STATE_BACKEND: {settings.STATE_BACKEND}")
+    return MemoryStateBackend()
+
+
+# Global state shared by every worker (when the backend is not in-memory)
+state_backend = create_state_backend()
+meeting_statuses = MeetingStatusMap(state_backend, "meetings")
+session_records = StateMap(state_backend, "sessions")
+report_manifests = StateMap(state_backend, "reports")
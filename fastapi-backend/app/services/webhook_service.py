@@ -0,0 +1,109 @@
+import hmac
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.services.meeting_monitor import meeting_monitor
+from app.services.zoom_service import active_bots, meeting_statuses
+
+URL_VALIDATION_EVENT = "endpoint.url_validation"
+# Meeting lifecycle events that change the meeting's status record
+MEETING_EVENTS = ("meeting.started", "meeting.participant_joined", "meeting.participant_left", "meeting.ended")
+
+
+class WebhookService:
+    """Service for receiving Zoom webhook events"""
+
+    @staticmethod
+    def sign(message: Union[str, bytes]) -> str:
+        """HMAC-SHA256 of a message with the webhook secret token, hex encoded"""
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        return hmac.new(
+            settings.ZOOM_WEBHOOK_SECRET_TOKEN.encode('utf-8'),
+            message,
+            hashlib.sha256
+        ).hexdigest()
+
+    @staticmethod
+    def verify_signature(body: bytes, timestamp: Optional[str], signature: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Verify the x-zm-signature header of a webhook request"""
+        if not settings.ZOOM_WEBHOOK_SECRET_TOKEN:
+            return False, "Zoom webhook secret token not configured"
+
+        if not timestamp or not signature:
+            return False, "Missing signature headers"
+
+        try:
+            age = abs(time.time() - int(timestamp) / (1000 if len(timestamp) > 10 else 1))
+        except ValueError:
+            return False, "Invalid timestamp"
+        if age > settings.ZOOM_WEBHOOK_MAX_AGE:
+            return False, "Stale webhook timestamp"
+
+        # Signed over the raw body, so a body that isn't valid UTF-8 just fails to match
+        expected = "v0=" + WebhookService.sign(f"v0:{timestamp}:".encode('utf-8') + body)
+        if not hmac.compare_digest(expected.encode('utf-8'), signature.encode('utf-8', 'replace')):
+            return False, "Invalid signature"
+
+        return True, None
+
+    @staticmethod
+    def url_validation_response(event: Dict[str, Any]) -> Dict[str, str]:
+        """Answer Zoom's endpoint URL validation challenge"""
+        payload = event.get("payload")
+        plain_token = str(payload.get("plainToken", "")) if isinstance(payload, dict) else ""
+        return {
+            "plainToken": plain_token,
+            "encryptedToken": WebhookService.sign(plain_token)
+        }
+
+    @staticmethod
+    def handle_event(event: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a meeting lifecycle event to the session that owns the meeting"""
+        event_type = event.get("event", "")
+        payload = event.get("payload")
+        meeting = payload.get("object") if isinstance(payload, dict) else None
+        meeting_id = str(meeting.get("id", "")) if isinstance(meeting, dict) else ""
+
+        if event_type not in MEETING_EVENTS:
+            if meeting_id not in meeting_statuses:
+                return {"handled": False, "reason": "Unknown meeting"}
+            return {"handled": False, "reason": f"Unsupported event: {event_type}"}
+
+        # Read and written in one backend transaction, so concurrent joins and leaves all count
+        status = meeting_statuses.update(meeting_id, lambda current: WebhookService._apply_event(event_type, current))
+        if not status:
+            return {"handled": False, "reason": "Unknown meeting"}
+
+        session_id = status.get("session_id")
+        if event_type == "meeting.ended":
+            bot = active_bots.get(session_id) if session_id else None
+            if bot is not None:
+                WebhookService._finish_meeting(bot)
+        return {"handled": True, "event": event_type, "meeting_id": meeting_id, "session_id": session_id}
+
+    @staticmethod
+    def _apply_event(event_type: str, status: Dict[str, Any]) -> Dict[str, Any]:
+        """A meeting's status record after an event (may be retried, so no side effects)"""
+        if event_type == "meeting.started":
+            if status.get("status") == "created":
+                status["status"] = "started"
+        elif event_type == "meeting.participant_joined":
+            status["participants"] = status.get("participants", 0) + 1
+        elif event_type == "meeting.participant_left":
+            status["participants"] = max(0, status.get("participants", 0) - 1)
+        elif event_type == "meeting.ended":
+            status["status"] = "ended"
+            status["recording"] = False
+        return status
+
+    @staticmethod
+    def _finish_meeting(bot) -> None:
+        """Stop recording right away and finalize the report in the background"""
+        meeting_monitor.unregister(bot)
+        if bot.recording:
+            print("\nWebhook: Meeting ended. Stopping recording...")
+            threading.Thread(target=bot.stop_recording, daemon=True).start()
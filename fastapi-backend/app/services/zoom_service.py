@@ -1,11 +1,12 @@
 import uuid
 import time
+import asyncio
 import hmac
 import hashlib
 import base64
 import sys
 import os
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,12 +15,41 @@ load_dotenv()
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from zoombot import ZoomBot
 
+from app.audio.sources import AudioSource, create_audio_source
 from app.core.config import settings
+from app.services.meeting_monitor import meeting_monitor
+from app.services.session_store import SessionStore
+from app.services.state_store import WORKER_ID, meeting_statuses, session_records, report_manifests
 
-# Store active bots by session ID
-active_bots: Dict[str, ZoomBot] = {}
-# Track meeting statuses for frontend
-meeting_statuses: Dict[str, Dict[str, Any]] = {}
+# Store active bots by session ID (idle TTL + LRU bounded). Bots hold the
+# recording pipeline and never leave the worker that created them.
+active_bots = SessionStore()
+# Meeting states that still have (or may soon have) a bot attached
+ACTIVE_MEETING_STATUSES = ("created", "started", "joined", "recording")
+# Meeting statuses, session records and report manifests live in the shared
+# state backend (app.services.state_store) so any worker can serve them
+
+
+def _release_session(session_id: str, bot: ZoomBot, reason: str) -> None:
+    """Eviction hook: release the bot and forget its session and meetings"""
+    bot.close()
+    session_records.pop(session_id)
+    for meeting_id in meeting_statuses.meetings_for_session(session_id):
+        meeting_statuses.pop(meeting_id, None)
+
+
+active_bots.add_eviction_hook(_release_session)
+
+
+def _shared_meeting_status(bot: ZoomBot) -> Optional[str]:
+    """Meeting status as recorded in shared state (e.g. by a webhook on another worker)"""
+    meeting_id = getattr(bot, 'meeting_id', None)
+    if not meeting_id:
+        return None
+    return meeting_statuses.get(meeting_id, {}).get("status")
+
+
+meeting_monitor.status_lookup = _shared_meeting_status
 
 
 class ZoomService:
@@ -30,15 +60,45 @@ class ZoomService:
         """Create a new ZoomBot session"""
         session_id = str(uuid.uuid4())
         active_bots[session_id] = ZoomBot()
+        session_records[session_id] = {"owner": WORKER_ID, "created_at": time.time()}
         return session_id
     
     @staticmethod
-    def get_or_create_bot(session_id: Optional[str] = None) -> Tuple[ZoomBot, str]:
-        """Get an existing bot or create a new one"""
-        if not session_id or session_id not in active_bots:
-            session_id = ZoomService.create_session()
+    def get_local_bot(session_id: Optional[str]) -> Tuple[Optional[ZoomBot], Optional[str]]:
+        """Get the bot for a session owned by this worker, or the reason it isn't available"""
+        if session_id and session_id in active_bots:
+            return active_bots[session_id], None
+        
+        record = session_records.get(session_id) if session_id else None
+        if record and record.get("owner") != WORKER_ID:
+            return None, f"Session is owned by another worker ({record.get('owner')})"
+        
+        return None, "Invalid session ID"
+    
+    @staticmethod
+    def set_meeting_status(meeting_id: str, status: str, recording: bool, session_id: str) -> None:
+        """Record a meeting status transition in the shared state backend"""
+        current = meeting_statuses.get(meeting_id, {})
+        current.update({
+            "status": status,
+            "recording": recording,
+            "session_id": session_id,
+            "owner": WORKER_ID
+        })
+        meeting_statuses[meeting_id] = current
+    
+    @staticmethod
+    def get_or_create_bot(session_id: Optional[str] = None) -> Tuple[Optional[ZoomBot], str, Optional[str]]:
+        """Get an existing bot or create a new one; a session owned by another worker is refused"""
+        if session_id and session_id in active_bots:
+            return active_bots[session_id], session_id, None
+        
+        record = session_records.get(session_id) if session_id else None
+        if record and record.get("owner") != WORKER_ID:
+            return None, session_id, f"Session is owned by another worker ({record.get('owner')})"
         
-        return active_bots[session_id], session_id
+        session_id = ZoomService.create_session()
+        return active_bots[session_id], session_id, None
     
     @staticmethod
     def clean_meeting_info(meeting_info: Dict[str, Any]) -> Dict[str, Any]:
@@ -68,27 +128,48 @@ class ZoomService:
         session_id: Optional[str] = None
     ) -> Tuple[bool, Dict[str, Any], str, Optional[str]]:
         """Create a new Zoom meeting"""
-        bot, session_id = ZoomService.get_or_create_bot(session_id)
+        bot, session_id, error = ZoomService.get_or_create_bot(session_id)
+        if bot is None:
+            return False, {}, session_id, error
+        try:
+            outcome = bot.create_meeting(topic, duration, schedule_for, user_id)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meeting_created(outcome, session_id)
+    
+    @staticmethod
+    async def create_meeting_async(
+        topic: str,
+        duration: int,
+        schedule_for: Optional[str] = None,
+        user_id: str = 'me',
+        session_id: Optional[str] = None
+    ) -> Tuple[bool, Dict[str, Any], str, Optional[str]]:
+        """Create a new Zoom meeting without blocking the event loop"""
+        bot, session_id, error = ZoomService.get_or_create_bot(session_id)
+        if bot is None:
+            return False, {}, session_id, error
+        try:
+            outcome = await bot.create_meeting_async(topic, duration, schedule_for, user_id)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meeting_created(outcome, session_id)
+    
+    @staticmethod
+    def _meeting_created(outcome: Any, session_id: str) -> Tuple[bool, Dict[str, Any], str, Optional[str]]:
+        """Record a created meeting (outcome is the meeting info or the error raised)"""
+        if isinstance(outcome, Exception):
+            return False, {}, session_id, str(outcome)
+        if not outcome:
+            return False, {}, session_id, "Failed to create meeting"
         
         try:
-            # Create the meeting
-            meeting_info = bot.create_meeting(topic, duration, schedule_for, user_id)
+            # Update meeting status
+            meeting_id = str(outcome.get('id'))
+            ZoomService.set_meeting_status(meeting_id, "created", False, session_id)
             
-            if meeting_info:
-                # Update meeting status
-                meeting_id = str(meeting_info.get('id'))
-                meeting_statuses[meeting_id] = {
-                    "status": "created",
-                    "recording": False,
-                    "session_id": session_id
-                }
-                
-                # Clean meeting info to ensure it's JSON serializable
-                clean_info = ZoomService.clean_meeting_info(meeting_info)
-                
-                return True, clean_info, session_id, None
-            else:
-                return False, {}, session_id, "Failed to create meeting"
+            # Clean meeting info to ensure it's JSON serializable
+            return True, ZoomService.clean_meeting_info(outcome), session_id, None
         except Exception as e:
             return False, {}, session_id, str(e)
     
@@ -99,48 +180,85 @@ class ZoomService:
         session_id: Optional[str] = None
     ) -> Tuple[bool, str, str, Optional[str]]:
         """Join an existing Zoom meeting"""
-        bot, session_id = ZoomService.get_or_create_bot(session_id)
+        bot, session_id, error = ZoomService.get_or_create_bot(session_id)
+        if bot is None:
+            return False, session_id, meeting_id, error
+        try:
+            outcome = bot.join_meeting(meeting_id, passcode)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meeting_joined(outcome, meeting_id, session_id)
+    
+    @staticmethod
+    async def join_meeting_async(
+        meeting_id: str,
+        passcode: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Tuple[bool, str, str, Optional[str]]:
+        """Join an existing Zoom meeting without blocking the event loop"""
+        bot, session_id, error = ZoomService.get_or_create_bot(session_id)
+        if bot is None:
+            return False, session_id, meeting_id, error
+        try:
+            outcome = await bot.join_meeting_async(meeting_id, passcode)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meeting_joined(outcome, meeting_id, session_id)
+    
+    @staticmethod
+    def _meeting_joined(outcome: Any, meeting_id: str, session_id: str) -> Tuple[bool, str, str, Optional[str]]:
+        """Record a joined meeting (outcome is the join result or the error raised)"""
+        if isinstance(outcome, Exception):
+            return False, session_id, meeting_id, str(outcome)
+        if not outcome:
+            return False, session_id, meeting_id, "Failed to join meeting"
         
         try:
-            # Join the meeting
-            success = bot.join_meeting(meeting_id, passcode)
-            
-            if success:
-                # Update meeting status
-                meeting_statuses[meeting_id] = {
-                    "status": "joined",
-                    "recording": False,
-                    "session_id": session_id
-                }
-                
-                return True, session_id, meeting_id, None
-            else:
-                return False, session_id, meeting_id, "Failed to join meeting"
+            ZoomService.set_meeting_status(meeting_id, "joined", False, session_id)
+            return True, session_id, meeting_id, None
         except Exception as e:
             return False, session_id, meeting_id, str(e)
     
     @staticmethod
-    def start_recording(session_id: str, meeting_id: Optional[str] = None) -> Tuple[bool, Optional[str]]:
-        """Start recording a meeting"""
-        if not session_id or session_id not in active_bots:
-            return False, "Invalid session ID"
-        
-        bot = active_bots[session_id]
+    def start_recording(
+        session_id: str,
+        meeting_id: Optional[str] = None,
+        audio_source: Optional[Union[str, AudioSource]] = None,
+        realtime: Optional[bool] = None,
+        request_ms: Optional[int] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """Start recording a meeting from the given audio source spec (default: AUDIO_SOURCE)"""
+        bot, error = ZoomService.get_local_bot(session_id)
+        if bot is None:
+            return False, error
         
         try:
             # Verify we're in the right meeting if ID provided
             if meeting_id and hasattr(bot, 'meeting_id') and bot.meeting_id != meeting_id:
                 return False, "Session is not connected to the specified meeting"
             
+            if request_ms is not None and not 10 <= int(request_ms) <= 1000:
+                return False, "request_ms must be between 10 and 1000"
+            
+            if isinstance(audio_source, AudioSource):
+                # Already built by the caller, e.g. fed by the audio WebSocket
+                source = audio_source
+            else:
+                try:
+                    source = create_audio_source(audio_source, realtime, bot.rate, bot.channels, bot.chunk)
+                except ValueError as e:
+                    return False, str(e)
+            
             # Start recording
-            bot.start_recording()
+            bot.start_recording(source, request_ms)
             
-            # Update status
+            # Update status and record where this meeting's reports will be written
             if hasattr(bot, 'meeting_id'):
-                meeting_statuses[bot.meeting_id] = {
-                    "status": "recording",
-                    "recording": True,
-                    "session_id": session_id
+                ZoomService.set_meeting_status(bot.meeting_id, "recording", True, session_id)
+                report_manifests[bot.meeting_id] = {
+                    "session_id": session_id,
+                    "meeting_start_time": bot.meeting_start_time,
+                    "owner": WORKER_ID
                 }
             
             return True, None
@@ -150,10 +268,9 @@ class ZoomService:
     @staticmethod
     def stop_recording(session_id: str) -> Tuple[bool, Optional[str]]:
         """Stop recording a meeting"""
-        if not session_id or session_id not in active_bots:
-            return False, "Invalid session ID"
-        
-        bot = active_bots[session_id]
+        bot, error = ZoomService.get_local_bot(session_id)
+        if bot is None:
+            return False, error
         
         try:
             # Keep meeting ID for status update
@@ -164,54 +281,97 @@ class ZoomService:
             
             # Update status
             if meeting_id:
-                meeting_statuses[meeting_id] = {
-                    "status": "joined",
-                    "recording": False,
-                    "session_id": session_id
-                }
+                ZoomService.set_meeting_status(meeting_id, "joined", False, session_id)
             
             return True, None
         except Exception as e:
             return False, str(e)
     
+    @staticmethod
+    async def stop_recording_async(session_id: str) -> Tuple[bool, Optional[str]]:
+        """Stop recording in a worker thread; final report generation is slow and blocking"""
+        return await asyncio.to_thread(ZoomService.stop_recording, session_id)
+    
+    @staticmethod
+    def get_transcript(
+        session_id: str,
+        since: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Final transcript segments of a session's recording, new since an index or within a time window"""
+        bot, error = ZoomService.get_local_bot(session_id)
+        if bot is None:
+            return None, error
+        
+        transcript = bot.transcript
+        count = len(transcript)
+        view = transcript.slice(since, count) if since is not None else transcript.window(start, end)
+        return {
+            "segments": view.to_list(),
+            "next": count,  # pass as `since` to get only what was added after this read
+            "recording": bot.recording
+        }, None
+    
     @staticmethod
     def end_meeting(meeting_id: str, session_id: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """End a Zoom meeting"""
+        bot, session_id, error = ZoomService._meeting_bot(meeting_id, session_id)
+        if bot is None:
+            return False, error
+        try:
+            # Stop recording if it's running
+            if getattr(bot, 'recording', False):
+                bot.stop_recording()
+            outcome = bot.end_meeting(meeting_id)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meeting_ended(outcome, meeting_id, session_id)
+    
+    @staticmethod
+    async def end_meeting_async(meeting_id: str, session_id: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """End a Zoom meeting without blocking the event loop"""
+        bot, session_id, error = ZoomService._meeting_bot(meeting_id, session_id)
+        if bot is None:
+            return False, error
+        try:
+            # Stop recording if it's running
+            if getattr(bot, 'recording', False):
+                await asyncio.to_thread(bot.stop_recording)
+            outcome = await bot.end_meeting_async(meeting_id)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meeting_ended(outcome, meeting_id, session_id)
+    
+    @staticmethod
+    def _meeting_bot(meeting_id: str, session_id: Optional[str]) -> Tuple[Optional[ZoomBot], Optional[str], Optional[str]]:
+        """The local bot for a meeting, found through the session that owns it if none is given; another session's meeting is refused"""
         if not meeting_id:
-            return False, "Meeting ID is required"
+            return None, session_id, "Meeting ID is required"
         
-        # Find session ID if not provided
-        if not session_id or session_id not in active_bots:
-            # Try to find a session with this meeting
-            for sid, status in meeting_statuses.items():
-                if status.get('meeting_id') == meeting_id:
-                    session_id = status.get('session_id')
-                    break
-            
-            if not session_id or session_id not in active_bots:
-                return False, "Invalid session ID and no session found for this meeting"
+        owner = meeting_statuses.session_for(meeting_id)
+        if not session_id:
+            # Fall back to the session that owns this meeting
+            session_id = owner
+            if not session_id:
+                return None, None, "No session ID given and no session found for this meeting"
+        elif owner and owner != session_id:
+            return None, session_id, "Meeting belongs to another session"
         
-        bot = active_bots[session_id]
+        bot, error = ZoomService.get_local_bot(session_id)
+        return bot, session_id, error
+    
+    @staticmethod
+    def _meeting_ended(outcome: Any, meeting_id: str, session_id: str) -> Tuple[bool, Optional[str]]:
+        """Record an ended meeting (outcome is the end result or the error raised)"""
+        if isinstance(outcome, Exception):
+            return False, str(outcome)
+        if not outcome:
+            return False, "Failed to end meeting"
         
         try:
-            # Stop recording if it's running
-            if hasattr(bot, 'recording') and bot.recording:
-                bot.stop_recording()
-            
-            # End the meeting
-            success = bot.end_meeting(meeting_id)
-            
-            if success:
-                # Update status
-                meeting_statuses[meeting_id] = {
-                    "status": "ended",
-                    "recording": False,
-                    "session_id": session_id
-                }
-                
-                return True, None
-            else:
-                return False, "Failed to end meeting"
+            ZoomService.set_meeting_status(meeting_id, "ended", False, session_id)
+            return True, None
         except Exception as e:
             return False, str(e)
     
@@ -222,21 +382,44 @@ class ZoomService:
         session_id: Optional[str] = None
     ) -> Tuple[bool, List[Dict[str, Any]], str, Optional[str]]:
         """List Zoom meetings"""
-        bot, session_id = ZoomService.get_or_create_bot(session_id)
-        
+        bot, session_id, error = ZoomService.get_or_create_bot(session_id)
+        if bot is None:
+            return False, [], session_id, error
         try:
-            # List meetings
-            meetings = bot.list_meetings(user_id, meeting_type)
-            
-            clean_meetings = []
-            if meetings and 'meetings' in meetings:
-                # Clean meetings info
-                for meeting in meetings['meetings']:
-                    clean_meetings.append(ZoomService.clean_meeting_info(meeting))
-            
-            return True, clean_meetings, session_id, None
+            outcome = bot.list_meetings(user_id, meeting_type)
         except Exception as e:
-            return False, [], session_id, str(e)
+            outcome = e
+        return ZoomService._meetings_listed(outcome, session_id)
+    
+    @staticmethod
+    async def list_meetings_async(
+        user_id: str = 'me',
+        meeting_type: str = 'scheduled',
+        session_id: Optional[str] = None
+    ) -> Tuple[bool, List[Dict[str, Any]], str, Optional[str]]:
+        """List Zoom meetings without blocking the event loop"""
+        bot, session_id, error = ZoomService.get_or_create_bot(session_id)
+        if bot is None:
+            return False, [], session_id, error
+        try:
+            outcome = await bot.list_meetings_async(user_id, meeting_type)
+        except Exception as e:
+            outcome = e
+        return ZoomService._meetings_listed(outcome, session_id)
+    
+    @staticmethod
+    def _meetings_listed(outcome: Any, session_id: str) -> Tuple[bool, List[Dict[str, Any]], str, Optional[str]]:
+        """Clean a meeting list (outcome is the Zoom response or the error raised)"""
+        if isinstance(outcome, Exception):
+            return False, [], session_id, str(outcome)
+        
+        clean_meetings = []
+        if outcome and 'meetings' in outcome:
+            # Clean meetings info
+            for meeting in outcome['meetings']:
+                clean_meetings.append(ZoomService.clean_meeting_info(meeting))
+        
+        return True, clean_meetings, session_id, None
     
     @staticmethod
     def get_meeting_status(meeting_id: str, session_id: Optional[str] = None) -> Dict[str, Any]:
@@ -271,6 +454,34 @@ class ZoomService:
             "recording": False
         }
     
+    @staticmethod
+    async def get_meeting_status_async(meeting_id: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get status of a meeting; the Zoom API fallback runs in a worker thread"""
+        if meeting_id in meeting_statuses:
+            return meeting_statuses[meeting_id]
+        
+        return await asyncio.to_thread(ZoomService.get_meeting_status, meeting_id, session_id)
+    
+    @staticmethod
+    def list_active_meetings(session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List meetings that are currently created, started, joined or recording"""
+        if session_id:
+            meeting_ids = meeting_statuses.meetings_for_session(session_id)
+            meeting_ids &= meeting_statuses.meetings_with_status(*ACTIVE_MEETING_STATUSES)
+        else:
+            meeting_ids = meeting_statuses.meetings_with_status(*ACTIVE_MEETING_STATUSES)
+        
+        meetings = []
+        for meeting_id in sorted(meeting_ids):
+            status = meeting_statuses.get(meeting_id)
+            # The indexes can briefly disagree with a record being rewritten; the record wins
+            if not status or status.get("status") not in ACTIVE_MEETING_STATUSES:
+                continue
+            if session_id and status.get("session_id") != session_id:
+                continue
+            meetings.append(dict(status, meeting_id=meeting_id))
+        return meetings
+    
     @staticmethod
     def generate_signature(meeting_number: str, role: int = 0) -> Tuple[bool, Dict[str, Any], Optional[str]]:
         """Generate a signature for Zoom Meeting SDK"""
@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# When written files are fsynced
+FSYNC_NEVER = "never"  # leave it to the OS
+FSYNC_CLOSE = "close"  # once per file when the recording stops
+FSYNC_FLUSH = "flush"  # after every batch, so a crash loses at most one flush interval
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_CLOSE, FSYNC_FLUSH)
+
+
+class OutputWriter:
+    """
+    Appends a recording's text outputs (interim transcript, live summaries)
+    from a background thread.
+
+    Callers only queue text; the writer keeps one handle open per file and
+    batches the text, writing when ``batch_bytes`` have accumulated or
+    ``flush_interval`` has passed since the last write, and on ``flush()`` /
+    ``close()``. Text queued after close is appended directly so late
+    writers (a summary finishing after the recording stopped) lose nothing.
+    """
+
+    def __init__(self, directory: str, batch_bytes: int = None, flush_interval: float = None,
+                 fsync: str = None):
+        self.directory = directory
+        self.batch_bytes = batch_bytes or settings.OUTPUT_WRITER_BATCH_BYTES
+        self.flush_interval = settings.OUTPUT_WRITER_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.fsync = (fsync or settings.OUTPUT_WRITER_FSYNC).lower()
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self.fsync}")
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()  # nothing is queued behind the close marker
+        self._closed = False
+        self._files: Dict[str, Any] = {}
+        self._pending: Dict[str, List[str]] = {}
+        self._pending_bytes = 0
+        self._stats = {"queued_bytes": 0, "written_bytes": 0, "writes": 0, "flushes": 0, "fsyncs": 0,
+                       "errors": 0, "direct_writes": 0}
+
+    def start(self) -> "OutputWriter":
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def write(self, filename: str, text: str) -> None:
+        """Queue text to append to a file in the writer's directory; never touches disk on the caller's thread"""
+        with self._lock:
+            if not self._closed and self._thread is not None:
+                self._queue.put((filename, text))
+                self._stats["queued_bytes"] += len(text)
+                return
+        self._write_direct(filename, text)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write out everything queued so far; returns False if the writer did not catch up in time"""
+        if self._thread is None or self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(("", done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write out everything queued and close the files"""
+        with self._lock:
+            if self._thread is None or self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            fsync=self.fsync,
+            files=len(self._files),
+            pending_items=self._queue.qsize(),
+            pending_bytes=self._pending_bytes
+        )
+
+    def _run(self) -> None:
+        last_write = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = ("", None)
+            if item is None:
+                break
+            filename, payload = item
+            flushed = None  # set when flush() is waiting
+            if filename:
+                self._pending.setdefault(filename, []).append(payload)
+                self._pending_bytes += len(payload)
+            else:
+                flushed = payload
+            # One write per file and batch, but never sit on text longer than the flush interval
+            if (flushed is not None or self._pending_bytes >= self.batch_bytes
+                    or self._pending and time.monotonic() - last_write >= self.flush_interval):
+                self._write_pending()
+                last_write = time.monotonic()
+            if flushed is not None:
+                flushed.set()
+        self._write_pending()
+        self._close_files()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        for filename, parts in self._pending.items():
+            data = "".join(parts)
+            try:
+                f = self._files.get(filename)
+                if f is None:
+                    f = self._files[filename] = open(os.path.join(self.directory, filename), "a")
+                f.write(data)
+                f.flush()
+                if self.fsync == FSYNC_FLUSH:
+                    os.fsync(f.fileno())
+                    self._stats["fsyncs"] += 1
+                self._stats["written_bytes"] += len(data)
+                self._stats["writes"] += 1
+            except OSError as e:
+                self._stats["errors"] += 1
+                print(f"Error writing {filename}: {e}")
+        self._stats["flushes"] += 1
+        self._pending = {}
+        self._pending_bytes = 0
+
+    def _close_files(self) -> None:
+        for filename, f in self._files.items():
+            try:
+                if self.fsync != FSYNC_NEVER:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._stats["fsyncs"] += 1
+                f.close()
+            except OSError as e:
+                self._stats["errors"] += 1
+                print(f"Error closing {filename}: {e}")
+        self._files = {}
+
+    def _write_direct(self, filename: str, text: str) -> None:
+        try:
+            with open(os.path.join(self.directory, filename), "a") as f:
+                f.write(text)
+            self._stats["direct_writes"] += 1
+        except OSError as e:
+            self._stats["errors"] += 1
+            print(f"Error writing {filename}: {e}")
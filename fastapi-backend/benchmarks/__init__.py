@@ -0,0 +1 @@
+"""Benchmarks for Zoom Bot API."""
\ No newline at end of file
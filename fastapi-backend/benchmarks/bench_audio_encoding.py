@@ -0,0 +1,114 @@
+"""
+Benchmark: upstream bandwidth, CPU cost and latency per stream encoding.
+
+Synthetic speech-like audio (harmonic tones with a syllable envelope plus
+noise) is fed through the same StreamEncoder a recording uses, once per
+encoding (LINEAR16, FLAC, OGG_OPUS). Nothing is sent to Google.
+
+For each encoding two runs are made:
+- throughput: --seconds of audio as fast as possible, reporting the upstream
+  bitrate, compression ratio and CPU per stream-minute (this process plus
+  the ffmpeg child)
+- latency: --latency-seconds of audio paced in real time in request-sized
+  payloads, reporting the time to the first encoded byte and how long the
+  encoder takes to flush after the last payload
+
+Requires ffmpeg on PATH for FLAC and OGG_OPUS. Run from the fastapi-backend directory:
+    python -m benchmarks.bench_audio_encoding
+    python -m benchmarks.bench_audio_encoding --encodings FLAC,OGG_OPUS --seconds 300
+"""
+import argparse
+import math
+import random
+import resource
+import struct
+import time
+
+from app.audio.encoder import create_stream_encoder
+
+RATE = 16000
+CHANNELS = 1
+REQUEST_MS = 100
+
+
+def speech_like_payloads(seconds: float, request_ms: int = REQUEST_MS):
+    """Request-sized PCM payloads that compress roughly like speech"""
+    rng = random.Random(7)
+    samples_per_payload = RATE * request_ms // 1000
+    phase = 0.0
+    for index in range(int(seconds * 1000 / request_ms)):
+        pitch = 110 + 40 * math.sin(index / 7)
+        envelope = max(0.0, math.sin(index * math.pi / 4))  # ~400 ms syllables
+        samples = []
+        for _ in range(samples_per_payload):
+            phase += 2 * math.pi * pitch / RATE
+            voiced = math.sin(phase) + 0.5 * math.sin(2 * phase) + 0.25 * math.sin(3 * phase)
+            samples.append(int(6000 * envelope * voiced / 1.75 + rng.gauss(0, 120)))
+        yield struct.pack(f"<{len(samples)}h", *samples)
+
+
+def child_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def throughput_run(encoding: str, payloads):
+    encoder = create_stream_encoder(encoding, RATE, CHANNELS)
+    cpu_started = time.process_time() + child_cpu()
+    for _ in encoder.encode(iter(payloads)):
+        pass
+    cpu = time.process_time() + child_cpu() - cpu_started
+    return encoder, cpu
+
+
+def latency_run(encoding: str, seconds: float):
+    """Returns (seconds to first encoded byte, seconds from last payload to end of output)"""
+    encoder = create_stream_encoder(encoding, RATE, CHANNELS)
+    marks = {}
+
+    def paced():
+        started = time.monotonic()
+        for index, payload in enumerate(speech_like_payloads(seconds)):
+            delay = started + index * REQUEST_MS / 1000 - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            marks.setdefault("first_in", time.monotonic())
+            yield payload
+        marks["last_in"] = time.monotonic()
+
+    first_out = None
+    for _ in encoder.encode(paced()):
+        if first_out is None:
+            first_out = time.monotonic()
+    finished = time.monotonic()
+    return first_out - marks["first_in"], finished - marks["last_in"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--encodings", default="LINEAR16,FLAC,OGG_OPUS")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Audio per throughput run")
+    parser.add_argument("--latency-seconds", type=float, default=5.0, help="Audio per real-time latency run")
+    args = parser.parse_args()
+
+    payloads = list(speech_like_payloads(args.seconds))
+    minutes = args.seconds / 60
+
+    print(f"{'encoding':>9} {'kbit/s':>8} {'ratio':>6} {'cpu ms/min':>10} {'first byte':>10} {'flush':>8}")
+    for encoding in args.encodings.split(","):
+        encoder, cpu = throughput_run(encoding, payloads)
+        stats = encoder.stats()
+        if stats["encoding"] != encoding:
+            print(f"{encoding:>9} skipped (encoder unavailable)")
+            continue
+        first_byte, flush = latency_run(encoding, args.latency_seconds)
+        print(f"{encoding:>9} "
+              f"{stats['encoded_bytes'] * 8 / 1000 / args.seconds:>8.1f} "
+              f"{stats['compression_ratio']:>6.3f} "
+              f"{cpu * 1000 / minutes:>10.1f} "
+              f"{first_byte * 1000:>8.1f}ms "
+              f"{flush * 1000:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
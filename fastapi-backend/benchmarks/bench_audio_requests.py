@@ -0,0 +1,100 @@
+"""
+Benchmark: recognition request size vs. CPU cost and end-to-end latency.
+
+Synthetic audio goes through the same capture pipeline a recording uses
+(GeneratorAudioSource -> AudioCapture -> AudioRingBuffer -> request_payloads)
+and every payload is wrapped in a StreamingRecognizeRequest. The Speech
+service itself is not called, so the numbers are the client-side cost of
+producing the request stream.
+
+For each request size two runs are made:
+- throughput: --minutes of audio as fast as possible, reporting requests and
+  CPU milliseconds per stream-minute
+- latency: --latency-seconds of audio paced in real time, reporting how long
+  after its last frame (pipeline delay) and its first frame (pipeline delay
+  plus the aggregation window) each request was ready to send
+
+Run from the fastapi-backend directory:
+    python -m benchmarks.bench_audio_requests
+    python -m benchmarks.bench_audio_requests --sizes 64,100,250 --minutes 10
+"""
+import argparse
+import statistics
+import time
+
+from google.cloud import speech_v1p1beta1 as speech
+
+from app.audio.ring_buffer import AudioCapture, AudioRingBuffer, request_bytes_for, request_payloads
+from app.audio.sources import GeneratorAudioSource
+
+RATE = 16000
+CHANNELS = 1
+CHUNK = 1024  # frames per capture read, as in ZoomBot
+
+
+def synthetic_chunks(seconds: float):
+    """Deterministic 16-bit PCM noise in capture-sized chunks"""
+    chunk_bytes = CHUNK * CHANNELS * 2
+    pattern = bytes((i * 7919) % 256 for i in range(chunk_bytes))
+    for _ in range(int(seconds * RATE / CHUNK)):
+        yield pattern
+
+
+def run_pipeline(request_ms: int, seconds: float, realtime: bool):
+    """Push `seconds` of audio through the pipeline; returns (requests, cpu_seconds, latencies)"""
+    source = GeneratorAudioSource(lambda: synthetic_chunks(seconds), RATE, CHANNELS, CHUNK, realtime)
+    source.open()
+    buffer = AudioRingBuffer.for_source(source)
+    capture = AudioCapture(source, buffer)
+    request_bytes = request_bytes_for(request_ms, RATE, CHANNELS)
+    bytes_per_second = RATE * CHANNELS * 2
+
+    requests = 0
+    sent_bytes = 0
+    latencies = []  # (from last frame, from first frame)
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    capture.start()
+    for payload in request_payloads(buffer, request_bytes):
+        speech.StreamingRecognizeRequest(audio_content=payload)
+        requests += 1
+        sent_bytes += len(payload)
+        if realtime:
+            # The payload's last frame was captured once that much audio had played
+            from_last = time.monotonic() - (started + sent_bytes / bytes_per_second)
+            latencies.append((from_last, from_last + len(payload) / bytes_per_second))
+    cpu = time.process_time() - cpu_started
+    capture.stop()
+    buffer.release()
+    return requests, cpu, latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="64,100,150,200,250", help="Request sizes in milliseconds")
+    parser.add_argument("--minutes", type=float, default=5.0, help="Audio per throughput run")
+    parser.add_argument("--latency-seconds", type=float, default=10.0, help="Audio per real-time latency run")
+    args = parser.parse_args()
+
+    print(f"{'request_ms':>10} {'req/min':>8} {'cpu ms/min':>10} {'last p50':>9} {'last p99':>9} {'first p99':>9}")
+    for request_ms in (int(size) for size in args.sizes.split(",")):
+        requests, cpu, _ = run_pipeline(request_ms, args.minutes * 60, realtime=False)
+        _, _, latencies = run_pipeline(request_ms, args.latency_seconds, realtime=True)
+        from_last = [last for last, _ in latencies]
+        from_first = [first for _, first in latencies]
+        print(f"{request_ms:>10} "
+              f"{requests / args.minutes:>8.0f} "
+              f"{cpu * 1000 / args.minutes:>10.1f} "
+              f"{statistics.median(from_last) * 1000:>7.1f}ms "
+              f"{percentile(from_last, 99) * 1000:>7.1f}ms "
+              f"{percentile(from_first, 99) * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: resampling and downmix throughput in audio-seconds per CPU-second.
+
+Noise-like PCM at common capture formats (48 kHz and 44.1 kHz stereo from
+Zoom or uploads, plus a few mono rates) is converted to the recognizer's
+16 kHz mono by the same StreamResampler a recording uses, once per block
+size: a capture chunk (1024 frames), a 100 ms request and a 10 s upload
+block. Higher is better; anything above ~100x leaves plenty of headroom
+for many concurrent streams per core.
+
+Run from the fastapi-backend directory:
+    python -m benchmarks.bench_audio_resample
+    python -m benchmarks.bench_audio_resample --seconds 600 --formats 48000x2,44100x2
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.audio.resample import StreamResampler
+
+TARGET_RATE = 16000
+
+
+def pcm(seconds: float, rate: int, channels: int) -> bytes:
+    rng = np.random.default_rng(7)
+    return rng.integers(-8000, 8000, int(seconds * rate) * channels, dtype=np.int16).tobytes()
+
+
+def run(data: bytes, rate: int, channels: int, block_frames: int):
+    """Returns (CPU seconds, output bytes) for converting data in blocks of block_frames"""
+    resampler = StreamResampler(rate, channels, TARGET_RATE, 1)
+    block = block_frames * channels * 2
+    output = 0
+    started = time.process_time()
+    for offset in range(0, len(data), block):
+        output += len(resampler.process(data[offset:offset + block]))
+    output += len(resampler.flush())
+    return time.process_time() - started, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--formats", default="48000x2,44100x2,48000x1,44100x1,22050x1,8000x1",
+                        help="Comma-separated <rate>x<channels> inputs")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Audio per run")
+    args = parser.parse_args()
+
+    print(f"{'input':>10} {'block':>10} {'taps':>5} {'audio s/CPU s':>14} {'us/block':>9}")
+    for spec in args.formats.split(","):
+        rate, channels = (int(part) for part in spec.split("x"))
+        data = pcm(args.seconds, rate, channels)
+        taps = StreamResampler(rate, channels, TARGET_RATE, 1).bank
+        for label, block_frames in (("1024", 1024), ("100ms", rate // 10), ("10s", rate * 10)):
+            cpu, output = run(data, rate, channels, block_frames)
+            blocks = -(-int(args.seconds * rate) // block_frames)
+            print(f"{spec:>10} {label:>10} {0 if taps is None else taps.shape[1]:>5} "
+                  f"{args.seconds / cpu if cpu else float('inf'):>14.0f} {cpu * 1e6 / blocks:>9.0f}")
+            expected = int(args.seconds * TARGET_RATE) * 2
+            if abs(output - expected) > 4:
+                print(f"{'':>10} output {output} bytes, expected {expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: /api/status latency while /meetings/join requests are in flight.
+
+The Zoom API is replaced by an in-process fake that answers after a fixed
+delay, so the numbers only reflect how well the event loop keeps serving
+other requests while Zoom round-trips are pending.
+
+Modes:
+- async: the real /api/zoom/meetings/join route (async Zoom client)
+- sync:  a route that calls the blocking ZoomService.join_meeting() from an
+         async handler, i.e. the behaviour before the async client existed
+
+Run from the fastapi-backend directory:
+    python -m benchmarks.bench_zoom_endpoints --mode async --joins 200
+    python -m benchmarks.bench_zoom_endpoints --mode sync --joins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.core.zoom_auth import zoom_tokens
+from app.core.zoom_client import zoom_api, async_zoom_api
+from app.main import app
+from app.services.zoom_service import ZoomService
+
+
+def install_fake_zoom(latency: float) -> None:
+    """Answer every Zoom API call after `latency` seconds"""
+    meeting = {"id": 123456789, "topic": "Benchmark meeting"}
+
+    async def async_handler(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=meeting)
+
+    class BlockingSession:
+        def request(self, method, url, **kwargs):
+            time.sleep(latency)
+            return httpx.Response(200, json=meeting)
+
+    zoom_tokens.get_token = lambda force_refresh=False: "benchmark-token"
+
+    async def get_token_async():
+        return "benchmark-token"
+
+    zoom_tokens.get_token_async = get_token_async
+    async_zoom_api.transport = httpx.MockTransport(async_handler)
+    zoom_api.session = BlockingSession()
+
+
+@app.post("/bench/meetings/join-sync", include_in_schema=False)
+async def join_meeting_blocking(request_data: dict):
+    """Old behaviour: synchronous Zoom I/O inside an async handler"""
+    success, session_id, meeting_id, error = ZoomService.join_meeting(request_data["meeting_id"])
+    return {"success": success, "session_id": session_id}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(mode: str, joins: int, concurrency: int, probe_interval: float) -> None:
+    join_path = "/api/zoom/meetings/join" if mode == "async" else "/bench/meetings/join-sync"
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def join(i):
+            async with semaphore:
+                await client.post(join_path, json={"meeting_id": str(123456789 + i)})
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/api/status")
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(probe_interval)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(join(i) for i in range(joins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    await async_zoom_api.aclose()
+
+    print(f"mode={mode} joins={joins} concurrency={concurrency} wall={elapsed:.2f}s")
+    print(f"/api/status samples={len(latencies)} "
+          f"p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.1f}ms "
+          f"max={max(latencies) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["async", "sync"], default="async")
+    parser.add_argument("--joins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--zoom-latency", type=float, default=0.15, help="Fake Zoom round-trip in seconds")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    install_fake_zoom(args.zoom_latency)
+    asyncio.run(run(args.mode, args.joins, args.concurrency, args.probe_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import numpy as np
+
+from app.audio import vad
+from app.audio.vad import VoiceActivityDetector
+
+RATE = 16000
+PAYLOAD_SAMPLES = RATE // 10  # 100 ms
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def speech():
+    t = np.arange(PAYLOAD_SAMPLES) / RATE
+    return (8000 * np.sin(2 * np.pi * 200 * t)).astype(np.int16).tobytes()
+
+
+def silence():
+    return bytes(PAYLOAD_SAMPLES * 2)
+
+
+def test_filter_offsets_always_increase(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(vad, "time", clock)
+    detector = VoiceActivityDetector(RATE, energy_threshold=300.0, hangover=0.2, preroll=0.3, keepalive=0.35)
+
+    def payloads():
+        # Silences of every phase relative to the keep-alives, so speech sometimes
+        # starts right after one with older pre-roll still held back
+        for gap in range(5, 14):
+            for _ in range(gap):
+                yield silence()
+                clock.now += 0.1
+            for _ in range(3):
+                yield speech()
+                clock.now += 0.1
+
+    offsets = [offset for offset, _ in detector.filter(payloads())]
+    assert offsets == sorted(set(offsets))
+    assert detector.stats()["keepalive_seconds"] > 0
@@ -0,0 +1 @@
+"""Developer tools for Zoom Bot API."""
\ No newline at end of file
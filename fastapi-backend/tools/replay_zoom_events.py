@@ -0,0 +1,101 @@
+"""
+Replay Zoom webhook events against the webhook receiver.
+
+Events are signed exactly like Zoom signs them (x-zm-signature over
+"v0:{timestamp}:{body}" with ZOOM_WEBHOOK_SECRET_TOKEN), so the receiver's
+signature check, URL validation and dispatch can be exercised locally.
+
+Events come from a JSON file (a list of events, or one event per line), or
+a synthetic lifecycle for --meeting-id: started, participant joined/left,
+ended. Each event may carry a "delay" key (seconds to wait before sending).
+
+Run from the fastapi-backend directory:
+    python -m tools.replay_zoom_events --meeting-id 123456789
+    python -m tools.replay_zoom_events --file events.json --url http://localhost:5000/api/webhooks/zoom
+    python -m tools.replay_zoom_events --meeting-id 123456789 --in-process
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.services.webhook_service import WebhookService
+
+DEFAULT_URL = "http://localhost:5000/api/webhooks/zoom"
+
+
+def lifecycle_events(meeting_id: str):
+    """A minimal meeting lifecycle as Zoom would deliver it"""
+    meeting = {"id": int(meeting_id) if meeting_id.isdigit() else meeting_id, "topic": "Replayed meeting"}
+    participant = {"user_name": "Replay User", "user_id": "replay-user"}
+    return [
+        {"event": "endpoint.url_validation", "payload": {"plainToken": "replay-plain-token"}},
+        {"event": "meeting.started", "payload": {"object": meeting}},
+        {"event": "meeting.participant_joined", "payload": {"object": dict(meeting, participant=participant)}, "delay": 0.5},
+        {"event": "meeting.participant_left", "payload": {"object": dict(meeting, participant=participant)}, "delay": 0.5},
+        {"event": "meeting.ended", "payload": {"object": meeting}, "delay": 0.5},
+    ]
+
+
+def load_events(path: str):
+    with open(path, "r") as f:
+        content = f.read().strip()
+    if content.startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def signed_request(event):
+    """Serialize an event and build the headers Zoom would send with it"""
+    event = {k: v for k, v in event.items() if k != "delay"}
+    event.setdefault("event_ts", int(time.time() * 1000))
+    body = json.dumps(event)
+    timestamp = str(int(time.time()))
+    signature = "v0=" + WebhookService.sign(f"v0:{timestamp}:{body}")
+    headers = {
+        "Content-Type": "application/json",
+        "x-zm-request-timestamp": timestamp,
+        "x-zm-signature": signature
+    }
+    return body, headers
+
+
+async def replay(events, url: str, in_process: bool) -> None:
+    if in_process:
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay")
+        url = "/api/webhooks/zoom"
+    else:
+        client = httpx.AsyncClient()
+
+    async with client:
+        for event in events:
+            await asyncio.sleep(event.get("delay", 0))
+            body, headers = signed_request(event)
+            started = time.perf_counter()
+            response = await client.post(url, content=body, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{event.get('event')}: {response.status_code} in {elapsed:.1f}ms -> {response.text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="JSON file with events to replay")
+    source.add_argument("--meeting-id", help="Replay a synthetic lifecycle for this meeting")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Webhook receiver URL")
+    parser.add_argument("--in-process", action="store_true", help="Send to the app in this process instead of over HTTP")
+    args = parser.parse_args()
+
+    if not settings.ZOOM_WEBHOOK_SECRET_TOKEN:
+        parser.error("ZOOM_WEBHOOK_SECRET_TOKEN must be set to sign events")
+
+    events = load_events(args.file) if args.file else lifecycle_events(args.meeting_id)
+    asyncio.run(replay(events, args.url, args.in_process))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,37 @@ import os
 from dotenv import load_dotenv
 import speech_recognition as sr
 from google.cloud import speech_v1p1beta1 as speech
-import cohere
-from google.cloud import aiplatform
-from google.oauth2 import service_account
 from vertexai.generative_models import GenerativeModel
-import requests
 import time
+import asyncio
 import threading
 import io
-import pyaudio
 import wave
 import queue
 import sys
 import json
 import uuid
 import datetime
+import functools
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.audio.ring_buffer import AudioCapture, AudioRingBuffer, request_bytes_for, request_payloads
+from app.audio.archive import AudioArchiveWriter, archive_dir
+from app.audio.channels import ChannelSplitter, RecognitionStream, TranscriptMerger, channel_speakers
+from app.audio.diarization import speaker_label, speaker_turns
+from app.audio.resample import ResampledSource
+from app.audio.rollover import duration_seconds
+from app.audio.sources import create_audio_source
+from app.models.transcript import TranscriptStore
+from app.services.live_summary import RollingSummarizer, clock, live_summary_worker
+from app.core.config import settings
+from app.core.providers import providers
+from app.core.zoom_auth import zoom_tokens
+from app.core.rate_limit import PRIORITY_USER
+from app.core.zoom_client import zoom_api, async_zoom_api
+from app.services.meeting_monitor import meeting_monitor
+from app.utils.output_writer import OutputWriter
 
 load_dotenv()
 
@@ -24,43 +40,34 @@ class ZoomBot:
     def __init__(self):
         # Initialize recording variables
         self.recording = False
-        self.transcript_buffer = []
-        self.full_transcript = ""
+        self.transcript = TranscriptStore()  # final segments with timing, speaker and confidence
         self.summary_counter = 0
+        self.live_summarizer = RollingSummarizer()  # summarizes only what each update adds
+        self.recording_generation = 0  # bumped per recording; live summaries of an older one are dropped
+        self.generation_lock = threading.Lock()
         
         # Audio recording settings
-        self.rate = 16000  # Matches Google's preferred rate
+        self.rate = settings.AUDIO_TARGET_RATE  # Matches Google's preferred rate
         self.chunk = 1024
-        self.format = pyaudio.paInt16
-        self.channels = 1  # Mono
-        
-        # Initialize Google Cloud Speech client
-        self.speech_client = speech.SpeechClient.from_service_account_json(
-            os.getenv("GOOGLE_APPLICATION_CREDENTIALS", 
-                    "C:/Users/HP/Desktop/Aryan/Backend/syncscribe-454510-6b6e3db310f5.json")
-        )
-       
-        # Initialize AI services
-        self.cohere_api_key = os.getenv("COHERE_API_KEY")
-        self.co = cohere.Client(self.cohere_api_key)
-        
-        # Initialize Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(
-            os.getenv("GOOGLE_APPLICATION_CREDENTIALS", 
-                      "C:/Users/HP/Desktop/Aryan/Backend/syncscribe-454510-6b6e3db310f5.json")
-        )
-        aiplatform.init(
-            project=os.getenv("GOOGLE_CLOUD_PROJECT", "syncscribe-454510"),
-            location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
-            credentials=credentials
-        )
+        self.channels = settings.AUDIO_CHANNELS  # >1 runs one recognition stream per channel
+        self.audio_source = None  # chosen per recording (see start_recording)
+        self.audio_buffer = None  # ring between the capture thread and the recognizer
+        self.request_ms = settings.AUDIO_REQUEST_MS  # audio per recognition request
+        self.recognition_streams = []  # VAD, encoder and rollover of each recognized stream
+        self.channel_splitter = None  # fans multi-channel audio out to per-channel streams
+        self.transcript_merger = None  # puts per-channel finals back in recording order
+        self.transcript_lock = threading.Lock()  # channel workers emit finals concurrently
+        self.audio_archive = None  # segmented copy of the captured audio, for re-transcription
+        self.output_writer = None  # batches interim transcript and live summary writes off the response loop
+        
+        # Speech, Cohere and Vertex AI clients are shared process-wide and
+        # built lazily by the provider registry (see speech_client / co below)
         
         # Create output directory if it doesn't exist
         os.makedirs("meeting_outputs", exist_ok=True)
         
         # For meeting status checking
         self.token = None
-        self.meeting_check_thread = None
         self.last_audio_time = None
         self.silence_threshold = 60  # seconds of silence to assume meeting is over
         
@@ -70,30 +77,20 @@ class ZoomBot:
         self.created_meeting_join_url = None
         self.created_meeting_start_url = None
     
-    def get_zoom_token(self):
-        client_id = os.getenv("ZOOM_CLIENT_ID")
-        client_secret = os.getenv("ZOOM_CLIENT_SECRET")
-        account_id = os.getenv("ZOOM_ACCOUNT_ID")
-
-        print(f"ZOOM_CLIENT_ID: {os.getenv('ZOOM_CLIENT_ID')}")
-        print(f"ZOOM_CLIENT_SECRET: {os.getenv('ZOOM_CLIENT_SECRET')}")
-        print(f"ZOOM_ACCOUNT_ID: {os.getenv('ZOOM_ACCOUNT_ID')}")
-        
-        url = "https://zoom.us/oauth/token"
-        data = {
-            "grant_type": "account_credentials",
-            "account_id": account_id,
-            "client_id": client_id,
-            "client_secret": client_secret
-        }
-        
-        response = requests.post(url, data=data)
-        if response.status_code == 200:
-            self.token = response.json()["access_token"]
-            return self.token
-        else:
-            print(f"Failed to get Zoom token: {response.text}")
-            return None
+    @property
+    def speech_client(self):
+        """Shared Google Cloud Speech client"""
+        return providers.speech
+    
+    @property
+    def co(self):
+        """Shared Cohere client"""
+        return providers.cohere
+    
+    def get_zoom_token(self, force_refresh=False):
+        """Get a Zoom access token from the shared, expiry-aware token cache"""
+        self.token = zoom_tokens.get_token(force_refresh)
+        return self.token
     
     def create_meeting(self, topic, duration=60, schedule_for=None, user_id="me"):
         """
@@ -108,11 +105,28 @@ class ZoomBot:
         Returns:
         - Dictionary with meeting details or None if failed
         """
-        token = self.get_zoom_token()
-        if not token:
-            print("Failed to authenticate with Zoom")
+        api_url, meeting_data = self._create_meeting_request(topic, duration, schedule_for, user_id)
+        
+        try:
+            response = zoom_api.request("POST", api_url, json=meeting_data)
+            return self._handle_create_meeting_response(response)
+        except Exception as e:
+            print(f"Error creating meeting: {e}")
             return None
+    
+    async def create_meeting_async(self, topic, duration=60, schedule_for=None, user_id="me"):
+        """Async variant of create_meeting() that doesn't block the event loop"""
+        api_url, meeting_data = self._create_meeting_request(topic, duration, schedule_for, user_id)
         
+        try:
+            response = await async_zoom_api.request("POST", api_url, json=meeting_data)
+            return self._handle_create_meeting_response(response)
+        except Exception as e:
+            print(f"Error creating meeting: {e}")
+            return None
+    
+    def _create_meeting_request(self, topic, duration, schedule_for, user_id):
+        """Build the API path and body for creating a meeting"""
         # Use current time as default if no schedule time provided
         if not schedule_for:
             # Format as ISO-8601 string
@@ -140,37 +154,32 @@ class ZoomBot:
         }
         
         # Create meeting API endpoint
-        api_url = f"https://api.zoom.us/v2/users/{user_id}/meetings"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        return f"/users/{user_id}/meetings", meeting_data
+    
+    def _handle_create_meeting_response(self, response):
+        """Store and return the details of a newly created meeting"""
+        if response is None:
+            print("Failed to authenticate with Zoom")
+            return None
         
-        try:
-            response = requests.post(api_url, headers=headers, json=meeting_data)
+        if response.status_code == 201:  # 201 Created
+            meeting_info = response.json()
             
-            if response.status_code == 201:  # 201 Created
-                meeting_info = response.json()
-                
-                # Store created meeting details
-                self.created_meeting_id = meeting_info['id']
-                self.created_meeting_password = meeting_info['password']
-                self.created_meeting_join_url = meeting_info['join_url']
-                self.created_meeting_start_url = meeting_info['start_url']
-                
-                # Print success message with meeting details
-                print(f"Meeting created successfully!")
-                print(f"Meeting ID: {self.created_meeting_id}")
-                print(f"Password: {self.created_meeting_password}")
-                print(f"Join URL: {self.created_meeting_join_url}")
-                
-                return meeting_info
-            else:
-                print(f"Failed to create meeting: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error creating meeting: {e}")
+            # Store created meeting details
+            self.created_meeting_id = meeting_info['id']
+            self.created_meeting_password = meeting_info['password']
+            self.created_meeting_join_url = meeting_info['join_url']
+            self.created_meeting_start_url = meeting_info['start_url']
+            
+            # Print success message with meeting details
+            print(f"Meeting created successfully!")
+            print(f"Meeting ID: {self.created_meeting_id}")
+            print(f"Password: {self.created_meeting_password}")
+            print(f"Join URL: {self.created_meeting_join_url}")
+            
+            return meeting_info
+        else:
+            print(f"Failed to create meeting: {response.status_code} - {response.text}")
             return None
     
     def list_meetings(self, user_id="me", meeting_type="scheduled"):
@@ -184,11 +193,28 @@ class ZoomBot:
         Returns:
         - List of meetings or None if failed
         """
-        token = self.get_zoom_token()
-        if not token:
-            print("Failed to authenticate with Zoom")
+        api_url, params = self._list_meetings_request(user_id, meeting_type)
+        
+        try:
+            response = zoom_api.request("GET", api_url, params=params)
+            return self._handle_list_meetings_response(response, meeting_type)
+        except Exception as e:
+            print(f"Error listing meetings: {e}")
             return None
-            
+    
+    async def list_meetings_async(self, user_id="me", meeting_type="scheduled"):
+        """Async variant of list_meetings() that doesn't block the event loop"""
+        api_url, params = self._list_meetings_request(user_id, meeting_type)
+        
+        try:
+            response = await async_zoom_api.request("GET", api_url, params=params)
+            return self._handle_list_meetings_response(response, meeting_type)
+        except Exception as e:
+            print(f"Error listing meetings: {e}")
+            return None
+    
+    def _list_meetings_request(self, user_id, meeting_type):
+        """Build the API path and query parameters for listing meetings"""
         # Map meeting type to Zoom API parameter
         type_map = {
             "scheduled": "scheduled",
@@ -199,44 +225,59 @@ class ZoomBot:
         meeting_type_param = type_map.get(meeting_type, "scheduled")
         
         # List meetings API endpoint
-        api_url = f"https://api.zoom.us/v2/users/{user_id}/meetings"
         params = {
             "type": meeting_type_param,
             "page_size": 30  # Number of meetings to return
         }
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        return f"/users/{user_id}/meetings", params
+    
+    def _handle_list_meetings_response(self, response, meeting_type):
+        """Return the meetings from a list response"""
+        if response is None:
+            print("Failed to authenticate with Zoom")
+            return None
         
-        try:
-            response = requests.get(api_url, headers=headers, params=params)
+        if response.status_code == 200:
+            meetings = response.json()
             
-            if response.status_code == 200:
-                meetings = response.json()
-                
-                # Print meeting list in a readable format
-                if meetings.get("meetings"):
-                    print(f"\nFound {len(meetings['meetings'])} {meeting_type} meetings:")
-                    for i, meeting in enumerate(meetings["meetings"], 1):
-                        print(f"{i}. {meeting['topic']} (ID: {meeting['id']})")
-                        print(f"   Start Time: {meeting.get('start_time', 'N/A')}")
-                        print(f"   Join URL: {meeting.get('join_url', 'N/A')}")
-                        print(f"   Password: {meeting.get('password', 'N/A')}\n")
-                else:
-                    print(f"No {meeting_type} meetings found.")
-                
-                return meetings
+            # Print meeting list in a readable format
+            if meetings.get("meetings"):
+                print(f"\nFound {len(meetings['meetings'])} {meeting_type} meetings:")
+                for i, meeting in enumerate(meetings["meetings"], 1):
+                    print(f"{i}. {meeting['topic']} (ID: {meeting['id']})")
+                    print(f"   Start Time: {meeting.get('start_time', 'N/A')}")
+                    print(f"   Join URL: {meeting.get('join_url', 'N/A')}")
+                    print(f"   Password: {meeting.get('password', 'N/A')}\n")
             else:
-                print(f"Failed to list meetings: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            print(f"Error listing meetings: {e}")
+                print(f"No {meeting_type} meetings found.")
+            
+            return meetings
+        else:
+            print(f"Failed to list meetings: {response.status_code} - {response.text}")
             return None
     
     def join_meeting(self, meeting_id=None, passcode=None):
         """Join a Zoom meeting using Server-to-Server OAuth app"""
+        meeting_id, passcode = self._resolve_join_target(meeting_id, passcode)
+        if meeting_id is None:
+            return False
+        
+        # Get meeting details
+        response = zoom_api.request("GET", f"/meetings/{meeting_id}")
+        return self._handle_join_meeting_response(response, meeting_id)
+    
+    async def join_meeting_async(self, meeting_id=None, passcode=None):
+        """Async variant of join_meeting() that doesn't block the event loop"""
+        meeting_id, passcode = self._resolve_join_target(meeting_id, passcode)
+        if meeting_id is None:
+            return False
+        
+        # Get meeting details
+        response = await async_zoom_api.request("GET", f"/meetings/{meeting_id}")
+        return self._handle_join_meeting_response(response, meeting_id)
+    
+    def _resolve_join_target(self, meeting_id, passcode):
+        """Fall back to the created meeting's ID and password"""
         # Use created meeting ID and password if none provided
         if meeting_id is None and self.created_meeting_id:
             meeting_id = self.created_meeting_id
@@ -248,21 +289,15 @@ class ZoomBot:
             
         if meeting_id is None:
             print("No meeting ID provided or created. Cannot join meeting.")
-            return False
-            
-        token = self.get_zoom_token()
-        if not token:
+        
+        return meeting_id, passcode
+    
+    def _handle_join_meeting_response(self, response, meeting_id):
+        """Attach the bot to a meeting once its details have been fetched"""
+        if response is None:
             print("Failed to authenticate with Zoom")
             return False
         
-        # Get meeting details
-        meeting_url = f"https://api.zoom.us/v2/meetings/{meeting_id}"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(meeting_url, headers=headers)
         if response.status_code != 200:
             print(f"Failed to get meeting details: {response.text}")
             return False
@@ -289,6 +324,44 @@ class ZoomBot:
         Returns:
         - True if meeting ended successfully, False otherwise
         """
+        meeting_id = self._resolve_end_target(meeting_id)
+        if meeting_id is None:
+            return False
+        
+        try:
+            response = zoom_api.request("PUT", f"/meetings/{meeting_id}/status", json={"action": "end"})
+            success = self._handle_end_meeting_response(response, meeting_id)
+        except Exception as e:
+            print(f"Error ending meeting: {e}")
+            return False
+        
+        # Stop recording if it's running
+        if success and self.recording:
+            self.stop_recording()
+        
+        return success
+    
+    async def end_meeting_async(self, meeting_id=None):
+        """Async variant of end_meeting(); report generation runs in a worker thread"""
+        meeting_id = self._resolve_end_target(meeting_id)
+        if meeting_id is None:
+            return False
+        
+        try:
+            response = await async_zoom_api.request("PUT", f"/meetings/{meeting_id}/status", json={"action": "end"})
+            success = self._handle_end_meeting_response(response, meeting_id)
+        except Exception as e:
+            print(f"Error ending meeting: {e}")
+            return False
+        
+        # Stop recording if it's running
+        if success and self.recording:
+            await asyncio.to_thread(self.stop_recording)
+        
+        return success
+    
+    def _resolve_end_target(self, meeting_id):
+        """Fall back to the current or last created meeting"""
         # Use current/created meeting ID if none provided
         if meeting_id is None:
             if hasattr(self, 'meeting_id') and self.meeting_id:
@@ -297,42 +370,20 @@ class ZoomBot:
                 meeting_id = self.created_meeting_id
             else:
                 print("No meeting ID provided or available. Cannot end meeting.")
-                return False
-        
-        token = self.get_zoom_token()
-        if not token:
+        return meeting_id
+    
+    def _handle_end_meeting_response(self, response, meeting_id):
+        """Check whether Zoom accepted the end action"""
+        if response is None:
             print("Failed to authenticate with Zoom")
             return False
         
-        # End meeting API endpoint
-        api_url = f"https://api.zoom.us/v2/meetings/{meeting_id}/status"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
-        # Prepare end meeting request
-        end_data = {
-            "action": "end"
-        }
-        
-        try:
-            response = requests.put(api_url, headers=headers, json=end_data)
-            
-            if response.status_code in [204, 200]:  # Success codes
-                print(f"Meeting {meeting_id} ended successfully.")
-                
-                # Stop recording if it's running
-                if self.recording:
-                    self.stop_recording()
-                
-                return True
-            else:
-                print(f"Failed to end meeting: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            print(f"Error ending meeting: {e}")
+        if response.status_code in [204, 200]:  # Success codes
+            print(f"Meeting {meeting_id} ended successfully.")
+            meeting_monitor.unregister(self)
+            return True
+        else:
+            print(f"Failed to end meeting: {response.status_code} - {response.text}")
             return False
     
     def setup_webhooks(self, endpoint_url=None):
@@ -356,11 +407,7 @@ class ZoomBot:
             return False
             
         # Create webhook subscription
-        api_url = "https://api.zoom.us/v2/webhooks"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        api_url = "/webhooks"
         
         # Define events to listen for
         webhook_data = {
@@ -374,7 +421,7 @@ class ZoomBot:
         }
         
         try:
-            response = requests.post(api_url, headers=headers, json=webhook_data)
+            response = zoom_api.request("POST", api_url, json=webhook_data)
             
             if response.status_code == 201:  # Created
                 webhook_info = response.json()
@@ -389,199 +436,96 @@ class ZoomBot:
             return False
     
     def _start_meeting_monitoring(self):
-        """Start all threads for monitoring the meeting status"""
-        # Thread 1: API-based status check
-        self.meeting_check_thread = threading.Thread(target=self._check_meeting_status_api)
-        self.meeting_check_thread.daemon = True
-        self.meeting_check_thread.start()
-        
-        # Thread 2: Silence detection (backup method)
-        self.silence_check_thread = threading.Thread(target=self._check_silence)
-        self.silence_check_thread.daemon = True
-        self.silence_check_thread.start()
-        
-        # Thread 3: Connection status check
-        self.connection_check_thread = threading.Thread(target=self._check_connection_status)
-        self.connection_check_thread.daemon = True
-        self.connection_check_thread.start()
-        
-        # Thread 4: Meeting ended event check
-        self.ended_event_thread = threading.Thread(target=self._check_meeting_ended_event)
-        self.ended_event_thread.daemon = True
-        self.ended_event_thread.start()
-    
-    def _check_meeting_status_api(self):
-        """Periodically check if the meeting is still active via API"""
-        while self.recording:
-            try:
-                # Check meeting status every 5 seconds instead of 15
-                time.sleep(5)
-                
-                # Check if meeting is still active via Zoom API
-                if not self._is_meeting_active():
-                    print("\nAPI: Detected that the meeting has ended. Stopping recording...")
-                    self.stop_recording()
-                    break
-            except Exception as e:
-                print(f"Error checking meeting status via API: {e}")
+        """Hand the meeting to the shared monitor (status probes and silence detection)"""
+        meeting_monitor.register(self)
     
-    def _check_meeting_ended_event(self):
-        """Specifically check for meeting ended event"""
-        while self.recording:
-            try:
-                # Check every 7 seconds (staggered from other checks)
-                time.sleep(7)
-                
-                if not self.token:
-                    self.get_zoom_token()
-                    
-                # Use the most direct endpoint for meeting status
-                end_check_url = f"https://api.zoom.us/v2/meetings/{self.meeting_id}/status"
-                headers = {
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json"
-                }
-                
-                response = requests.get(end_check_url, headers=headers)
-                
-                # If we get a success response, check the status
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'status' in data and data['status'] in ['ended', 'inactive']:
-                        print("\nAPI: Meeting status endpoint reports meeting has ended.")
-                        self.stop_recording()
-                        break
-                elif response.status_code in [404, 400, 401]:
-                    # These status codes often indicate the meeting is over
-                    print("\nAPI: Meeting status endpoint suggests meeting is over.")
-                    self.stop_recording()
-                    break
-            except Exception as e:
-                print(f"Error in meeting ended event check: {e}")
-    
-    def _check_silence(self):
-        """Check for extended periods of silence as a backup method"""
-        self.last_audio_time = time.time()
+    def probe_meeting_status(self, meeting_id=None, priority=PRIORITY_USER):
+        """
+        Probe the meeting once via the Zoom API
         
-        while self.recording:
-            try:
-                time.sleep(10)  # Check every 10 seconds
-                
-                current_time = time.time()
-                if self.last_audio_time and (current_time - self.last_audio_time) > self.silence_threshold:
-                    print(f"\nSilence: No audio detected for {self.silence_threshold} seconds. Meeting appears to be over.")
-                    self.stop_recording()
-                    break
-            except Exception as e:
-                print(f"Error in silence detection: {e}")
-    
-    def _check_connection_status(self):
-        """Check if we're still connected to the meeting"""
-        while self.recording:
-            try:
-                # Check connection every 20 seconds
-                time.sleep(20)
-                
-                # Send a ping request to Zoom API to verify connectivity
-                if not self._ping_meeting():
-                    print("\nConnection: Lost connection to Zoom meeting. Stopping recording...")
-                    self.stop_recording()
-                    break
-            except Exception as e:
-                print(f"Error checking connection status: {e}")
-    
-    def _ping_meeting(self):
-        """Simple ping to see if we still have API access to the meeting"""
-        try:
-            if not self.token:
-                self.get_zoom_token()
+        Returns "active", "ended", or "unknown" when the API couldn't tell.
+        Background callers pass PRIORITY_BACKGROUND so the probe yields to
+        user-initiated calls when the rate budget runs low.
+        """
+        # Use provided meeting ID or fall back to instance meeting ID
+        if meeting_id is None:
+            meeting_id = getattr(self, 'meeting_id', None)
+            if meeting_id is None:
+                print("No meeting ID available to check status")
+                return "unknown"
+        
+        response = zoom_api.request("GET", f"/metrics/meetings/{meeting_id}", priority=priority)
+        if response is None:
+            return "unknown"
+        
+        if response.status_code == 200:
+            status_data = response.json()
+            
+            # If meeting data shows status as "ended"
+            if status_data.get('status') in ['ended', 'finished']:
+                print("API detected meeting status as ended")
+                return "ended"
                 
-            check_url = f"https://api.zoom.us/v2/metrics/meetings/{self.meeting_id}"
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Content-Type": "application/json"
-            }
+            # Check participants - if zero, meeting is likely over
+            if status_data.get('participants_count') == 0:
+                print("API detected zero participants")
+                return "ended"
             
-            response = requests.get(check_url, headers=headers)
-            return response.status_code in [200, 201, 202, 204]
-        except:
-            return False
+            return "active"
+        elif response.status_code == 404:
+            # 404 typically means the meeting is no longer active
+            print("API: Meeting metrics not found (404)")
+            return "ended"
+        
+        print(f"Failed to get meeting status: {response.status_code} - {response.text}")
+        # Only fall back to the meeting details endpoint when metrics are unavailable
+        direct_response = zoom_api.request("GET", f"/meetings/{meeting_id}", priority=priority)
+        if direct_response is None:
+            return "unknown"
+        if direct_response.status_code == 404:
+            print("API: Meeting no longer exists (404)")
+            return "ended"
+        if direct_response.status_code == 200:
+            return "ended" if direct_response.json().get('status') == 'finished' else "active"
+        return "unknown"
     
     def _is_meeting_active(self, meeting_id=None):
         """Check if the meeting is still active using Zoom API"""
         try:
-            # Use provided meeting ID or fall back to instance meeting ID
-            if meeting_id is None:
-                if hasattr(self, 'meeting_id'):
-                    meeting_id = self.meeting_id
-                else:
-                    print("No meeting ID available to check status")
-                    return False
-            
-            # Refresh token if needed
-            if not self.token:
-                self.get_zoom_token()
-            
-            # Use a more reliable endpoint to check meeting status
-            status_url = f"https://api.zoom.us/v2/metrics/meetings/{meeting_id}"
-            headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(status_url, headers=headers)
-            
-            if response.status_code == 200:
-                status_data = response.json()
-                
-                # If meeting data shows status as "ended"
-                if 'status' in status_data and status_data['status'] in ['ended', 'finished']:
-                    print("API detected meeting status as ended")
-                    return False
-                    
-                # Check participants - if zero, meeting is likely over
-                if 'participants_count' in status_data and status_data['participants_count'] == 0:
-                    print("API detected zero participants")
-                    return False
-                    
-                # Try to get meeting details using another endpoint as backup verification
-                meeting_url = f"https://api.zoom.us/v2/meetings/{meeting_id}"
-                meeting_response = requests.get(meeting_url, headers=headers)
-                
-                # If we get a 404, meeting has been ended and removed
-                if meeting_response.status_code == 404:
-                    print("API: Meeting no longer exists (404)")
-                    return False
-                
-                return True
-            elif response.status_code == 404:
-                # 404 typically means the meeting is no longer active
-                print("API: Meeting metrics not found (404)")
-                return False
-            else:
-                print(f"Failed to get meeting status: {response.status_code} - {response.text}")
-                # Add a more aggressive check if we get unexpected status codes
-                try:
-                    # Directly check if meeting exists
-                    direct_url = f"https://api.zoom.us/v2/meetings/{meeting_id}"
-                    direct_response = requests.get(direct_url, headers=headers)
-                    if direct_response.status_code != 200:
-                        print("API: Meeting likely ended (direct check failed)")
-                        return False
-                except:
-                    pass
-                return True  # Default to assuming meeting is still active
+            return self.probe_meeting_status(meeting_id) != "ended"
         except Exception as e:
             print(f"Error checking meeting status: {e}")
             return True  # Assume meeting is still active if we can't check
     
-    def start_recording(self):
-        """Start recording and transcribing the meeting audio using streaming recognition"""
+    def start_recording(self, audio_source=None, request_ms=None):
+        """
+        Start recording and transcribing the meeting audio using streaming recognition
+        
+        Parameters:
+        - audio_source: AudioSource to record from (default: built from AUDIO_SOURCE)
+        - request_ms: Milliseconds of audio per recognition request (default: AUDIO_REQUEST_MS)
+        """
+        if request_ms:
+            self.request_ms = request_ms
+        if audio_source is None:
+            audio_source = create_audio_source(rate=self.rate, channels=self.channels, chunk=self.chunk)
+        # Whatever the source delivers (e.g. 44.1/48 kHz stereo) reaches the recognizer at AUDIO_TARGET_RATE
+        self.audio_source = ResampledSource(audio_source)
+        with self.generation_lock:
+            self.recording_generation += 1
         self.recording = True
-        self.transcript_buffer = []
-        self.full_transcript = ""
+        self.transcript = TranscriptStore()
         self.summary_counter = 0
+        self.live_summarizer = RollingSummarizer()
+        self.recognition_streams = []
+        self.channel_splitter = None
+        self.transcript_merger = None
         self.meeting_start_time = time.strftime("%Y-%m-%d_%H-%M-%S")
+        self.last_audio_time = time.time()
+        self.output_writer = OutputWriter("meeting_outputs").start()
+        if getattr(self, 'meeting_id', None) and not meeting_monitor.is_monitoring(self):
+            # Unregistered when the meeting last ended; a new recording needs monitoring again
+            meeting_monitor.register(self)
         
         # Start streaming transcription in a separate thread
         self.transcription_thread = threading.Thread(target=self._stream_transcribe_audio)
@@ -592,25 +536,97 @@ class ZoomBot:
         print("Meeting in progress. Press Ctrl+C to manually end recording or wait for meeting to end automatically.")
     
     def _stream_transcribe_audio(self):
-        """Stream audio to Google Cloud Speech API with speaker diarization"""
+        """Stream audio to Google Cloud Speech API, one stream per channel or one diarized stream"""
         # Set up audio stream
-        audio = pyaudio.PyAudio()
-        stream = audio.open(
-            format=self.format,
-            channels=self.channels,
-            rate=self.rate,
-            input=True,
-            frames_per_buffer=self.chunk
-        )
+        source = self.audio_source
+        try:
+            source.open()
+        except Exception as e:
+            print(f"Error opening audio source {source.describe()}: {e}")
+            self._finish_recording_early()
+            return
+        if source.channels > settings.AUDIO_MAX_CHANNELS:
+            print(f"Audio has {source.channels} channels; at most {settings.AUDIO_MAX_CHANNELS} are supported")
+            source.close()
+            self._finish_recording_early()
+            return
+        
+        # Capture runs on its own thread so a slow Speech stream never stalls it
+        self.audio_buffer = AudioRingBuffer.for_source(source)
+        if settings.AUDIO_ARCHIVE_ENABLED:
+            self.audio_archive = AudioArchiveWriter(archive_dir(self.meeting_start_time), source.rate, source.channels)
+            self.audio_archive.start()
+        capture = AudioCapture(source, self.audio_buffer, self.audio_archive)
+        capture.start()
+        
+        # Audio for recognition, aggregated into request_ms sized requests
+        request_bytes = request_bytes_for(self.request_ms, source.rate, source.channels)
+        payloads = request_payloads(self.audio_buffer, request_bytes, lambda: self.recording)
+        if not settings.AUDIO_VAD_ENABLED:
+            payloads = self._track_activity(payloads)
         
-        # Configuration for streaming with speaker diarization
+        try:
+            if source.channels > 1 and settings.AUDIO_CHANNEL_STREAMS:
+                self._recognize_channels(payloads, source)
+            else:
+                stream = RecognitionStream(payloads, source.rate, source.channels, on_speech=self._mark_speech)
+                self.recognition_streams = [stream]
+                self._recognize(stream)
+        finally:
+            # Clean up (closing the ring first wakes a capture blocked on it)
+            self.audio_buffer.close()
+            capture.stop()
+            source.close()
+            self.audio_buffer.release()
+            if self.audio_archive is not None:
+                self.audio_archive.close()
+            print("Audio stream closed.")
+            # Still recording means the source ran out or transcription gave up
+            self._finish_recording_early()
+    
+    def _recognize_channels(self, payloads, source):
+        """Run one recognition stream per channel concurrently and merge their finals by time"""
+        speakers = channel_speakers(source.channels)
+        self.transcript_merger = TranscriptMerger()
+        # The splitter's ticks (one per request) release merged finals once their hold time is up
+        self.channel_splitter = splitter = ChannelSplitter(payloads, source.channels, on_tick=self._release_merged)
+        self.recognition_streams = [
+            RecognitionStream(splitter.channel_payloads(channel), source.rate, 1, speakers[channel], self._mark_speech)
+            for channel in range(source.channels)
+        ]
+        
+        # One worker per channel, plus one for the splitter feeding them
+        with ThreadPoolExecutor(max_workers=source.channels + 1, thread_name_prefix="speech-channel") as pool:
+            pool.submit(splitter.run)
+            workers = [
+                pool.submit(self._recognize_channel, channel, stream)
+                for channel, stream in enumerate(self.recognition_streams)
+            ]
+            wait(workers)
+            splitter.stop()
+        self._release_merged(flush=True)
+    
+    def _recognize_channel(self, channel, stream):
+        try:
+            self._recognize(stream)
+        except Exception as e:
+            print(f"Error transcribing {stream.speaker}: {e}")
+        finally:
+            # Nobody reads this channel any more; don't let it hold up the others
+            self.channel_splitter.detach(channel)
+    
+    def _recognize(self, stream):
+        """Run one recognition stream until its audio ends, rolling over to new Speech streams"""
         config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=self.rate,
+            encoding=getattr(speech.RecognitionConfig.AudioEncoding, stream.encoder.encoding),
+            sample_rate_hertz=stream.rate,
+            audio_channel_count=stream.channels,
             language_code="en-US",
-            enable_speaker_diarization=True,
-            diarization_speaker_count=2,  # Can be adjusted based on expected number of speakers
+            # A per-channel stream carries one participant, so only a mixed stream is diarized
+            enable_speaker_diarization=stream.speaker is None,
+            diarization_speaker_count=settings.SPEECH_DIARIZATION_SPEAKERS,
             enable_automatic_punctuation=True,
+            enable_word_time_offsets=True,  # needed to de-duplicate words across stream rollovers
             use_enhanced=True,
         )
         streaming_config = speech.StreamingRecognitionConfig(
@@ -618,41 +634,53 @@ class ZoomBot:
             interim_results=True
         )
         
-        # Generator for streaming audio chunks
-        def audio_generator():
-            while self.recording:
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                    # Update last audio time whenever we get audio data
-                    self.last_audio_time = time.time()
-                    yield data
-                except Exception as e:
-                    print(f"Error reading audio: {e}")
-                    time.sleep(0.1)  # Prevent tight loop on error
-        
-        try:
-            print("Starting transcription stream...")
-            # Create streaming recognize requests
-            requests = (speech.StreamingRecognizeRequest(audio_content=content) 
-                        for content in audio_generator())
-            
-            # Get streaming responses
-            responses = self.speech_client.streaming_recognize(streaming_config, requests)
-            
-            # Process responses
-            self._process_responses(responses)
+        rollover = stream.rollover
+        failures = 0
+        while self.recording and not rollover.finished:
+            try:
+                print(f"Starting transcription stream{f' for {stream.speaker}' if stream.speaker else ''}...")
+                # Create streaming recognize requests
+                requests = (speech.StreamingRecognizeRequest(audio_content=content) 
+                            for content in stream.encoder.encode(rollover.stream_audio()))
+                
+                # Get streaming responses
+                responses = self.speech_client.streaming_recognize(streaming_config, requests)
+                
+                # Process responses
+                self._process_responses(responses, rollover, stream.speaker)
+                failures = 0
+                
+            except Exception as e:
+                failures += 1
+                print(f"Error in streaming transcription: {e}")
+                if failures >= settings.SPEECH_STREAM_MAX_FAILURES:
+                    print("Too many consecutive stream failures, giving up.")
+                    break
+                time.sleep(min(2 ** failures, 30))
             
-        except Exception as e:
-            print(f"Error in streaming transcription: {e}")
-        finally:
-            # Clean up
-            stream.stop_stream()
-            stream.close()
-            audio.terminate()
-            print("Audio stream closed.")
+            # Next stream replays the audio after the last final result
+            rollover.rotate()
     
-    def _process_responses(self, responses):
-        """Process streaming responses with speaker diarization"""
+    def _track_activity(self, payloads):
+        """Without VAD, any audio counts as activity for the silence check"""
+        for data in payloads:
+            # Update last audio time whenever we get audio data
+            self.last_audio_time = time.time()
+            yield data
+    
+    def _mark_speech(self):
+        """Record speech activity for the meeting monitor's silence check"""
+        self.last_audio_time = time.time()
+    
+    def _finish_recording_early(self):
+        """Stop recording when transcription ends on its own (source ended or failed)"""
+        if self.recording:
+            print("Transcription ended. Stopping recording...")
+            # stop_recording joins this thread, so run it from another one
+            threading.Thread(target=self.stop_recording, daemon=True).start()
+    
+    def _process_responses(self, responses, rollover=None, speaker=None):
+        """Process streaming responses, labelled by channel speaker or by diarization"""
         for response in responses:
             if not response.results or not self.recording:
                 continue
@@ -663,76 +691,114 @@ class ZoomBot:
                 
             alternative = result.alternatives[0]
             transcript = alternative.transcript
+            words = alternative.words if hasattr(alternative, 'words') else None
             
-            # Extract speaker tag if available
-            speaker_tag = None
-            if hasattr(alternative, 'words') and alternative.words:
-                for word in alternative.words:
-                    if hasattr(word, 'speaker_tag') and word.speaker_tag:
-                        speaker_tag = word.speaker_tag
-                        break
+            # Drop finals (or words) already emitted by the previous stream's overlap
+            if result.is_final and rollover is not None:
+                final = rollover.final_words(result, alternative)
+                if final is None:
+                    continue
+                transcript, words = final
             
             if result.is_final:
-                # Format with speaker information
-                speaker_label = f"Speaker {speaker_tag}" if speaker_tag is not None else "Unknown"
-                final_text = f"{speaker_label}: {transcript}"
-                
-                # Display and save final transcription
-                timestamp = time.strftime("%H:%M:%S")
-                print(f"[{timestamp}] {final_text}")
-                
-                # Save to buffer and file
-                self.transcript_buffer.append(final_text)
-                self.full_transcript += f"{final_text} "
-                self._save_interim_transcript(timestamp, final_text)
-                
-                # Generate periodic summaries
-                self.summary_counter += 1
-                if self.summary_counter >= 5:  # Summarize every 5 final results
-                    summary = self._generate_live_summary(self.full_transcript)
-                    print("\nLive Summary:")
-                    print(summary)
-                    print("\nContinuing transcription...\n")
-                    
-                    # Save the live summary
-                    self._save_live_summary(summary)
-                    
-                    self.summary_counter = 0  # Reset counter
+                confidence = getattr(alternative, 'confidence', None) or None
+                for final in self._final_turns(result, transcript, words, rollover, speaker, confidence):
+                    if self.transcript_merger is not None:
+                        # Concurrent channels are put back in recording order before they are emitted
+                        start, end = final[2], final[3]
+                        self.transcript_merger.add(start if start is not None else end or 0.0, final)
+                    else:
+                        self._emit_final(*final)
             else:
-                # Display interim results
-                speaker_label = f"Speaker {speaker_tag}" if speaker_tag is not None else "Unknown"
-                sys.stdout.write(f"\rLive: {speaker_label}: {transcript}")
+                # Display interim results (speaker tags only come with finals, so words are not read here)
+                sys.stdout.write(f"\rLive: {speaker or 'Unknown'}: {transcript}")
                 sys.stdout.flush()
     
-    def _generate_live_summary(self, text):
-        """Generate a live summary using Cohere"""
-        try:
-            response = self.co.generate(
-                prompt=f"Summarize this part of the meeting transcript: {text}",
-                max_tokens=100,
-                temperature=0.7
-            )
-            return response.generations[0].text.strip()
-        except Exception as e:
-            print(f"Error generating live summary: {e}")
-            return "Live summary generation failed."
+    def _final_turns(self, result, transcript, words, rollover, speaker, confidence):
+        """
+        A final result as (transcript, speaker, start, end, confidence) per speaker turn.
+        Diarized results are split wherever the words' speaker tag changes; a
+        result from one speaker keeps the recognizer's own transcript text.
+        """
+        if speaker is None and words:
+            turns = speaker_turns(words, rollover.recording_time if rollover is not None else None)
+            if len(turns) > 1:
+                return [(text, speaker_label(tag), start, end, confidence) for tag, text, start, end in turns]
+            speaker = speaker_label(turns[0][0])
+        start, end = self._final_span(result, words, rollover)
+        return [(transcript, speaker or "Unknown", start, end, confidence)]
     
-    def _save_live_summary(self, summary):
-        """Save the live summary to a file"""
-        try:
-            with open(f"meeting_outputs/live_summaries_{self.meeting_start_time}.txt", "a") as f:
-                timestamp = time.strftime("%H:%M:%S")
-                f.write(f"[{timestamp}] LIVE SUMMARY:\n{summary}\n\n")
-        except Exception as e:
-            print(f"Error saving live summary: {e}")
+    def _final_span(self, result, words, rollover):
+        """Start and end of a final result in recording time (start is None without word offsets)"""
+        if rollover is None:
+            def recording_time(seconds, end=False):
+                return seconds
+        else:
+            # Adds back the silence the VAD held back, so times match the archive and the wall clock
+            recording_time = rollover.recording_time
+        if words:
+            return (recording_time(duration_seconds(words[0].start_time)),
+                    recording_time(duration_seconds(words[-1].end_time), end=True))
+        end_time = getattr(result, 'result_end_time', None)
+        return None, recording_time(duration_seconds(end_time), end=True) if end_time is not None else None
+    
+    def _release_merged(self, flush=False):
+        """Emit merged channel finals whose hold time is up (all of them when flushing)"""
+        for final in self.transcript_merger.ready(flush):
+            self._emit_final(*final)
+    
+    def _emit_final(self, transcript, speaker_label, start=None, end=None, confidence=None):
+        """Display and save one final result, and summarize periodically"""
+        with self.transcript_lock:
+            # Display and save final transcription
+            final_text = f"{speaker_label}: {transcript}"
+            timestamp = time.strftime("%H:%M:%S")
+            print(f"[{timestamp}] {final_text}")
+            
+            # Save to the segment store and file
+            self.transcript.append(transcript, start, end, speaker_label, confidence)
+            self._save_interim_transcript(timestamp, final_text)
+            
+            # Generate periodic summaries
+            self.summary_counter += 1
+            if self.summary_counter >= settings.LIVE_SUMMARY_EVERY:
+                # Summaries run on the background worker so Cohere never holds up the responses
+                live_summary_worker.request(self, functools.partial(
+                    self._update_live_summary, self.recording_generation, self.live_summarizer, self.transcript,
+                    self.output_writer, self.meeting_start_time
+                ))
+                self.summary_counter = 0  # Reset counter
+    
+    def _update_live_summary(self, generation, summarizer, transcript, output_writer, meeting_start_time):
+        """Summarize what the transcript gained since the last live summary (runs on the summary worker)"""
+        # Only the segments added since the last summary are sent (see RollingSummarizer)
+        summary = summarizer.update(transcript)
+        if summary is None:
+            return
+        with self.generation_lock:
+            if generation != self.recording_generation:
+                # Still running when the recording was stopped and a new one started
+                print("Dropping live summary of a previous recording")
+                return
+            print("\nLive Summary:")
+            print(summary)
+            print("\nContinuing transcription...\n")
+            
+            # Save the live summary
+            self._save_live_summary(summary, summarizer.latest_window(), output_writer, meeting_start_time)
+    
+    def _save_live_summary(self, summary, window, output_writer, meeting_start_time):
+        """Queue the live summary, with the recording span of its latest window, for its file"""
+        timestamp = time.strftime("%H:%M:%S")
+        text = f"[{timestamp}] LIVE SUMMARY:\n{summary}\n\n"
+        if window is not None:
+            text = (f"[{timestamp}] WINDOW {clock(window['start'])}-{clock(window['end'])}:\n"
+                    f"{window['summary']}\n{text}")
+        output_writer.write(f"live_summaries_{meeting_start_time}.txt", text)
     
     def _save_interim_transcript(self, timestamp, text):
-        """Save interim transcript without processing or summarizing"""
-        try:
-            with open(f"meeting_outputs/interim_transcript_{self.meeting_start_time}.txt", "a") as f:
-                f.write(f"[{timestamp}] {text}\n")
-        except Exception as e:
-            print(f"Error saving interim transcript: {e}")
+        """Queue the final result for the interim transcript (written by the output writer)"""
+        self.output_writer.write(f"interim_transcript_{self.meeting_start_time}.txt", f"[{timestamp}] {text}\n")
     
     def stop_recording(self):
         """Stop recording and generate final report"""
@@ -741,21 +807,28 @@ class ZoomBot:
             
         self.recording = False
         print("\nStopping recording...")
+        live_summary_worker.discard(self)  # the final report summarizes everything
         
         # Wait for transcription thread to finish
         if hasattr(self, 'transcription_thread') and self.transcription_thread.is_alive():
             self.transcription_thread.join(timeout=3)
         
+        # Channel finals still held for merging belong in the transcript too
+        if self.transcript_merger is not None:
+            self._release_merged(flush=True)
+        self.output_writer.close()
+        
         # Process complete transcript
-        if self.transcript_buffer:
+        if len(self.transcript):
             print("Generating summary and insights...")
             
-            # Save raw transcript first
+            # Save raw transcript first, in recording order, and its segments with timing
             raw_transcript_file = f"meeting_outputs/raw_transcript_{self.meeting_start_time}.txt"
             with open(raw_transcript_file, "w") as f:
-                full_transcript = " ".join(self.transcript_buffer)
+                full_transcript = self.transcript.in_time_order().text()
                 f.write(full_transcript)
             print(f"Raw transcript saved to {raw_transcript_file}")
+            self.transcript.save(f"meeting_outputs/transcript_segments_{self.meeting_start_time}.json")
             
             print("Generating summary with Cohere...")
             summary = self._generate_summary(full_transcript)
@@ -770,6 +843,39 @@ class ZoomBot:
         else:
             print("No transcript recorded.")
     
+    def audio_stats(self):
+        """Capture buffer counters (fill level, dropped frames, consumer lag) for the current recording"""
+        if self.audio_buffer is None:
+            return None
+        stats = dict(
+            self.audio_buffer.stats(),
+            source=self.audio_source.describe(),
+            request_ms=self.request_ms,
+            archive=self.audio_archive.stats() if self.audio_archive else None,
+            live_summary=dict(self.live_summarizer.stats(), worker=live_summary_worker.session_stats(self)),
+            output_writer=self.output_writer.stats() if self.output_writer else None
+        )
+        streams = [stream.stats() for stream in self.recognition_streams]
+        if self.channel_splitter is not None:
+            stats.update(channels=streams, splitter=self.channel_splitter.stats(),
+                         merger=self.transcript_merger.stats())
+        else:
+            stream = streams[0] if streams else {}
+            stats.update(streams=stream.get("streams"), vad=stream.get("vad"), encoder=stream.get("encoder"))
+        return stats
+    
+    def close(self):
+        """Release everything this bot holds (called when its session is evicted)"""
+        meeting_monitor.unregister(self)
+        live_summary_worker.discard(self)
+        if self.recording:
+            self.stop_recording()
+        elif hasattr(self, 'transcription_thread') and self.transcription_thread.is_alive():
+            self.transcription_thread.join(timeout=3)
+        
+        # Shared provider clients belong to the registry; just drop per-meeting state
+        self.transcript = TranscriptStore()
+    
     def _generate_summary(self, text):
         """Generate summary using Cohere"""
         try:
@@ -786,6 +892,7 @@ class ZoomBot:
     def _generate_insights(self, summary):
         """Generate insights using Vertex AI's Gemini model"""
         try:
+            providers.vertex  # Make sure Vertex AI has been initialized
             model = GenerativeModel("gemini-pro")
             response = model.generate_content(
                 f"Analyze this meeting summary and provide key insights, action items, and decisions made: {summary}"